@@ -1,8 +1,21 @@
 """Refinire Tool Tavily - Web search tool for RefinireAgent using Tavily API."""
 
-from .models import SearchRequest, SearchResponse, SearchResult
+from .models import Passage, SearchRequest, SearchResponse, SearchResult
 from .service import TavilyService
-from .api import search_web, get_search_context
+from .metrics import ServiceMetrics, get_metrics
+from .domains import DomainPolicy, get_domain_policy
+from .local_index import LocalIndex
+from .response_journal import ResponseJournalReader
+from .watch import Watcher
+from .api import (
+    search_web,
+    get_search_context,
+    local_search,
+    iter_search_results,
+    iter_search_context,
+    aiter_search_results,
+    aiter_search_context
+)
 from .config import ConfigManager, setup_env, check_config
 from .tools import (
     refinire_web_search, 
@@ -14,8 +27,12 @@ from .tools import (
 
 __version__ = "0.1.1"
 __all__ = [
-    "SearchRequest", "SearchResponse", "SearchResult", 
-    "TavilyService", "search_web", "get_search_context",
+    "SearchRequest", "SearchResponse", "SearchResult", "Passage",
+    "TavilyService", "ServiceMetrics", "get_metrics",
+    "DomainPolicy", "get_domain_policy", "LocalIndex",
+    "ResponseJournalReader", "Watcher", "search_web", "local_search", "get_search_context",
+    "iter_search_results", "iter_search_context",
+    "aiter_search_results", "aiter_search_context",
     "ConfigManager", "setup_env", "check_config",
     "refinire_web_search", "refinire_web_search_context", 
     "refinire_web_search_news", "refinire_web_search_research",
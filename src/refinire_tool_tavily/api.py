@@ -1,21 +1,82 @@
 """Refinire tool API for web search functionality."""
 
 import logging
-from typing import Dict, Any, Optional, List
-from .models import SearchRequest, SearchResponse
-from .service import TavilyService, TavilyServiceError
+from typing import AsyncIterator, Dict, Any, Iterator, Optional, List
+from .models import SearchRequest, SearchResponse, SearchResult
+from .breaker import get_circuit_breaker
+from .service import CircuitOpenError, TavilyService, TavilyServiceError
+from .local_index import get_local_index
+from .response_journal import get_response_journal
+from .scheduler import get_scheduler
+from .projection import FieldProjection
+from .profiling import sampled
 
 
 logger = logging.getLogger(__name__)
 
 
+def _response_to_dict(response: SearchResponse, projection: Optional[FieldProjection] = None) -> Dict[str, Any]:
+    """Convert a search response to the dictionary format of tool responses."""
+    if projection is not None:
+        return projection.response_to_dict(response)
+    results = []
+    for result in response.results:
+        result_dict = {
+            "title": result.title,
+            "url": result.url,
+            "content": result.content
+        }
+        if result.score is not None:
+            result_dict["score"] = result.score
+        if result.raw_content is not None:
+            result_dict["raw_content"] = result.raw_content
+        if result.rerank_score is not None:
+            result_dict["rerank_score"] = result.rerank_score
+        if result.passages is not None:
+            result_dict["passages"] = [passage.model_dump() for passage in result.passages]
+        results.append(result_dict)
+    
+    response_dict = {
+        "success": True,
+        "query": response.query,
+        "results": results,
+        "total_results": response.total_results
+    }
+    
+    # Add optional fields if present
+    if response.answer:
+        response_dict["answer"] = response.answer
+    if response.follow_up_questions:
+        response_dict["follow_up_questions"] = response.follow_up_questions
+    if response.search_time:
+        response_dict["search_time"] = response.search_time
+    if response.metadata:
+        response_dict["metadata"] = response.metadata
+    return response_dict
+
+
+@sampled
 def search_web(
     query: str,
     max_results: int = 5,
     include_domains: Optional[List[str]] = None,
     exclude_domains: Optional[List[str]] = None,
     include_answer: bool = False,
-    include_raw_content: bool = False
+    include_raw_content: bool = False,
+    deduplicate: bool = False,
+    rerank: bool = False,
+    passages: Optional[int] = None,
+    query_variants: Optional[List[str]] = None,
+    domain_shard_size: Optional[int] = None,
+    search_depth: Optional[str] = None,
+    progressive: bool = False,
+    latency_budget: Optional[float] = None,
+    local_first: bool = False,
+    priority: str = "interactive",
+    tenant: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
+    max_field_tokens: Optional[Dict[str, int]] = None
 ) -> Dict[str, Any]:
     """Web search tool for RefinireAgent using Tavily API.
     
@@ -29,6 +90,36 @@ def search_web(
         exclude_domains: List of domains to exclude from search (optional)
         include_answer: Include AI-generated answer in response (default: False)
         include_raw_content: Include raw content of web pages (default: False)
+        deduplicate: Collapse duplicate URLs and near-duplicate snippets, over-fetching
+            so that max_results is still filled (default: False)
+        rerank: Re-rank results locally with BM25 over content and raw content.
+            The re-ranking time is reported in metadata (default: False)
+        passages: Return only this many top passages of each page's raw content,
+            with their offsets, instead of the whole raw content (optional, 1-10)
+        query_variants: Search these query variants in parallel and merge them with
+            reciprocal rank fusion. Per-variant latency is reported in metadata (optional)
+        domain_shard_size: Split include_domains into shards of this size, search
+            them concurrently and merge by score (optional, 0 disables; defaults to
+            REFINIRE_TOOL_TAVILY_DOMAIN_SHARD_SIZE)
+        search_depth: Tavily search depth, "basic" or "advanced" (optional)
+        progressive: Search a few results at basic depth first and widen to
+            max_results at the requested depth only if they are insufficient (default: False)
+        latency_budget: Latency budget in seconds. When search_depth is not set,
+            depth and result count are chosen from observed latencies to fit it,
+            and the decision is reported in metadata (optional)
+        local_first: Answer from the local index of earlier results when it holds
+            enough fresh results covering the query, else search Tavily (default: False)
+        priority: Scheduling class, "interactive", "batch" or "background". When the
+            scheduler is enabled, interactive searches go first and the others may
+            be shed under load (default: "interactive")
+        tenant: Tenant or caller tag sharing its scheduling class fairly with others (optional)
+        fields: Result and response fields to return, such as ["title", "url", "answer"].
+            An answer, raw content or passages left out are not requested from
+            Tavily either (optional, defaults to all)
+        compact: Return only titles, URLs, snippets and the answer, each capped to a
+            short length (default: False)
+        max_field_tokens: Token cap per text field ("title", "content", "raw_content",
+            "answer"), truncating at a sentence boundary (optional)
     
     Returns:
         Dictionary containing search results with the following structure:
@@ -41,13 +132,16 @@ def search_web(
                     "url": str,
                     "content": str,
                     "score": float (optional),
-                    "raw_content": str (optional)
+                    "raw_content": str (optional),
+                    "rerank_score": float (optional),
+                    "passages": [{"text": str, "start": int, "end": int, "score": float}] (optional)
                 }
             ],
             "answer": str (optional),
             "follow_up_questions": List[str] (optional),
             "total_results": int,
             "search_time": float (optional),
+            "metadata": dict (optional, e.g. {"rerank_time": float}),
             "error": str (optional)
         }
     
@@ -56,6 +150,16 @@ def search_web(
         TavilyServiceError: If search fails due to API issues
     """
     try:
+        projection = FieldProjection.from_options(fields, compact, max_field_tokens)
+        if projection is not None:
+            # Do not have Tavily produce what the projection drops; raw content
+            # is still fetched when re-ranking uses it
+            include_answer = include_answer and "answer" in projection
+            if "passages" not in projection:
+                passages = None
+            if "raw_content" not in projection and passages is None and not rerank:
+                include_raw_content = False
+        
         # Validate and create search request
         search_request = SearchRequest(
             query=query,
@@ -63,44 +167,36 @@ def search_web(
             include_domains=include_domains,
             exclude_domains=exclude_domains,
             include_answer=include_answer,
-            include_raw_content=include_raw_content
+            include_raw_content=include_raw_content,
+            deduplicate=deduplicate,
+            rerank=rerank,
+            passages=passages,
+            query_variants=query_variants,
+            domain_shard_size=domain_shard_size,
+            search_depth=search_depth,
+            progressive=progressive,
+            latency_budget=latency_budget,
+            local_first=local_first
         )
         
         # Initialize service and perform search
         service = TavilyService()
-        response: SearchResponse = service.search(search_request)
-        
-        # Convert to dictionary format for tool response
-        results = []
-        for result in response.results:
-            result_dict = {
-                "title": result.title,
-                "url": result.url,
-                "content": result.content
-            }
-            if result.score is not None:
-                result_dict["score"] = result.score
-            if result.raw_content is not None:
-                result_dict["raw_content"] = result.raw_content
-            results.append(result_dict)
+        scheduler = get_scheduler()
+        if scheduler is not None:
+            response: SearchResponse = scheduler.run(lambda: service.search(search_request), priority, tenant)
+        else:
+            response = service.search(search_request)
         
-        response_dict = {
-            "success": True,
-            "query": response.query,
-            "results": results,
-            "total_results": response.total_results
-        }
+        # Only interactive turns are followed by the questions worth prefetching
+        if service.prefetcher is not None and priority == "interactive":
+            service.prefetcher.prefetch(service, search_request, response)
         
-        # Add optional fields if present
-        if response.answer:
-            response_dict["answer"] = response.answer
-        if response.follow_up_questions:
-            response_dict["follow_up_questions"] = response.follow_up_questions
-        if response.search_time:
-            response_dict["search_time"] = response.search_time
+        journal = get_response_journal()
+        if journal is not None:
+            journal.append(response)
         
         logger.info(f"Web search completed successfully for query: {query}")
-        return response_dict
+        return _response_to_dict(response, projection)
         
     except ValueError as e:
         logger.error(f"Invalid search parameters: {str(e)}")
@@ -114,13 +210,21 @@ def search_web(
     
     except TavilyServiceError as e:
         logger.error(f"Tavily service error: {str(e)}")
-        return {
+        error_response = {
             "success": False,
             "query": query,
             "results": [],
             "total_results": 0,
             "error": f"Search service error: {str(e)}"
         }
+        # Report the breaker state so agents can back off instead of retrying
+        if isinstance(e, CircuitOpenError):
+            error_response["circuit"] = e.circuit
+        else:
+            breaker = get_circuit_breaker()
+            if breaker is not None:
+                error_response["circuit"] = breaker.snapshot()
+        return error_response
     
     except Exception as e:
         logger.error(f"Unexpected error in web search: {str(e)}")
@@ -133,7 +237,8 @@ def search_web(
         }
 
 
-def get_search_context(query: str, max_results: int = 5) -> str:
+@sampled
+def get_search_context(query: str, max_results: int = 5, max_tokens: Optional[int] = None) -> str:
     """Get search context as formatted text for RefinireAgent.
     
     This is a convenience function that returns search results as a formatted string,
@@ -142,13 +247,150 @@ def get_search_context(query: str, max_results: int = 5) -> str:
     Args:
         query: Search query string
         max_results: Maximum number of results to include (default: 5)
+        max_tokens: Approximate token budget for the returned context (optional).
+            Content is truncated at sentence boundaries and low-score results
+            are dropped first to stay within it.
     
     Returns:
         Formatted search context string
     """
     try:
         service = TavilyService()
-        return service.get_search_context(query, max_results)
+        return service.get_search_context(query, max_results, max_tokens=max_tokens)
+    except Exception as e:
+        logger.error(f"Failed to get search context: {str(e)}")
+        return f"Search failed: {str(e)}"
+
+
+def local_search(query: str, max_results: int = 5, max_age: Optional[float] = None) -> Dict[str, Any]:
+    """Search the local index of previously retrieved results.
+    
+    No Tavily request is made. The index is enabled by setting
+    REFINIRE_TOOL_TAVILY_LOCAL_INDEX_PATH; every result retrieved from Tavily
+    is then added to it in the background.
+    
+    Args:
+        query: Search query string
+        max_results: Maximum number of results to return (default: 5, max: 20)
+        max_age: Ignore results retrieved more than this many seconds ago (optional)
+    
+    Returns:
+        Dictionary in the format of ``search_web``. Scores are local BM25
+        scores, and ``metadata["local"]`` reports query term coverage and the
+        age of the oldest returned result.
+    """
+    try:
+        request = SearchRequest(query=query, max_results=max_results)
+        index = get_local_index()
+        if index is None:
+            raise ValueError("Local index is not configured. Set REFINIRE_TOOL_TAVILY_LOCAL_INDEX_PATH.")
+        return _response_to_dict(index.search(request.query, request.max_results, max_age=max_age))
+    except Exception as e:
+        logger.error(f"Local search failed: {str(e)}")
+        return {
+            "success": False,
+            "query": query,
+            "results": [],
+            "total_results": 0,
+            "error": f"Local search failed: {str(e)}"
+        }
+
+
+def iter_search_results(
+    query: str,
+    max_results: int = 5,
+    include_domains: Optional[List[str]] = None,
+    exclude_domains: Optional[List[str]] = None,
+    include_answer: bool = False,
+    include_raw_content: bool = False
+) -> Iterator[SearchResult]:
+    """Stream web search results one at a time.
+    
+    Unlike ``search_web``, results are yielded as soon as each one is parsed,
+    so agents streaming into a prompt or UI can start with the top result.
+    
+    Args:
+        query: Search query string (required)
+        max_results: Maximum number of results to return (default: 5, max: 20)
+        include_domains: List of domains to include in search (optional)
+        exclude_domains: List of domains to exclude from search (optional)
+        include_answer: Include AI-generated answer in response (default: False)
+        include_raw_content: Include raw content of web pages (default: False)
+    
+    Yields:
+        SearchResult objects in ranking order
+    
+    Raises:
+        ValueError: If query is empty or contains invalid characters
+        TavilyServiceError: If search fails due to API issues
+    """
+    search_request = SearchRequest(
+        query=query,
+        max_results=max_results,
+        include_domains=include_domains,
+        exclude_domains=exclude_domains,
+        include_answer=include_answer,
+        include_raw_content=include_raw_content
+    )
+    yield from TavilyService().iter_search(search_request)
+
+
+def iter_search_context(query: str, max_results: int = 5, max_tokens: Optional[int] = None) -> Iterator[str]:
+    """Stream search context as formatted chunks.
+    
+    Concatenating the chunks gives the same text as ``get_search_context``,
+    without ever holding the full formatted string.
+    
+    Args:
+        query: Search query string
+        max_results: Maximum number of results to include (default: 5)
+        max_tokens: Approximate token budget for the context (optional)
+    
+    Yields:
+        Formatted context chunks
+    """
+    try:
+        service = TavilyService()
+    except Exception as e:
+        logger.error(f"Failed to get search context: {str(e)}")
+        yield f"Search failed: {str(e)}"
+        return
+    yield from service.iter_search_context(query, max_results, max_tokens)
+
+
+async def aiter_search_results(
+    query: str,
+    max_results: int = 5,
+    include_domains: Optional[List[str]] = None,
+    exclude_domains: Optional[List[str]] = None,
+    include_answer: bool = False,
+    include_raw_content: bool = False
+) -> AsyncIterator[SearchResult]:
+    """Async-iterator version of ``iter_search_results``.
+    
+    Raises:
+        ValueError: If query is empty or contains invalid characters
+        TavilyServiceError: If search fails due to API issues
+    """
+    search_request = SearchRequest(
+        query=query,
+        max_results=max_results,
+        include_domains=include_domains,
+        exclude_domains=exclude_domains,
+        include_answer=include_answer,
+        include_raw_content=include_raw_content
+    )
+    async for result in TavilyService().aiter_search(search_request):
+        yield result
+
+
+async def aiter_search_context(query: str, max_results: int = 5, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+    """Async-iterator version of ``iter_search_context``."""
+    try:
+        service = TavilyService()
     except Exception as e:
         logger.error(f"Failed to get search context: {str(e)}")
-        return f"Search failed: {str(e)}"
\ No newline at end of file
+        yield f"Search failed: {str(e)}"
+        return
+    async for chunk in service.aiter_search_context(query, max_results, max_tokens):
+        yield chunk
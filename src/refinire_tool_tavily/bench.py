@@ -0,0 +1,283 @@
+"""Load generator that replays JSONL query logs at a target QPS.
+
+Requests are issued open-loop: each one has an intended start time taken from
+the schedule, and its latency is measured from that intended time rather than
+from when a worker picked it up. A saturated service therefore shows up as
+growing latency instead of a silently lower request rate (coordinated omission).
+
+Example:
+    refinire-tavily-bench queries.jsonl --qps 20 --replay journal.log --cache-ttl 300
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+
+from .utils import percentile
+
+
+logger = logging.getLogger(__name__)
+
+TOOL_NAMES = [
+    "search_web",
+    "get_search_context",
+    "web_search",
+    "web_search_context",
+    "web_search_news",
+    "web_search_research",
+    "web_search_programming",
+]
+
+
+def resolve_tool(name: str) -> Callable[..., Any]:
+    """Return the callable benchmarked under the given tool name.
+
+    Refinire tools are imported lazily so that benchmarking ``search_web``
+    does not require the agent framework to be importable.
+    """
+    if name == "search_web":
+        from .api import search_web
+        return search_web
+    if name == "get_search_context":
+        from .api import get_search_context
+        return get_search_context
+    if name in TOOL_NAMES:
+        from . import tools
+        return getattr(tools, f"refinire_{name}")
+    raise ValueError(f"Unknown tool: {name}. Choose from: {', '.join(TOOL_NAMES)}")
+
+
+def iter_queries(stream: TextIO, query_field: str = "query") -> Iterator[Dict[str, Any]]:
+    """Stream tool keyword arguments from a JSONL query log.
+
+    Each line is either a JSON string (the query itself) or an object whose
+    ``query_field`` holds the query. An integer ``max_results`` is passed
+    through when present. Blank and malformed lines are skipped.
+    """
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping malformed query log line {line_number}")
+            continue
+        if isinstance(record, str):
+            yield {"query": record}
+        elif isinstance(record, dict) and record.get(query_field):
+            kwargs = {"query": str(record[query_field])}
+            if isinstance(record.get("max_results"), int):
+                kwargs["max_results"] = record["max_results"]
+            yield kwargs
+
+
+def scheduled_offset(index: int, qps: float, ramp_to: Optional[float] = None, ramp_duration: float = 0.0) -> float:
+    """Return the intended start time of the request at ``index``.
+
+    With a ramp, the rate grows linearly from ``qps`` to ``ramp_to`` over
+    ``ramp_duration`` seconds and stays at ``ramp_to`` afterwards.
+
+    Args:
+        index: Zero-based request index
+        qps: Starting request rate
+        ramp_to: Final request rate (optional)
+        ramp_duration: Ramp length in seconds
+
+    Returns:
+        Offset in seconds from the start of the run
+    """
+    if not ramp_to or ramp_duration <= 0:
+        return index / qps
+
+    ramp_requests = (qps + ramp_to) / 2 * ramp_duration
+    if index >= ramp_requests:
+        return ramp_duration + (index - ramp_requests) / ramp_to
+
+    # Solve qps * t + slope * t^2 / 2 = index for t
+    slope = (ramp_to - qps) / ramp_duration
+    if slope == 0:
+        return index / qps
+    return (-qps + math.sqrt(qps * qps + 2 * slope * index)) / slope
+
+
+def _is_error(result: Any) -> bool:
+    if isinstance(result, dict):
+        return not result.get("success", False)
+    if isinstance(result, str):
+        return result.startswith("Search failed")
+    return result is None
+
+
+def run_bench(
+    queries: Iterator[Dict[str, Any]],
+    tool: Callable[..., Any],
+    qps: float,
+    ramp_to: Optional[float] = None,
+    ramp_duration: float = 0.0,
+    duration: Optional[float] = None,
+    limit: Optional[int] = None,
+    max_workers: int = 64
+) -> Dict[str, Any]:
+    """Replay queries through a tool on an open-loop schedule.
+
+    Args:
+        queries: Iterator of tool keyword arguments
+        tool: Callable to benchmark
+        qps: Target (starting) request rate
+        ramp_to: Final request rate for a linear ramp (optional)
+        ramp_duration: Ramp length in seconds
+        duration: Stop scheduling new requests after this many seconds
+        limit: Stop after this many requests
+        max_workers: Worker threads available to in-flight requests
+
+    Returns:
+        Report dictionary with request counts, rates, latency percentiles
+        (in seconds), error rate and cache hit rate
+    """
+    from .cache import get_default_cache
+
+    if qps <= 0:
+        raise ValueError("qps must be positive")
+
+    cache = get_default_cache()
+    cache_before = cache.stats() if cache is not None else None
+
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def timed_call(kwargs: Dict[str, Any], intended_start: float) -> None:
+        nonlocal errors
+        try:
+            failed = _is_error(tool(**kwargs))
+        except Exception as e:
+            logger.debug(f"Benchmark request failed: {e}")
+            failed = True
+        latency = time.perf_counter() - intended_start
+        with lock:
+            latencies.append(latency)
+            if failed:
+                errors += 1
+
+    sent = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for kwargs in queries:
+            if limit is not None and sent >= limit:
+                break
+            offset = scheduled_offset(sent, qps, ramp_to, ramp_duration)
+            if duration is not None and offset >= duration:
+                break
+            intended_start = start + offset
+            delay = intended_start - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(timed_call, kwargs, intended_start)
+            sent += 1
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    report: Dict[str, Any] = {
+        "requests": sent,
+        "errors": errors,
+        "error_rate": errors / sent if sent else 0.0,
+        "elapsed": elapsed,
+        "offered_qps": sent / scheduled_offset(sent, qps, ramp_to, ramp_duration) if sent > 1 else qps,
+        "achieved_qps": sent / elapsed if elapsed > 0 else 0.0,
+        "latency": {
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "cache_hit_rate": None,
+    }
+
+    if cache is not None:
+        cache_after = cache.stats()
+        hits = cache_after["hits"] - cache_before["hits"]
+        lookups = hits + cache_after["misses"] - cache_before["misses"]
+        report["cache_hit_rate"] = hits / lookups if lookups else 0.0
+
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Format a benchmark report for terminal output."""
+    latency = report["latency"]
+    cache_hit_rate = report["cache_hit_rate"]
+    lines = [
+        "Benchmark Report:",
+        "=" * 20,
+        f"Requests:       {report['requests']} in {report['elapsed']:.2f}s",
+        f"Offered QPS:    {report['offered_qps']:.2f}",
+        f"Achieved QPS:   {report['achieved_qps']:.2f}",
+        f"Errors:         {report['errors']} ({report['error_rate']:.2%})",
+        "Latency (ms):   p50={:.1f} p90={:.1f} p99={:.1f} max={:.1f}".format(
+            latency["p50"] * 1000, latency["p90"] * 1000, latency["p99"] * 1000, latency["max"] * 1000
+        ),
+        f"Cache hit rate: {cache_hit_rate:.2%}" if cache_hit_rate is not None else "Cache hit rate: n/a (cache disabled)",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Console entry point for ``refinire-tavily-bench``."""
+    parser = argparse.ArgumentParser(
+        prog="refinire-tavily-bench",
+        description="Replay a JSONL query log through refinire-tool-tavily at a target QPS."
+    )
+    parser.add_argument("log", help="JSONL query log path, or '-' for stdin")
+    parser.add_argument("--tool", default="search_web", choices=TOOL_NAMES, help="Function or tool to benchmark")
+    parser.add_argument("--query-field", default="query", help="JSON field holding the query (default: query)")
+    parser.add_argument("--qps", type=float, default=1.0, help="Target (starting) requests per second")
+    parser.add_argument("--ramp-to", type=float, help="Final requests per second for a linear ramp")
+    parser.add_argument("--ramp-duration", type=float, default=0.0, help="Ramp length in seconds")
+    parser.add_argument("--duration", type=float, help="Stop scheduling requests after this many seconds")
+    parser.add_argument("--limit", type=int, help="Stop after this many requests")
+    parser.add_argument("--max-workers", type=int, default=64, help="Worker threads for in-flight requests")
+    parser.add_argument("--replay", help="Serve responses from a recorded journal instead of the Tavily API")
+    parser.add_argument("--latency-scale", type=float, help="Reproduce recorded latencies scaled by this factor")
+    parser.add_argument("--cache-ttl", type=float, help="Enable the shared response cache with this TTL")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    # Services read these when search_web and the tools construct them
+    if args.replay:
+        os.environ["REFINIRE_TOOL_TAVILY_REPLAY_PATH"] = args.replay
+    if args.latency_scale is not None:
+        os.environ["REFINIRE_TOOL_TAVILY_REPLAY_LATENCY_SCALE"] = str(args.latency_scale)
+    if args.cache_ttl is not None:
+        os.environ["REFINIRE_TOOL_TAVILY_CACHE_TTL"] = str(args.cache_ttl)
+
+    tool = resolve_tool(args.tool)
+    stream = sys.stdin if args.log == "-" else open(args.log, encoding="utf-8")
+    try:
+        report = run_bench(
+            iter_queries(stream, args.query_field),
+            tool,
+            qps=args.qps,
+            ramp_to=args.ramp_to,
+            ramp_duration=args.ramp_duration,
+            duration=args.duration,
+            limit=args.limit,
+            max_workers=args.max_workers
+        )
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0 if report["requests"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""Circuit breaker protecting callers from an unavailable Tavily API."""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .metrics import ServiceMetrics, get_metrics
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker.
+
+    Closed, every call goes through and its outcome is recorded. When the
+    window holds at least ``min_calls`` calls and the share of failed calls,
+    or of calls slower than ``slow_call_seconds``, reaches its threshold, the
+    breaker opens and calls are rejected at once. After ``open_seconds`` it is
+    half-open: up to ``probe_calls`` probes are let through, and the breaker
+    closes when they all succeed quickly or opens again when one does not. A
+    probe not recorded within ``probe_timeout`` is taken as lost and its slot
+    is handed to a new probe.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 60.0,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate: float = 0.8,
+        open_seconds: float = 30.0,
+        probe_calls: int = 3,
+        probe_timeout: Optional[float] = None,
+        metrics: Optional[ServiceMetrics] = None
+    ):
+        """Initialize circuit breaker.
+
+        Args:
+            window_seconds: Length of the rolling window of recorded calls
+            min_calls: Calls needed in the window before the breaker can open
+            failure_rate: Share of failed calls that opens the breaker
+            slow_call_seconds: Latency above which a call counts as slow
+            slow_call_rate: Share of slow calls that opens the breaker
+            open_seconds: Time the breaker stays open before probing
+            probe_calls: Probes let through while half-open
+            probe_timeout: Seconds after which an unrecorded probe is reclaimed
+                (defaults to ``open_seconds``)
+            metrics: Metrics receiving state and transition counts
+                (defaults to the process-wide metrics)
+        """
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.probe_calls = probe_calls
+        self.probe_timeout = open_seconds if probe_timeout is None else probe_timeout
+        self.metrics = metrics if metrics is not None else get_metrics()
+
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()  # time, failed, slow
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes: Deque[float] = deque()  # start times of probes in flight
+        self._probes_passed = 0
+        self._lock = threading.Lock()
+        self.metrics.set_gauge("circuit.state", CLOSED)
+
+    @property
+    def state(self) -> str:
+        """Current state: ``closed``, ``open`` or ``half_open``."""
+        with self._lock:
+            self._advance(time.time())
+            return self._state
+
+    def _advance(self, now: float) -> None:
+        if self._state == OPEN and now >= self._opened_at + self.open_seconds:
+            self._transition(HALF_OPEN)
+            self._probes.clear()
+            self._probes_passed = 0
+
+    def _transition(self, state: str) -> None:
+        logger.warning(f"Circuit breaker {self._state} -> {state}")
+        self._state = state
+        self.metrics.set_gauge("circuit.state", state)
+        self.metrics.increment(f"circuit.{state}")
+
+    def _open(self, now: float) -> None:
+        self._opened_at = now
+        self._transition(OPEN)
+
+    def allow(self) -> bool:
+        """Check whether a call may proceed, reserving a probe when half-open."""
+        with self._lock:
+            now = time.time()
+            self._advance(now)
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN:
+                # Reclaim probes whose callers never recorded an outcome
+                while self._probes and self._probes[0] < now - self.probe_timeout:
+                    self._probes.popleft()
+                    self.metrics.increment("circuit.probes_lost")
+                if len(self._probes) + self._probes_passed < self.probe_calls:
+                    self._probes.append(now)
+                    return True
+        self.metrics.increment("circuit.rejected")
+        return False
+
+    def cancel(self) -> None:
+        """Give back the probe reserved by ``allow`` for a call that was not made."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes.pop()
+
+    def record(self, latency: float, failed: bool = False) -> None:
+        """Record the outcome of a call that ``allow`` let through."""
+        now = time.time()
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if self._probes:
+                    self._probes.popleft()
+                if failed or slow:
+                    self._open(now)
+                    return
+                self._probes_passed += 1
+                if self._probes_passed >= self.probe_calls:
+                    self._calls.clear()
+                    self._transition(CLOSED)
+                return
+            if self._state == OPEN:
+                return
+
+            self._calls.append((now, failed, slow))
+            while self._calls and self._calls[0][0] < now - self.window_seconds:
+                self._calls.popleft()
+            calls = len(self._calls)
+            if calls >= self.min_calls:
+                failures = sum(1 for _, call_failed, _ in self._calls if call_failed)
+                slow_calls = sum(1 for _, _, call_slow in self._calls if call_slow)
+                if failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_call_rate:
+                    self._open(now)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the breaker state for callers planning around an outage.
+
+        Returns:
+            Dictionary with ``state``, the window's ``calls``, ``failure_rate``
+            and ``slow_call_rate``, and ``retry_after`` (seconds until probing
+            starts, 0 unless open)
+        """
+        with self._lock:
+            now = time.time()
+            self._advance(now)
+            calls = len(self._calls)
+            return {
+                "state": self._state,
+                "calls": calls,
+                "failure_rate": sum(1 for call in self._calls if call[1]) / calls if calls else 0.0,
+                "slow_call_rate": sum(1 for call in self._calls if call[2]) / calls if calls else 0.0,
+                "retry_after": max(0.0, self._opened_at + self.open_seconds - now) if self._state == OPEN else 0.0
+            }
+
+
+_default_breaker: Optional[CircuitBreaker] = None
+_default_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> Optional[CircuitBreaker]:
+    """Return the process-wide circuit breaker, or None when it is disabled.
+
+    The breaker is shared by every ``TavilyService`` so that all agent threads
+    see the same upstream state. It is enabled by
+    REFINIRE_TOOL_TAVILY_BREAKER_ENABLED and tuned by
+    REFINIRE_TOOL_TAVILY_BREAKER_FAILURE_RATE, _SLOW_CALL_SECONDS and
+    _OPEN_SECONDS.
+    """
+    global _default_breaker
+    if os.getenv("REFINIRE_TOOL_TAVILY_BREAKER_ENABLED", "false").lower() != "true":
+        return None
+    with _default_breaker_lock:
+        if _default_breaker is None:
+            _default_breaker = CircuitBreaker(
+                failure_rate=float(os.getenv("REFINIRE_TOOL_TAVILY_BREAKER_FAILURE_RATE", "0.5") or 0.5),
+                slow_call_seconds=float(os.getenv("REFINIRE_TOOL_TAVILY_BREAKER_SLOW_CALL_SECONDS", "10") or 10),
+                open_seconds=float(os.getenv("REFINIRE_TOOL_TAVILY_BREAKER_OPEN_SECONDS", "30") or 30)
+            )
+        return _default_breaker
@@ -0,0 +1,224 @@
+"""Bulk search of query files into a JSONL results file.
+
+Queries are streamed from a JSONL or CSV file (or stdin) and searched
+concurrently, and results are written to the output in input order as soon
+as they are complete. At most a small window of queries is in flight or
+waiting to be written, so memory use does not depend on the input size.
+
+Every few results a checkpoint records how many queries are done and the
+output size at that point. An interrupted run resumes from the checkpoint:
+the output is truncated back to the checkpointed size and the queries before
+it are skipped, so no query is searched or written twice.
+
+Example:
+    refinire-tavily-bulk queries.csv -o results.jsonl --concurrency 8 --qps 5 --cache-ttl 3600
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, TextIO
+
+from .bench import TOOL_NAMES, iter_queries, resolve_tool, scheduled_offset
+
+
+logger = logging.getLogger(__name__)
+
+# Results written between checkpoints
+CHECKPOINT_EVERY = 100
+# Queries in flight or waiting to be written, per unit of concurrency
+WINDOW_PER_WORKER = 4
+
+
+def iter_csv_queries(stream: TextIO, query_field: str = "query") -> Iterator[Dict[str, Any]]:
+    """Stream tool keyword arguments from a CSV file with a header row.
+
+    The ``query_field`` column holds the query; an integer ``max_results``
+    column is passed through when present. Rows without a query are skipped.
+    """
+    for row in csv.DictReader(stream):
+        query = (row.get(query_field) or "").strip()
+        if not query:
+            continue
+        kwargs: Dict[str, Any] = {"query": query}
+        if (row.get("max_results") or "").strip().isdigit():
+            kwargs["max_results"] = int(row["max_results"])
+        yield kwargs
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, int]]:
+    """Return a saved checkpoint, or None if there is none."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    return {"next_index": int(checkpoint["next_index"]), "output_offset": int(checkpoint["output_offset"])}
+
+
+def save_checkpoint(path: str, next_index: int, output_offset: int) -> None:
+    """Atomically save the number of queries done and the output size."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"next_index": next_index, "output_offset": output_offset}, f)
+    os.replace(tmp_path, path)
+
+
+def run_bulk(
+    queries: Iterator[Dict[str, Any]],
+    tool: Callable[..., Any],
+    output: BinaryIO,
+    concurrency: int = 4,
+    qps: Optional[float] = None,
+    start_index: int = 0,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_every: int = CHECKPOINT_EVERY
+) -> Dict[str, Any]:
+    """Search queries through a tool and write results to JSONL in input order.
+
+    Args:
+        queries: Iterator of tool keyword arguments
+        tool: Callable performing one search
+        output: Binary file the JSONL records are appended to
+        concurrency: Searches run at the same time
+        qps: Maximum searches started per second (optional)
+        start_index: Skip the queries before this index (resuming a run)
+        checkpoint_path: File the progress is checkpointed to (optional)
+        checkpoint_every: Results written between checkpoints
+
+    Returns:
+        Summary with the ``processed`` and ``errors`` counts of this run,
+        the ``skipped`` queries and the ``next_index`` to resume from
+    """
+    window = threading.Semaphore(concurrency * WINDOW_PER_WORKER)
+    lock = threading.Lock()
+    completed: Dict[int, bytes] = {}
+    state = {"next_index": start_index, "processed": 0, "errors": 0}
+
+    def checkpoint() -> None:
+        output.flush()
+        if checkpoint_path:
+            save_checkpoint(checkpoint_path, state["next_index"], output.tell())
+
+    def search(index: int, kwargs: Dict[str, Any]) -> None:
+        record: Dict[str, Any] = {"index": index, "query": kwargs["query"]}
+        try:
+            result = tool(**kwargs)
+            record["result"] = result
+            failed = isinstance(result, dict) and not result.get("success", False)
+        except Exception as e:
+            record["error"] = str(e)
+            failed = True
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+        with lock:
+            state["errors"] += failed
+            completed[index] = line
+            # Write every result whose predecessors are all written
+            while state["next_index"] in completed:
+                output.write(completed.pop(state["next_index"]))
+                state["next_index"] += 1
+                state["processed"] += 1
+                window.release()
+                if state["processed"] % checkpoint_every == 0:
+                    checkpoint()
+
+    skipped = 0
+    started = 0
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for index, kwargs in enumerate(queries):
+                if index < start_index:
+                    skipped += 1
+                    continue
+                if qps:
+                    delay = start + scheduled_offset(started, qps) - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                window.acquire()
+                executor.submit(search, index, kwargs)
+                started += 1
+    finally:
+        # Also reached on interruption, once the searches in flight are written
+        with lock:
+            checkpoint()
+
+    return {
+        "processed": state["processed"],
+        "errors": state["errors"],
+        "skipped": skipped,
+        "next_index": state["next_index"]
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Console entry point for ``refinire-tavily-bulk``."""
+    parser = argparse.ArgumentParser(
+        prog="refinire-tavily-bulk",
+        description="Search every query of a JSONL or CSV file and write the results to JSONL."
+    )
+    parser.add_argument("input", help="JSONL or CSV query file, or '-' for JSONL on stdin")
+    parser.add_argument("-o", "--output", required=True, help="JSONL results file")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from the file extension)")
+    parser.add_argument("--tool", default="search_web", choices=TOOL_NAMES, help="Function or tool to search with")
+    parser.add_argument("--query-field", default="query", help="Field or column holding the query (default: query)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Searches run at the same time")
+    parser.add_argument("--qps", type=float, help="Maximum searches started per second")
+    parser.add_argument("--cache-ttl", type=float, help="Enable the shared response cache with this TTL")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_EVERY, help="Results written between checkpoints")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start over")
+    args = parser.parse_args(argv)
+
+    # Services read this when search_web and the tools construct them
+    if args.cache_ttl is not None:
+        os.environ["REFINIRE_TOOL_TAVILY_CACHE_TTL"] = str(args.cache_ttl)
+
+    tool = resolve_tool(args.tool)
+    if args.tool == "search_web":
+        # Bulk jobs yield to interactive searches when the scheduler is enabled
+        search_web = tool
+
+        def tool(**kwargs: Any) -> Any:
+            return search_web(priority="batch", tenant="bulk", **kwargs)
+
+    checkpoint_path = args.checkpoint or f"{args.output}.checkpoint"
+    checkpoint = None if args.restart else load_checkpoint(checkpoint_path)
+    output = open(args.output, "r+b" if checkpoint and os.path.exists(args.output) else "wb")
+    if checkpoint:
+        # Drop results written after the checkpoint; their queries are searched again
+        output.truncate(checkpoint["output_offset"])
+        output.seek(0, os.SEEK_END)
+        logger.info(f"Resuming from query {checkpoint['next_index']}")
+
+    input_format = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+    stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    try:
+        read = iter_csv_queries if input_format == "csv" else iter_queries
+        summary = run_bulk(
+            read(stream, args.query_field),
+            tool,
+            output,
+            concurrency=args.concurrency,
+            qps=args.qps,
+            start_index=checkpoint["next_index"] if checkpoint else 0,
+            checkpoint_path=checkpoint_path,
+            checkpoint_every=args.checkpoint_every
+        )
+    finally:
+        output.close()
+        if stream is not sys.stdin:
+            stream.close()
+
+    print(json.dumps(summary))
+    return 0 if summary["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
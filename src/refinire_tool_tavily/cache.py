@@ -0,0 +1,279 @@
+"""In-process response cache for Tavily searches."""
+
+import atexit
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+
+logger = logging.getLogger(__name__)
+
+# Snapshot files start with a magic number, a format version and the entry count
+_SNAPSHOT_HEADER = struct.Struct("<4sHI")
+_SNAPSHOT_MAGIC = b"TVSC"
+_SNAPSHOT_VERSION = 1
+# Each entry: expiry time, access frequency, key length, compressed response length
+_SNAPSHOT_ENTRY = struct.Struct("<dIHI")
+
+
+class _SnapshotValue:
+    """A response still in the memory-mapped snapshot, decoded on first use."""
+
+    def __init__(self, snapshot: mmap.mmap, offset: int, length: int):
+        self.snapshot = snapshot
+        self.offset = offset
+        self.length = length
+
+    def decode(self) -> Dict[str, Any]:
+        return json.loads(zlib.decompress(self.snapshot[self.offset:self.offset + self.length]))
+
+
+class SearchCache:
+    """Thread-safe TTL + LRU cache of raw Tavily responses.
+
+    Entries are keyed by the canonical request key of the Tavily parameters, so
+    every later processing stage runs on cached responses exactly as it does on
+    fresh ones.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024, stale_ttl: float = 0.0):
+        """Initialize search cache.
+
+        Args:
+            ttl: Time-to-live of an entry in seconds
+            max_entries: Maximum number of entries kept before evicting the
+                least recently used one
+            stale_ttl: Seconds an expired entry is kept for ``get_stale``
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._frequency: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _resolve(self, key: str, entry: Tuple[float, Any]) -> Dict[str, Any]:
+        # Decode a response loaded from a snapshot the first time it is used
+        if isinstance(entry[1], _SnapshotValue):
+            entry = (entry[0], entry[1].decode())
+            self._entries[key] = entry
+        return entry[1]
+
+    def _remove(self, key: str) -> None:
+        del self._entries[key]
+        self._frequency.pop(key, None)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached response, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            now = time.time()
+            if entry is None or entry[0] < now:
+                if entry is not None and entry[0] + self.stale_ttl < now:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._frequency[key] = self._frequency.get(key, 0) + 1
+            self.hits += 1
+            return self._resolve(key, entry)
+
+    def get_stale(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached response even if expired, within ``stale_ttl`` of expiry.
+
+        Used to keep serving while the Tavily API is unavailable; not counted
+        in hit/miss statistics.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] + self.stale_ttl < time.time():
+                return None
+            return self._resolve(key, entry)
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response under the given key."""
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, response)
+            self._entries.move_to_end(key)
+            self._frequency[key] = self._frequency.get(key, 0) + 1
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._frequency.pop(evicted, None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._frequency.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        """Whether an unexpired response is cached, without counting a lookup."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] >= time.time()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate and entries
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries)
+            }
+
+    def save_snapshot(self, path: Union[str, Path], max_entries: int = 256) -> int:
+        """Write the most frequently used unexpired entries to a snapshot file.
+
+        The file is replaced atomically, so a cache that has it memory-mapped
+        keeps reading the previous snapshot.
+
+        Args:
+            path: Snapshot file
+            max_entries: Entries written, most frequently used first
+
+        Returns:
+            Number of entries written
+        """
+        now = time.time()
+        with self._lock:
+            live = [(key, entry) for key, entry in self._entries.items() if entry[0] >= now]
+            live.sort(key=lambda item: self._frequency.get(item[0], 0), reverse=True)
+            hottest = [
+                (key, expires, self._frequency.get(key, 0), self._resolve(key, (expires, value)))
+                for key, (expires, value) in live[:max_entries]
+            ]
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, len(hottest)))
+            for key, expires, frequency, response in hottest:
+                key_bytes = key.encode("utf-8")
+                payload = zlib.compress(json.dumps(response, separators=(",", ":")).encode("utf-8"))
+                f.write(_SNAPSHOT_ENTRY.pack(expires, frequency, len(key_bytes), len(payload)))
+                f.write(key_bytes)
+                f.write(payload)
+        os.replace(tmp_path, path)
+        return len(hottest)
+
+    def load_snapshot(self, path: Union[str, Path]) -> int:
+        """Warm the cache from a snapshot file written by ``save_snapshot``.
+
+        The file is memory-mapped and only the entry headers and keys are read;
+        each response is decoded the first time it is served. Entries that
+        have expired, or that the cache already holds, are skipped.
+
+        Args:
+            path: Snapshot file
+
+        Returns:
+            Number of entries loaded
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _SNAPSHOT_HEADER.size:
+                return 0
+            # The map stays valid after the file is closed, until its values are released
+            snapshot = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _SNAPSHOT_HEADER.unpack_from(snapshot, 0)
+        if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+            snapshot.close()
+            raise ValueError(f"Not a search cache snapshot: {path}")
+
+        now = time.time()
+        offset = _SNAPSHOT_HEADER.size
+        loaded = 0
+        with self._lock:
+            for _ in range(count):
+                expires, frequency, key_length, payload_length = _SNAPSHOT_ENTRY.unpack_from(snapshot, offset)
+                offset += _SNAPSHOT_ENTRY.size
+                key = snapshot[offset:offset + key_length].decode("utf-8")
+                offset += key_length
+                if expires >= now and key not in self._entries and len(self._entries) < self.max_entries:
+                    # Older than anything cached since start-up in LRU order
+                    self._entries[key] = (expires, _SnapshotValue(snapshot, offset, payload_length))
+                    self._entries.move_to_end(key, last=False)
+                    self._frequency[key] = frequency
+                    loaded += 1
+                offset += payload_length
+        return loaded
+
+    def autosave(self, path: Union[str, Path], max_entries: int = 256, interval: float = 0.0) -> None:
+        """Snapshot the cache at exit and, if an interval is given, periodically.
+
+        Args:
+            path: Snapshot file
+            max_entries: Entries written per snapshot
+            interval: Seconds between snapshots (0 snapshots only at exit)
+        """
+        def save() -> None:
+            try:
+                self.save_snapshot(path, max_entries)
+            except OSError as e:
+                logger.warning(f"Could not write cache snapshot {path}: {str(e)}")
+
+        atexit.register(save)
+        if interval > 0:
+            def run() -> None:
+                while True:
+                    time.sleep(interval)
+                    save()
+
+            threading.Thread(target=run, name="tavily-cache-snapshot", daemon=True).start()
+
+
+_default_cache: Optional[SearchCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[SearchCache]:
+    """Return the process-wide cache configured by environment variables.
+
+    The cache is shared by every ``TavilyService`` created without an explicit
+    cache, which is what makes it effective for ``search_web`` and the Refinire
+    tools. It is disabled unless REFINIRE_TOOL_TAVILY_CACHE_TTL is positive.
+    When REFINIRE_TOOL_TAVILY_CACHE_SNAPSHOT_PATH is set, the cache is warmed
+    from that snapshot and its hottest entries are written back at exit and
+    every REFINIRE_TOOL_TAVILY_CACHE_SNAPSHOT_INTERVAL seconds.
+    """
+    global _default_cache
+    ttl = float(os.getenv("REFINIRE_TOOL_TAVILY_CACHE_TTL", "0") or 0)
+    if ttl <= 0:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            max_entries = int(os.getenv("REFINIRE_TOOL_TAVILY_CACHE_MAX_ENTRIES", "1024"))
+            stale_ttl = float(os.getenv("REFINIRE_TOOL_TAVILY_CACHE_STALE_TTL", "0") or 0)
+            _default_cache = SearchCache(ttl=ttl, max_entries=max_entries, stale_ttl=stale_ttl)
+            snapshot_path = os.getenv("REFINIRE_TOOL_TAVILY_CACHE_SNAPSHOT_PATH")
+            if snapshot_path:
+                if os.path.exists(snapshot_path):
+                    try:
+                        _default_cache.load_snapshot(snapshot_path)
+                    except (OSError, ValueError, struct.error) as e:
+                        logger.warning(f"Ignoring unreadable cache snapshot {snapshot_path}: {str(e)}")
+                _default_cache.autosave(
+                    snapshot_path,
+                    max_entries=int(os.getenv("REFINIRE_TOOL_TAVILY_CACHE_SNAPSHOT_ENTRIES", "256") or 256),
+                    interval=float(os.getenv("REFINIRE_TOOL_TAVILY_CACHE_SNAPSHOT_INTERVAL", "0") or 0)
+                )
+        return _default_cache
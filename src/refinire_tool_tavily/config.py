@@ -7,6 +7,18 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 
 
+def mask_api_key(api_key: str) -> str:
+    """Mask an API key for display, keeping only its first 8 characters.
+    
+    Args:
+        api_key: API key to mask
+        
+    Returns:
+        Masked API key
+    """
+    return api_key[:8] + "*" * (len(api_key) - 8) if len(api_key) > 8 else "*" * len(api_key)
+
+
 class ConfigManager:
     """Configuration manager for environment variables and settings."""
     
@@ -95,14 +107,16 @@ REFINIRE_TOOL_TAVILY_INCLUDE_RAW_CONTENT=false
         }
         
         try:
-            # Check TAVILY_API_KEY
+            # Check TAVILY_API_KEY, unless a TAVILY_API_KEYS pool replaces it
             api_key = os.getenv("TAVILY_API_KEY")
-            if not api_key:
-                results["valid"] = False
-                results["missing_required"].append("TAVILY_API_KEY")
-            elif api_key == "your_tavily_api_key_here":
-                results["valid"] = False
-                results["warnings"].append("TAVILY_API_KEY is still set to template value")
+            has_key_pool = any(key.strip() for key in os.getenv("TAVILY_API_KEYS", "").split(","))
+            if not has_key_pool:
+                if not api_key:
+                    results["valid"] = False
+                    results["missing_required"].append("TAVILY_API_KEY")
+                elif api_key == "your_tavily_api_key_here":
+                    results["valid"] = False
+                    results["warnings"].append("TAVILY_API_KEY is still set to template value")
             
         except Exception as e:
             results["valid"] = False
@@ -118,6 +132,7 @@ REFINIRE_TOOL_TAVILY_INCLUDE_RAW_CONTENT=false
         """
         return {
             "tavily_api_key": os.getenv("TAVILY_API_KEY"),
+            "tavily_api_keys": [key.strip() for key in os.getenv("TAVILY_API_KEYS", "").split(",") if key.strip()],
             "default_max_results": int(os.getenv("REFINIRE_TOOL_TAVILY_MAX_RESULTS", "5")),
             "default_include_answer": os.getenv("REFINIRE_TOOL_TAVILY_INCLUDE_ANSWER", "false").lower() == "true",
             "default_include_raw_content": os.getenv("REFINIRE_TOOL_TAVILY_INCLUDE_RAW_CONTENT", "false").lower() == "true"
@@ -151,8 +166,11 @@ REFINIRE_TOOL_TAVILY_INCLUDE_RAW_CONTENT=false
         config = self.get_config()
         for key, value in config.items():
             if "api_key" in key.lower() and value:
-                # Mask API key for security
-                masked_value = value[:8] + "*" * (len(value) - 8) if len(value) > 8 else "*" * len(value)
+                # Mask API keys for security
+                if isinstance(value, list):
+                    masked_value = ", ".join(mask_api_key(api_key) for api_key in value)
+                else:
+                    masked_value = mask_api_key(value)
                 print(f"   {key}: {masked_value}")
             else:
                 print(f"   {key}: {value}")
@@ -165,12 +183,74 @@ REFINIRE_TOOL_TAVILY_INCLUDE_RAW_CONTENT=false
         print("🔑 Tavily API Configuration:")
         print("  TAVILY_API_KEY: Tavily API key for web search (REQUIRED)")
         print("                  Get your API key from: https://tavily.com/")
+        print("  TAVILY_API_KEYS: Comma-separated API keys searches are balanced across (replaces TAVILY_API_KEY)")
+        print("  REFINIRE_TOOL_TAVILY_KEY_CREDITS: Credits per key and quota period (default: 0, unlimited)")
+        print("  REFINIRE_TOOL_TAVILY_KEY_COOLDOWN: Base seconds a rate-limited key is skipped (default: 60)")
         print()
         print("🔍 Search Defaults:")
         print("  REFINIRE_TOOL_TAVILY_MAX_RESULTS: Default maximum search results (default: 5)")
         print("  REFINIRE_TOOL_TAVILY_INCLUDE_ANSWER: Include AI answer by default (default: false)")
         print("  REFINIRE_TOOL_TAVILY_INCLUDE_RAW_CONTENT: Include raw content by default (default: false)")
         print()
+        print("🧩 Domains:")
+        print("  REFINIRE_TOOL_TAVILY_DOMAIN_POLICY_FILE: JSON file overriding the tool domain lists (re-read when changed)")
+        print("  REFINIRE_TOOL_TAVILY_DOMAIN_SHARD_SIZE: Domains per concurrently searched shard (default: 0, disabled)")
+        print()
+        print("⏱️ Latency Planning:")
+        print("  REFINIRE_TOOL_TAVILY_PLANNER_STATE: File keeping observed latencies across restarts")
+        print()
+        print("📚 Local Index:")
+        print("  REFINIRE_TOOL_TAVILY_LOCAL_INDEX_PATH: Directory indexing every retrieved result (default: disabled)")
+        print("  REFINIRE_TOOL_TAVILY_LOCAL_MAX_AGE: Maximum age of results for local-first answers (default: 86400)")
+        print()
+        print("🧹 Raw Content:")
+        print("  REFINIRE_TOOL_TAVILY_NORMALIZE_RAW_CONTENT: Strip boilerplate and markup from raw content (default: false)")
+        print("  REFINIRE_TOOL_TAVILY_NORMALIZE_WORKERS: Processes normalizing large responses (default: 2)")
+        print()
+        print("👀 Watches:")
+        print("  REFINIRE_TOOL_TAVILY_WATCH_PATH: Directory of saved-query watches and their seen-URL filters")
+        print("  REFINIRE_TOOL_TAVILY_WATCH_ERROR_RATE: False-positive rate of new seen-URL filters (default: 0.001)")
+        print()
+        print("📒 Response Journal:")
+        print("  REFINIRE_TOOL_TAVILY_JOURNAL_PATH: Directory journaling every search_web response (default: disabled)")
+        print("  REFINIRE_TOOL_TAVILY_JOURNAL_SEGMENT_MB: Segment size before rotation (default: 64)")
+        print("  REFINIRE_TOOL_TAVILY_JOURNAL_COMPRESS: Compress journal records (default: false)")
+        print()
+        print("🚦 Concurrency:")
+        print("  REFINIRE_TOOL_TAVILY_MAX_CONCURRENCY: Highest adaptive limit on concurrent calls (default: 0, disabled)")
+        print("  REFINIRE_TOOL_TAVILY_CONCURRENCY_MAX_WAIT: Seconds to wait for a call slot (default: 30)")
+        print()
+        print("🗂️ Scheduling:")
+        print("  REFINIRE_TOOL_TAVILY_SCHEDULER_SLOTS: Concurrent searches of the priority scheduler (default: 0, disabled)")
+        print()
+        print("🗄️ Caching:")
+        print("  REFINIRE_TOOL_TAVILY_CACHE_TTL: Shared response cache TTL in seconds (default: 0, disabled)")
+        print("  REFINIRE_TOOL_TAVILY_CACHE_MAX_ENTRIES: Maximum cached responses (default: 1024)")
+        print("  REFINIRE_TOOL_TAVILY_CACHE_STALE_TTL: Seconds expired responses stay servable while the circuit is open (default: 0)")
+        print("  REFINIRE_TOOL_TAVILY_CACHE_SNAPSHOT_PATH: Hot-entry snapshot saved at exit and loaded at start-up")
+        print("  REFINIRE_TOOL_TAVILY_CACHE_SNAPSHOT_ENTRIES: Entries kept in the snapshot (default: 256)")
+        print("  REFINIRE_TOOL_TAVILY_CACHE_SNAPSHOT_INTERVAL: Seconds between snapshots (default: 0, at exit only)")
+        print()
+        print("🔮 Prefetching:")
+        print("  REFINIRE_TOOL_TAVILY_PREFETCH_FOLLOW_UPS: Follow-up questions prefetched per search (default: 0, disabled)")
+        print("  REFINIRE_TOOL_TAVILY_PREFETCH_CREDITS_PER_HOUR: Credit budget of prefetches (default: 60)")
+        print()
+        print("🔌 Circuit Breaker:")
+        print("  REFINIRE_TOOL_TAVILY_BREAKER_ENABLED: Fail fast while Tavily is failing or slow (default: false)")
+        print("  REFINIRE_TOOL_TAVILY_BREAKER_FAILURE_RATE: Failure share that opens the breaker (default: 0.5)")
+        print("  REFINIRE_TOOL_TAVILY_BREAKER_SLOW_CALL_SECONDS: Latency counted as a slow call (default: 10)")
+        print("  REFINIRE_TOOL_TAVILY_BREAKER_OPEN_SECONDS: Seconds open before probing again (default: 30)")
+        print()
+        print("📈 Profiling:")
+        print("  REFINIRE_TOOL_TAVILY_PROFILE_SAMPLE_RATE: Profile one in N search calls (default: 0, disabled)")
+        print("  REFINIRE_TOOL_TAVILY_PROFILE_OUTPUT: Rotating report file (default: in-memory reports)")
+        print("  REFINIRE_TOOL_TAVILY_PROFILE_TOP: Entries listed per report (default: 20)")
+        print()
+        print("🧪 Load Testing:")
+        print("  REFINIRE_TOOL_TAVILY_RECORD_PATH: Record request/response pairs to a journal file")
+        print("  REFINIRE_TOOL_TAVILY_REPLAY_PATH: Replay responses from a recorded journal (no API calls)")
+        print("  REFINIRE_TOOL_TAVILY_REPLAY_LATENCY_SCALE: Reproduce recorded latencies scaled by this factor")
+        print()
         print("💡 To generate a complete template:")
         print("   oneenv template")
 
@@ -0,0 +1,148 @@
+"""Formatting of search responses as language model context."""
+
+import re
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from .models import SearchResponse, SearchResult
+
+
+# Share of the budget the answer may take before results are allotted
+ANSWER_BUDGET_SHARE = 0.3
+# Results whose allotment cannot fit this much content are dropped
+MIN_CONTENT_TOKENS = 16
+CHARS_PER_TOKEN = 4
+
+_SENTENCE_END = re.compile(r"[.!?。！？](?=\s|$)|\n")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text.
+
+    Uses the common four-characters-per-token heuristic, which is close enough
+    for budgeting and costs a single ``len`` call.
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_sentence(text: str, max_tokens: int) -> str:
+    """Truncate text to a token budget, preferring a sentence boundary.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Maximum number of tokens to keep
+
+    Returns:
+        The text itself if it fits, otherwise a prefix ending at the last
+        sentence boundary (or word boundary, marked with an ellipsis)
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    if max_chars <= 0:
+        return ""
+
+    head = text[:max_chars]
+    sentence_end = None
+    for match in _SENTENCE_END.finditer(head):
+        sentence_end = match.end()
+    if sentence_end is not None and sentence_end >= max_chars // 3:
+        return head[:sentence_end].rstrip()
+
+    word_end = head.rfind(" ")
+    if word_end > 0:
+        head = head[:word_end]
+    return head[:max_chars - 1].rstrip() + "…"
+
+
+def _result_weights(scores: Sequence[Optional[float]]) -> List[float]:
+    # Unscored results are weighted by rank instead
+    return [
+        score if score is not None and score > 0 else 1.0 / rank
+        for rank, score in enumerate(scores, 1)
+    ]
+
+
+def iter_context_chunks(
+    answer: Optional[str],
+    results: Iterable[SearchResult],
+    max_tokens: Optional[int] = None,
+    scores: Optional[Sequence[Optional[float]]] = None
+) -> Iterator[str]:
+    """Yield search context one block at a time.
+
+    The answer, the results header and each result are separate chunks, and
+    concatenating every chunk gives exactly the text of
+    ``format_search_context``. Results are consumed lazily, so the top result
+    can be streamed before later ones have been parsed.
+
+    Without a budget every result is included in full. With a budget, the
+    answer may use up to ``ANSWER_BUDGET_SHARE`` of it and the rest is allotted
+    to results in proportion to their score. Results are visited once, in
+    order; budget a result does not use flows on to the following ones, and a
+    result whose allotment cannot hold its title, URL and a minimal snippet is
+    dropped, which removes low-score results first.
+
+    Args:
+        answer: AI-generated answer (optional)
+        results: Search results, in ranking order
+        max_tokens: Approximate token budget for the whole context (optional)
+        scores: Scores of ``results`` known in advance. Needed to allot a
+            budget without materializing ``results``; taken from the results
+            themselves when omitted.
+
+    Yields:
+        Formatted context chunks
+    """
+    remaining = max_tokens
+    separator = ""
+
+    if answer:
+        if remaining is not None:
+            answer = truncate_to_sentence(answer, int(remaining * ANSWER_BUDGET_SHARE))
+            remaining -= estimate_tokens(answer) + 3
+        if answer:
+            yield f"Answer: {answer}\n"
+            separator = "\n"
+
+    header = "Search Results:"
+    if remaining is not None:
+        if scores is None:
+            results = list(results)
+            scores = [result.score for result in results]
+        weights = _result_weights(scores)
+        remaining_weight = sum(weights)
+        remaining -= estimate_tokens(header) + 1
+
+    number = 0
+    for index, result in enumerate(results):
+        content = result.content
+        if remaining is not None:
+            weight = weights[index]
+            allotment = remaining * weight / remaining_weight if remaining_weight > 0 else 0
+            remaining_weight -= weight
+            overhead = estimate_tokens(result.title) + estimate_tokens(result.url) + 12
+            if allotment - overhead < MIN_CONTENT_TOKENS:
+                continue
+            content = truncate_to_sentence(content, int(allotment - overhead))
+            remaining -= overhead + estimate_tokens(content)
+
+        if number == 0:
+            yield f"{separator}{header}"
+            separator = "\n"
+        number += 1
+        yield f"{separator}{number}. {result.title}\n   URL: {result.url}\n   Content: {content}\n"
+
+
+def format_search_context(response: SearchResponse, max_tokens: Optional[int] = None) -> str:
+    """Format a search response as context text for a language model.
+
+    See ``iter_context_chunks`` for how a token budget is applied.
+
+    Args:
+        response: Search response to format
+        max_tokens: Approximate token budget for the whole context (optional)
+
+    Returns:
+        Formatted search context string
+    """
+    return "".join(iter_context_chunks(response.answer, response.results, max_tokens))
@@ -0,0 +1,162 @@
+"""URL canonicalization and near-duplicate suppression for search results."""
+
+import hashlib
+import re
+from typing import Dict, List, Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .models import SearchResult
+
+
+SIMHASH_BITS = 64
+# Signatures within this Hamming distance are treated as near-duplicates
+DEFAULT_MAX_DISTANCE = 3
+# The signature is split into max_distance + 1 bands; near-duplicates must
+# share at least one band exactly (pigeonhole), so candidates come from buckets
+_BANDS = DEFAULT_MAX_DISTANCE + 1
+_BAND_BITS = SIMHASH_BITS // _BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "ref_url", "source", "spm", "si", "_ga", "_hsenc", "_hsmi",
+})
+_TRACKING_PREFIXES = ("utm_", "pk_", "mtm_")
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def canonicalize_url(url: str) -> str:
+    """Return a canonical form of a URL for duplicate detection.
+
+    http and https are treated alike, the host is lowercased and stripped of
+    ``www.`` and default ports, tracking parameters and fragments are removed,
+    remaining query parameters are sorted and trailing slashes are dropped.
+
+    Args:
+        url: URL to canonicalize
+
+    Returns:
+        Canonical URL string (not necessarily fetchable)
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip().lower()
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(_TRACKING_PREFIXES)
+    ]
+    query.sort()
+
+    path = parts.path.rstrip("/")
+    if scheme in _DEFAULT_PORTS:
+        scheme = "https"
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """Compute a 64-bit SimHash signature of a text over word shingles.
+
+    Args:
+        text: Text to fingerprint
+        shingle_size: Number of consecutive words per shingle
+
+    Returns:
+        Signature as an unsigned 64-bit integer
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < shingle_size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+
+    counts = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        for bit in range(SIMHASH_BITS):
+            counts[bit] += 1 if value >> bit & 1 else -1
+
+    signature = 0
+    for bit, count in enumerate(counts):
+        if count > 0:
+            signature |= 1 << bit
+    return signature
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Return the number of differing bits between two signatures."""
+    return bin(a ^ b).count("1")
+
+
+def _better(candidate: SearchResult, kept: SearchResult) -> bool:
+    return (candidate.score or 0.0) > (kept.score or 0.0)
+
+
+def deduplicate_results(
+    results: Sequence[SearchResult],
+    max_distance: int = DEFAULT_MAX_DISTANCE
+) -> List[SearchResult]:
+    """Collapse duplicate URLs and near-duplicate snippets.
+
+    Results are visited once. Exact duplicates are found through a dictionary
+    of canonical URLs, and near-duplicates through buckets keyed by SimHash
+    bands, so only results sharing a band are compared. When duplicates are
+    found the best-scored copy is kept, at the position of the first one.
+
+    Args:
+        results: Search results in ranking order
+        max_distance: Maximum SimHash Hamming distance treated as a duplicate
+            (at most ``DEFAULT_MAX_DISTANCE``)
+
+    Returns:
+        Deduplicated results
+    """
+    max_distance = min(max_distance, DEFAULT_MAX_DISTANCE)
+    kept: List[SearchResult] = []
+    signatures: List[List[int]] = []
+    by_url: Dict[str, int] = {}
+    buckets: Dict[tuple, List[int]] = {}
+
+    for result in results:
+        url_key = canonicalize_url(result.url)
+        signature = simhash(result.content) if result.content.strip() else None
+
+        match = by_url.get(url_key)
+        if match is None and signature is not None:
+            for band in range(_BANDS):
+                for index in buckets.get((band, signature >> (band * _BAND_BITS) & _BAND_MASK), ()):
+                    if any(hamming_distance(signature, other) <= max_distance for other in signatures[index]):
+                        match = index
+                        break
+                if match is not None:
+                    break
+
+        if match is None:
+            match = len(kept)
+            kept.append(result)
+            signatures.append([])
+        elif _better(result, kept[match]):
+            kept[match] = result
+
+        by_url[url_key] = match
+        if signature is not None:
+            signatures[match].append(signature)
+            for band in range(_BANDS):
+                buckets.setdefault((band, signature >> (band * _BAND_BITS) & _BAND_MASK), []).append(match)
+
+    return kept
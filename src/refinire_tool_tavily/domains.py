@@ -0,0 +1,250 @@
+"""Compiled domain allow/block policies.
+
+The domain lists used by the specialised search tools are compiled once at
+import into ``DomainPolicy`` objects. Ops can override them without a deploy by
+pointing REFINIRE_TOOL_TAVILY_DOMAIN_POLICY_FILE at a JSON file of the form::
+
+    {"programming": {"include": ["docs.python.org", ...], "exclude": ["w3schools.com"]}}
+
+The file is re-read when its modification time changes.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from .models import SearchResult
+
+
+logger = logging.getLogger(__name__)
+
+_LABEL = re.compile(r"^(?!-)[a-z0-9_-]{1,63}(?<!-)$")
+
+NEWS_DOMAINS = (
+    "reuters.com", "bbc.com", "cnn.com", "apnews.com",
+    "nytimes.com", "wsj.com", "bloomberg.com", "techcrunch.com",
+)
+
+RESEARCH_DOMAINS = (
+    # Academic & Research
+    "arxiv.org", "ar5iv.labs.arxiv.org", "scholar.google.com", "ieee.org", "acm.org",
+    "nature.com", "science.org", "researchgate.net", "semanticscholar.org",
+    "pubmed.ncbi.nlm.nih.gov", "doi.org",
+
+    # Technical Documentation & API References
+    "docs.python.org", "github.com", "stackoverflow.com", "developer.mozilla.org",
+    "docs.microsoft.com", "cloud.google.com", "aws.amazon.com",
+)
+
+PROGRAMMING_DOMAINS = (
+    # API Documentation & Tools
+    "postman.com", "swagger.io", "openapi.org", "restfulapi.net",
+    "apidog.com", "insomnia.rest", "rapidapi.com", "apidocs.io",
+
+    # Major Platform APIs
+    "developers.google.com", "developer.apple.com", "developer.twitter.com",
+    "docs.github.com", "developer.spotify.com", "developers.facebook.com",
+    "developer.mozilla.org", "docs.microsoft.com", "cloud.google.com", "aws.amazon.com",
+
+    # Technical Documentation
+    "docs.python.org", "nodejs.org", "reactjs.org", "vuejs.org", "angular.io",
+    "django-rest-framework.org", "flask.palletsprojects.com", "fastapi.tiangolo.com",
+    "kubernetes.io", "docker.com", "redis.io", "mongodb.com", "postgresql.org",
+
+    # Development Communities & Resources
+    "github.com", "stackoverflow.com", "dev.to", "hashnode.com",
+    "freecodecamp.org", "codecademy.com", "tutorialspoint.com", "w3schools.com",
+
+    # US Tech Sites & Blogs
+    "techcrunch.com", "venturebeat.com", "arstechnica.com", "wired.com",
+    "medium.com", "hackernoon.com", "smashingmagazine.com", "css-tricks.com",
+
+    # Japanese Tech Sites
+    "qiita.com", "zenn.dev", "speakerdeck.com", "slideshare.net",
+    "tech.recruit-mp.co.jp", "engineering.mercari.com", "techblog.yahoo.co.jp",
+
+    # Open Source & Package Repositories
+    "pypi.org", "npmjs.com", "packagist.org", "rubygems.org", "crates.io",
+)
+
+
+def normalize_domain(value: str) -> str:
+    """Normalize a domain given as a host name or URL.
+
+    Schemes, paths, ports, a trailing dot and a leading ``www.`` or ``*.`` are
+    removed, the result is lowercased and internationalized names are
+    converted to their ASCII (punycode) form.
+
+    Args:
+        value: Domain or URL
+
+    Returns:
+        Normalized domain
+
+    Raises:
+        ValueError: If the value is not a valid domain
+    """
+    host = value.strip().lower()
+    if "//" in host:
+        host = urlsplit(host).hostname or ""
+    host = host.split("/", 1)[0].split(":", 1)[0].rstrip(".")
+    for prefix in ("*.", "www."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    try:
+        host = host.encode("idna").decode("ascii")
+    except UnicodeError:
+        raise ValueError(f"Invalid domain: {value!r}")
+    if not host or len(host) > 253 or not all(_LABEL.match(label) for label in host.split(".")):
+        raise ValueError(f"Invalid domain: {value!r}")
+    return host
+
+
+def normalize_domains(values: Iterable[str]) -> List[str]:
+    """Normalize a list of domains, dropping duplicates while keeping order."""
+    return list(dict.fromkeys(normalize_domain(value) for value in values))
+
+
+def _matches(host: str, domains: frozenset) -> bool:
+    # One set lookup per label: the host itself, then each parent domain
+    while True:
+        if host in domains:
+            return True
+        dot = host.find(".")
+        if dot == -1:
+            return False
+        host = host[dot + 1:]
+
+
+class DomainPolicy:
+    """Compiled allow/block lists of domains.
+
+    A domain covers itself and all of its subdomains. A host is allowed when it
+    is not covered by a blocked domain and, if any allowed domains are set, is
+    covered by one of them. Matching walks the labels of the host and costs one
+    set lookup per label.
+    """
+
+    def __init__(self, include: Iterable[str] = (), exclude: Iterable[str] = ()):
+        """Initialize domain policy.
+
+        Args:
+            include: Allowed domains (empty allows every domain not excluded)
+            exclude: Blocked domains
+
+        Raises:
+            ValueError: If a domain is invalid
+        """
+        self.include_domains: Tuple[str, ...] = tuple(normalize_domains(include))
+        self.exclude_domains: Tuple[str, ...] = tuple(normalize_domains(exclude))
+        self._include = frozenset(self.include_domains)
+        self._exclude = frozenset(self.exclude_domains)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DomainPolicy":
+        """Create a policy from a ``{"include": [...], "exclude": [...]}`` mapping."""
+        return cls(data.get("include") or (), data.get("exclude") or ())
+
+    def allows_host(self, host: str) -> bool:
+        """Check whether a host name is allowed by the policy."""
+        host = host.lower().rstrip(".")
+        if host.startswith("www."):
+            host = host[4:]
+        if self._exclude and _matches(host, self._exclude):
+            return False
+        return not self._include or _matches(host, self._include)
+
+    def allows_url(self, url: str) -> bool:
+        """Check whether the host of a URL is allowed by the policy."""
+        try:
+            host = urlsplit(url).hostname
+        except ValueError:
+            return False
+        return host is not None and self.allows_host(host)
+
+    def filter_results(self, results: Sequence["SearchResult"]) -> List["SearchResult"]:
+        """Drop results whose URL is not allowed by the policy."""
+        return [result for result in results if self.allows_url(result.url)]
+
+
+@lru_cache(maxsize=256)
+def compile_policy(include: Tuple[str, ...] = (), exclude: Tuple[str, ...] = ()) -> DomainPolicy:
+    """Return a compiled policy for domain lists, reusing earlier compilations."""
+    return DomainPolicy(include, exclude)
+
+
+BUILTIN_POLICIES: Dict[str, DomainPolicy] = {
+    "news": DomainPolicy(NEWS_DOMAINS),
+    "research": DomainPolicy(RESEARCH_DOMAINS),
+    "programming": DomainPolicy(PROGRAMMING_DOMAINS),
+}
+
+_file_policies: Dict[str, DomainPolicy] = {}
+_file_signature: Optional[Tuple[str, int]] = None
+_file_lock = threading.Lock()
+
+
+def load_policy_file(path: str) -> Dict[str, DomainPolicy]:
+    """Load named domain policies from a JSON file.
+
+    Args:
+        path: Path of a JSON object mapping policy names to
+            ``{"include": [...], "exclude": [...]}``
+
+    Returns:
+        Dictionary of policy name to compiled policy
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid JSON or holds an invalid domain
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("Domain policy file must contain a JSON object")
+    policies = {}
+    for name, entry in data.items():
+        if not isinstance(entry, dict):
+            raise ValueError(f"Domain policy {name!r} must be a JSON object")
+        policies[name] = DomainPolicy.from_dict(entry)
+    return policies
+
+
+def get_domain_policy(name: str) -> DomainPolicy:
+    """Return a named domain policy.
+
+    Policies from REFINIRE_TOOL_TAVILY_DOMAIN_POLICY_FILE take precedence over
+    the built-in ones. A file that cannot be loaded is logged and the previous
+    or built-in policies are kept, so a bad edit never breaks searches.
+
+    Args:
+        name: Policy name, such as ``news``, ``research`` or ``programming``
+
+    Returns:
+        Compiled domain policy
+
+    Raises:
+        KeyError: If no policy has this name
+    """
+    global _file_policies, _file_signature
+    path = os.getenv("REFINIRE_TOOL_TAVILY_DOMAIN_POLICY_FILE")
+    if path:
+        with _file_lock:
+            try:
+                signature = (path, os.stat(path).st_mtime_ns)
+                if signature != _file_signature:
+                    # Recorded before loading so a bad file is reported once per change
+                    _file_signature = signature
+                    _file_policies = load_policy_file(path)
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to load domain policy file {path}: {str(e)}")
+            policy = _file_policies.get(name)
+        if policy is not None:
+            return policy
+    return BUILTIN_POLICIES[name]
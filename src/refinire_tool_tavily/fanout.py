@@ -0,0 +1,141 @@
+"""Multi-query fan-out with reciprocal rank fusion."""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from .dedup import canonicalize_url
+from .models import SearchRequest, SearchResponse, SearchResult
+
+
+logger = logging.getLogger(__name__)
+
+# Rank offset of reciprocal rank fusion; 60 is the value from the original paper
+RRF_K = 60
+# A result returned by at least this many variants counts as high-confidence
+CONFIDENT_VOTES = 2
+
+
+class RankFusion:
+    """Incremental reciprocal rank fusion of ranked result lists.
+
+    Lists can be added as they arrive; duplicates across lists are matched by
+    canonical URL and the best-scored copy is kept.
+    """
+
+    def __init__(self, k: int = RRF_K):
+        self.k = k
+        self._fused: Dict[str, float] = {}
+        self._votes: Dict[str, int] = {}
+        self._best: Dict[str, SearchResult] = {}
+
+    def add(self, results: List[SearchResult]) -> None:
+        """Fuse one ranked list of results."""
+        for rank, result in enumerate(results, 1):
+            key = canonicalize_url(result.url)
+            self._fused[key] = self._fused.get(key, 0.0) + 1.0 / (self.k + rank)
+            self._votes[key] = self._votes.get(key, 0) + 1
+            best = self._best.get(key)
+            if best is None or (result.score or 0.0) > (best.score or 0.0):
+                self._best[key] = result
+
+    def confident_count(self, min_votes: int = CONFIDENT_VOTES) -> int:
+        """Number of results returned by at least ``min_votes`` lists."""
+        return sum(1 for votes in self._votes.values() if votes >= min_votes)
+
+    def results(self, limit: Optional[int] = None) -> List[SearchResult]:
+        """Return fused results ordered by descending fused score."""
+        order = sorted(self._fused, key=lambda key: -self._fused[key])
+        return [self._best[key] for key in order[:limit]]
+
+
+def fan_out(
+    request: SearchRequest,
+    variants: List[str],
+    search: Callable[[SearchRequest], SearchResponse],
+    min_votes: int = CONFIDENT_VOTES
+) -> SearchResponse:
+    """Search several query variants in parallel and fuse their rankings.
+
+    Responses are fused as they arrive. Once ``request.max_results`` results
+    have been returned by at least ``min_votes`` variants, the merge returns
+    without waiting for slower variants.
+
+    Args:
+        request: Base search request; its options apply to every variant
+        variants: Query variants to search
+        search: Function performing a single search
+        min_votes: Votes needed for a result to count as high-confidence
+
+    Returns:
+        Fused SearchResponse for ``request.query``. ``metadata["fanout"]``
+        holds per-variant latency, result count and status.
+
+    Raises:
+        Exception: The last variant error if every variant failed
+    """
+    fusion = RankFusion()
+    breakdown: List[Dict[str, Any]] = [{"query": variant, "status": "pending"} for variant in variants]
+    answer = None
+    follow_up_questions = None
+    last_error: Optional[Exception] = None
+    start_time = time.time()
+
+    def run(index: int) -> SearchResponse:
+        variant_start = time.perf_counter()
+        try:
+            variant_request = SearchRequest(**{
+                **request.model_dump(),
+                "query": variants[index],
+                "query_variants": None
+            })
+            return search(variant_request)
+        finally:
+            breakdown[index]["latency"] = time.perf_counter() - variant_start
+
+    executor = ThreadPoolExecutor(max_workers=len(variants), thread_name_prefix="tavily-fanout")
+    futures: Dict[Future, int] = {executor.submit(run, index): index for index in range(len(variants))}
+    pending = set(futures)
+    early_return = False
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures[future]
+                try:
+                    response = future.result()
+                except Exception as e:
+                    logger.warning(f"Fan-out variant failed: {variants[index]}: {str(e)}")
+                    breakdown[index]["status"] = "error"
+                    breakdown[index]["error"] = str(e)
+                    last_error = e
+                    continue
+                breakdown[index]["status"] = "ok"
+                breakdown[index]["results"] = len(response.results)
+                fusion.add(response.results)
+                answer = answer or response.answer
+                follow_up_questions = follow_up_questions or response.follow_up_questions
+
+            if pending and fusion.confident_count(min_votes) >= request.max_results:
+                early_return = True
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if all(entry["status"] == "error" for entry in breakdown) and last_error is not None:
+        raise last_error
+
+    results = fusion.results(request.max_results)
+    return SearchResponse(
+        query=request.query,
+        results=results,
+        answer=answer,
+        follow_up_questions=follow_up_questions,
+        total_results=len(results),
+        search_time=time.time() - start_time,
+        metadata={"fanout": {
+            "variants": [dict(entry) for entry in breakdown],
+            "early_return": early_return
+        }}
+    )
@@ -0,0 +1,216 @@
+"""Pool of Tavily API keys balancing searches across their quotas."""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from tavily import TavilyClient
+from tavily.errors import ForbiddenError, UsageLimitExceededError
+
+from .config import mask_api_key
+from .metrics import ServiceMetrics, get_metrics
+from .progressive import SEARCH_DEPTH_CREDITS
+
+
+logger = logging.getLogger(__name__)
+
+# Longest rate-limit cooldown, as a multiple of the base cooldown
+MAX_COOLDOWN_FACTOR = 16
+# Seconds a key whose quota ran out stays out of rotation
+EXHAUSTED_SECONDS = 3600.0
+
+
+class _PooledKey:
+    """State of one API key with its own warm client."""
+
+    def __init__(self, key: str, index: int, client: Any, credits: Optional[int]):
+        # Keys of one tier share their unmasked prefix, so the position tells them apart
+        self.label = f"{mask_api_key(key)}#{index}"
+        self.client = client
+        self.credits = credits
+        self.remaining = credits
+        self.in_flight = 0
+        self.calls = 0
+        self.strikes = 0
+        self.available_at = 0.0
+
+    def weight(self) -> float:
+        """Share of the quota left, 1.0 for keys without a known quota."""
+        if not self.credits:
+            return 1.0
+        return max(self.remaining, 0) / self.credits
+
+
+class ApiKeyPool:
+    """Client stand-in spreading searches over several API keys.
+
+    Each search goes to the available key with the lowest in-flight load
+    relative to the share of its quota left, so keys close to their quota get
+    fewer calls. A key answering with a usage limit error (HTTP 429) is taken
+    out of rotation for an exponentially growing cooldown; a key whose quota
+    ran out, by its own count or by Tavily's plan limit errors, for
+    ``exhausted_seconds``, after which its quota counts as renewed. The search
+    is retried on the next available key.
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[str],
+        credits: Optional[int] = None,
+        cooldown_seconds: float = 60.0,
+        exhausted_seconds: float = EXHAUSTED_SECONDS,
+        client_factory: Callable[[str], Any] = TavilyClient,
+        metrics: Optional[ServiceMetrics] = None
+    ):
+        """Initialize API key pool.
+
+        Args:
+            keys: Tavily API keys
+            credits: Credits each key may spend per quota period (optional,
+                unlimited by default)
+            cooldown_seconds: Base cooldown of a rate-limited key
+            exhausted_seconds: Seconds a key with no quota left is skipped
+            client_factory: Creates the client of a key (``TavilyClient``)
+            metrics: Metrics receiving per-key counts under masked key labels
+                followed by the key's position in the pool
+                (defaults to the process-wide metrics)
+        """
+        if not keys:
+            raise ValueError("At least one API key is required")
+        self.cooldown_seconds = cooldown_seconds
+        self.exhausted_seconds = exhausted_seconds
+        self.metrics = metrics if metrics is not None else get_metrics()
+        self._keys = [_PooledKey(key, index, client_factory(key), credits) for index, key in enumerate(keys)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _select(self, tried: List[_PooledKey]) -> Optional[_PooledKey]:
+        now = time.monotonic()
+        with self._lock:
+            candidates = [
+                pooled for pooled in self._keys
+                if pooled not in tried and pooled.available_at <= now
+            ]
+            for pooled in candidates:
+                if pooled.credits and pooled.remaining <= 0:
+                    # A skipped exhausted key is back with a renewed quota
+                    pooled.remaining = pooled.credits
+            candidates = [pooled for pooled in candidates if pooled.weight() > 0]
+            if not candidates:
+                return None
+            chosen = min(candidates, key=lambda pooled: ((pooled.in_flight + 1) / pooled.weight(), pooled.calls))
+            chosen.in_flight += 1
+            chosen.calls += 1
+            return chosen
+
+    def _take_out(self, pooled: _PooledKey, seconds: float, reason: str) -> None:
+        pooled.available_at = time.monotonic() + seconds
+        self.metrics.increment(f"keys.{pooled.label}.{reason}")
+        logger.warning(f"Tavily API key {pooled.label} {reason}, out of rotation for {seconds:.0f}s")
+
+    def search(self, **params: Any) -> Dict[str, Any]:
+        """Perform a search with the least loaded available key.
+
+        Raises:
+            UsageLimitExceededError: If every key is rate limited or exhausted
+        """
+        tried: List[_PooledKey] = []
+        error: Optional[Exception] = None
+        while True:
+            pooled = self._select(tried)
+            if pooled is None:
+                raise error or UsageLimitExceededError("All Tavily API keys are rate limited or exhausted")
+            tried.append(pooled)
+            self.metrics.increment(f"keys.{pooled.label}.calls")
+            try:
+                response = pooled.client.search(**params)
+            except UsageLimitExceededError as e:
+                with self._lock:
+                    pooled.in_flight -= 1
+                    pooled.strikes += 1
+                    factor = min(2 ** (pooled.strikes - 1), MAX_COOLDOWN_FACTOR)
+                    self._take_out(pooled, self.cooldown_seconds * factor, "rate_limited")
+                error = e
+                continue
+            except ForbiddenError as e:
+                # Tavily reports exceeded plan and key limits as 432/433
+                with self._lock:
+                    pooled.in_flight -= 1
+                    pooled.remaining = 0
+                    self._take_out(pooled, self.exhausted_seconds, "exhausted")
+                error = e
+                continue
+            except Exception:
+                with self._lock:
+                    pooled.in_flight -= 1
+                raise
+
+            with self._lock:
+                pooled.in_flight -= 1
+                pooled.strikes = 0
+                if pooled.credits:
+                    pooled.remaining -= SEARCH_DEPTH_CREDITS.get(params.get("search_depth", "basic"), 1)
+                    if pooled.remaining <= 0:
+                        self._take_out(pooled, self.exhausted_seconds, "exhausted")
+                    self.metrics.set_gauge(f"keys.{pooled.label}.remaining", pooled.remaining)
+            return response
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return the state of every key under its masked label.
+
+        Returns:
+            One dictionary per key with ``key`` (masked), ``available``,
+            ``in_flight``, ``calls`` and ``remaining`` credits (None if unlimited)
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "key": pooled.label,
+                    "available": pooled.available_at <= now,
+                    "in_flight": pooled.in_flight,
+                    "calls": pooled.calls,
+                    "remaining": pooled.remaining
+                }
+                for pooled in self._keys
+            ]
+
+
+def parse_api_keys(value: Optional[str]) -> List[str]:
+    """Split a comma-separated list of API keys, ignoring blanks and duplicates."""
+    keys: List[str] = []
+    for key in (value or "").split(","):
+        key = key.strip()
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+_default_pool: Optional[ApiKeyPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_key_pool() -> Optional[ApiKeyPool]:
+    """Return the process-wide API key pool, or None when it is not configured.
+
+    The pool holds the keys listed in TAVILY_API_KEYS, with
+    REFINIRE_TOOL_TAVILY_KEY_CREDITS credits each (0 for unlimited) and a base
+    cooldown of REFINIRE_TOOL_TAVILY_KEY_COOLDOWN seconds. It is shared so
+    its clients stay warm across the short-lived services of each search.
+    """
+    global _default_pool
+    keys = parse_api_keys(os.getenv("TAVILY_API_KEYS"))
+    if not keys:
+        return None
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ApiKeyPool(
+                keys,
+                credits=int(os.getenv("REFINIRE_TOOL_TAVILY_KEY_CREDITS", "0") or 0) or None,
+                cooldown_seconds=float(os.getenv("REFINIRE_TOOL_TAVILY_KEY_COOLDOWN", "60") or 60)
+            )
+        return _default_pool
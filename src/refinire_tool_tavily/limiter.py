@@ -0,0 +1,172 @@
+"""Adaptive limit on concurrent Tavily calls."""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .metrics import ServiceMetrics, get_metrics
+
+
+class ConcurrencyLimiter:
+    """AIMD limiter of in-flight Tavily calls.
+
+    The limit grows additively, by about one call per window of completed
+    calls, while latency stays close to the baseline: a moving average of the
+    lowest latency of each ``baseline_window`` successful calls, so one
+    unusually fast call is soon forgotten. It is cut multiplicatively when
+    Tavily answers with a usage limit error (HTTP 429) or latency exceeds
+    ``latency_tolerance`` times the baseline, at most once per call latency
+    so one burst of slow calls counts as one signal. Other failed calls free
+    their slot without adapting the limit. Callers over the limit wait in
+    line for up to ``max_wait`` seconds.
+
+    Every search path (threaded, async via worker threads, fan-out and
+    sharded batches) goes through ``TavilyService._call_client``, so one
+    limiter shared by all services covers them alike.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 4.0,
+        min_limit: float = 1.0,
+        max_limit: float = 32.0,
+        max_wait: float = 30.0,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.5,
+        baseline_window: int = 20,
+        baseline_weight: float = 0.5,
+        metrics: Optional[ServiceMetrics] = None
+    ):
+        """Initialize concurrency limiter.
+
+        Args:
+            initial_limit: Concurrent calls allowed at first
+            min_limit: Lowest limit backoff can reach
+            max_limit: Highest limit growth can reach
+            max_wait: Seconds a caller waits for a slot before giving up
+            latency_tolerance: Latency, as a multiple of the baseline, taken
+                as a sign of overload
+            backoff: Factor the limit is multiplied by on overload
+            baseline_window: Successful calls whose lowest latency is averaged
+                into the baseline
+            baseline_weight: Weight of the latest window's lowest latency in
+                the baseline
+            metrics: Metrics receiving the limit, in-flight calls and queue
+                waits (defaults to the process-wide metrics)
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_wait = max_wait
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.baseline_window = baseline_window
+        self.baseline_weight = baseline_weight
+        self.metrics = metrics if metrics is not None else get_metrics()
+
+        self._limit = min(max(initial_limit, min_limit), max_limit)
+        self._in_flight = 0
+        self._baseline: Optional[float] = None
+        self._window_min: Optional[float] = None
+        self._window_calls = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        self.metrics.set_gauge("concurrency.limit", self._limit)
+
+    @property
+    def limit(self) -> float:
+        """Current limit on concurrent calls."""
+        with self._condition:
+            return self._limit
+
+    def acquire(self) -> bool:
+        """Wait for a call slot.
+
+        Returns:
+            True if a slot was taken, False if none freed up within ``max_wait``
+        """
+        start = time.perf_counter()
+        deadline = time.monotonic() + self.max_wait
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.metrics.increment("concurrency.rejected")
+                    return False
+                self._condition.wait(remaining)
+            self._in_flight += 1
+            self.metrics.set_gauge("concurrency.in_flight", self._in_flight)
+        self.metrics.observe("concurrency.queue_wait", time.perf_counter() - start)
+        return True
+
+    def _observe_success(self, latency: float) -> float:
+        # Returns the baseline the call is judged against; until a window has
+        # completed it is the lowest latency seen so far
+        if self._window_min is None or latency < self._window_min:
+            self._window_min = latency
+        self._window_calls += 1
+        baseline = self._baseline if self._baseline is not None else self._window_min
+        if self._window_calls >= self.baseline_window:
+            if self._baseline is None:
+                self._baseline = self._window_min
+            else:
+                self._baseline += self.baseline_weight * (self._window_min - self._baseline)
+            self._window_min = None
+            self._window_calls = 0
+        return baseline
+
+    def release(self, latency: float, overloaded: bool = False, failed: bool = False) -> None:
+        """Free a slot and adapt the limit to the outcome of the call.
+
+        Args:
+            latency: Duration of the call in seconds
+            overloaded: Tavily rejected the call for exceeding its usage limit
+            failed: The call failed for another reason; its latency says
+                nothing about load, so the limit is left as it is
+        """
+        now = time.monotonic()
+        with self._condition:
+            self._in_flight -= 1
+            if not overloaded and not failed:
+                overloaded = latency > self.latency_tolerance * self._observe_success(latency)
+            if overloaded:
+                if now - self._last_decrease >= latency:
+                    self._last_decrease = now
+                    self._limit = max(self.min_limit, self._limit * self.backoff)
+                    self.metrics.increment("concurrency.decreases")
+            elif not failed:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self.metrics.set_gauge("concurrency.limit", self._limit)
+            self.metrics.set_gauge("concurrency.in_flight", self._in_flight)
+            self._condition.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current ``limit``, ``in_flight`` calls and latency ``baseline``."""
+        with self._condition:
+            baseline = self._baseline if self._baseline is not None else self._window_min
+            return {"limit": self._limit, "in_flight": self._in_flight, "baseline": baseline}
+
+
+_default_limiter: Optional[ConcurrencyLimiter] = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_concurrency_limiter() -> Optional[ConcurrencyLimiter]:
+    """Return the process-wide concurrency limiter, or None when it is disabled.
+
+    The limiter is enabled by setting REFINIRE_TOOL_TAVILY_MAX_CONCURRENCY to
+    the highest limit it may grow to; callers wait up to
+    REFINIRE_TOOL_TAVILY_CONCURRENCY_MAX_WAIT seconds for a slot.
+    """
+    global _default_limiter
+    max_limit = float(os.getenv("REFINIRE_TOOL_TAVILY_MAX_CONCURRENCY", "0") or 0)
+    if max_limit <= 0:
+        return None
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = ConcurrencyLimiter(
+                initial_limit=min(4.0, max_limit),
+                max_limit=max_limit,
+                max_wait=float(os.getenv("REFINIRE_TOOL_TAVILY_CONCURRENCY_MAX_WAIT", "30") or 30)
+            )
+        return _default_limiter
@@ -0,0 +1,413 @@
+"""Local inverted index of previously retrieved search results.
+
+Layout of an index directory:
+
+- ``docs.log``: append-only JSON lines, one retrieved result per line.
+- ``seg-<first>-<end>.post``: postings of the segment holding documents
+  ``first`` to ``end - 1``, ``(doc id, term frequency)`` pairs of
+  little-endian uint32 grouped by term. Memory-mapped for search.
+- ``seg-<first>-<end>.json``: term dictionary (term -> postings offset and
+  count) and per-document metadata (log offset and size, token length,
+  retrieval time, canonical URL) of the segment.
+
+Results are queued by the request path and indexed by a background thread,
+which appends to ``docs.log`` at once and adds them to an in-memory buffer
+that searches also read. The buffer is written as a new immutable segment
+once it holds ``segment_docs`` documents, and when the index is closed.
+Whenever ``MERGE_FACTOR`` adjacent segments of the same size tier have
+accumulated they are merged into one, so the number of segments grows with
+the logarithm of the number of documents. Documents logged but not yet in a
+segment when the process stopped are indexed again on the next open.
+"""
+
+import atexit
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .dedup import canonicalize_url
+from .models import SearchResponse, SearchResult
+from .rerank import BM25_B, BM25_K1, query_terms, tokenize
+
+
+logger = logging.getLogger(__name__)
+
+_POSTING = struct.Struct("<II")  # doc id, term frequency
+_DOCS_FILE = "docs.log"
+
+# Documents buffered before a segment is written
+SEGMENT_DOCS = 512
+# Adjacent segments of a size tier merged into one segment of the next tier
+MERGE_FACTOR = 8
+# Results that may wait for the writer before new ones are dropped
+QUEUE_SIZE = 1024
+
+
+class _Segment:
+    """An immutable on-disk segment with memory-mapped postings."""
+
+    def __init__(self, meta_path: Path):
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        self.base: int = meta["base"]
+        self.docs: List[list] = meta["docs"]
+        self.terms: Dict[str, List[int]] = meta["terms"]
+        self.meta_path = meta_path
+        self.post_path = meta_path.with_suffix(".post")
+        with open(self.post_path, "rb") as f:
+            # The map stays valid after the file is closed
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else None
+
+    @property
+    def end(self) -> int:
+        return self.base + len(self.docs)
+
+    def posting_bytes(self, term: str) -> bytes:
+        entry = self.terms.get(term)
+        if entry is None or self._mmap is None:
+            return b""
+        offset, count = entry
+        return self._mmap[offset:offset + count * _POSTING.size]
+
+    def postings(self, term: str) -> List[Tuple[int, int]]:
+        return list(_POSTING.iter_unpack(self.posting_bytes(term)))
+
+    def remove(self) -> None:
+        # Searches still holding the segment keep reading the map until they drop it
+        self.meta_path.unlink(missing_ok=True)
+        self.post_path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+
+
+class LocalIndex:
+    """Incrementally updated, on-disk inverted index of search results.
+
+    ``add`` only enqueues and never blocks; when the queue is full results are
+    dropped and counted in ``dropped``. Results are searchable as soon as the
+    writer thread has taken them from the queue. ``search`` ranks indexed results with
+    BM25. When the same URL was retrieved several times, only the latest copy
+    is returned.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        segment_docs: int = SEGMENT_DOCS,
+        queue_size: int = QUEUE_SIZE,
+        merge_factor: int = MERGE_FACTOR
+    ):
+        """Open or create a local index.
+
+        Args:
+            path: Index directory
+            segment_docs: Documents buffered before a segment is written
+            queue_size: Maximum results waiting for the writer thread
+            merge_factor: Adjacent segments of a size tier merged into one
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.segment_docs = segment_docs
+        self.merge_factor = max(2, merge_factor)
+        self.dropped = 0
+
+        self._lock = threading.Lock()
+        self._segments: List[_Segment] = []
+        self._doc_meta: List[list] = []
+        self._latest: Dict[str, int] = {}
+        self._total_length = 0
+        self._pending_docs: List[list] = []
+        self._pending_postings: Dict[str, List[Tuple[int, int]]] = {}
+
+        self._load_segments()
+        self._segmented = len(self._doc_meta)
+        self._docs = open(self.path / _DOCS_FILE, "a+b")
+        self._recover_unindexed()
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="tavily-local-index", daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self._doc_meta)
+
+    def _load_segments(self) -> None:
+        # A merge interrupted after its segment became visible leaves the merged
+        # segments behind; the widest segment starting at a document wins
+        segments = sorted((_Segment(meta_path) for meta_path in self.path.glob("seg-*.json")),
+                          key=lambda segment: (segment.base, -len(segment.docs)))
+        for segment in segments:
+            if segment.base != len(self._doc_meta):
+                # Covered by a merged segment, or past a gap whose documents are
+                # indexed again from the log
+                segment.close()
+                segment.remove()
+                continue
+            self._segments.append(segment)
+            for doc_id, meta in enumerate(segment.docs, segment.base):
+                self._register(doc_id, meta)
+
+    def _register(self, doc_id: int, meta: list) -> None:
+        self._doc_meta.append(meta)
+        self._latest[meta[4]] = doc_id
+        self._total_length += meta[2]
+
+    def _recover_unindexed(self) -> None:
+        # Index documents that reached the log but not a segment, and drop a
+        # partially written last line
+        start = self._doc_meta[-1][0] + self._doc_meta[-1][1] if self._doc_meta else 0
+        self._docs.seek(start)
+        tail = self._docs.read()
+        complete = tail.rfind(b"\n") + 1
+        if complete < len(tail):
+            self._docs.truncate(start + complete)
+        offset = start
+        for line in tail[:complete].splitlines(keepends=True):
+            self._index_document(json.loads(line), offset, len(line))
+            offset += len(line)
+
+    def add(self, results: Sequence[Dict[str, Any]], query: str) -> None:
+        """Queue retrieved results for indexing without blocking.
+
+        Args:
+            results: Raw Tavily results (``url``, ``title``, ``content``, ``score``)
+            query: Query the results were retrieved for
+        """
+        if not results or self._closed:
+            return
+        try:
+            self._queue.put_nowait((list(results), query, time.time()))
+        except queue.Full:
+            self.dropped += len(results)
+            logger.debug(f"Local index queue full, dropped {len(results)} results")
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait until every queued result is indexed and searchable."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self) -> None:
+        """Index queued results, stop the writer thread and release files."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        with self._lock:
+            for segment in self._segments:
+                segment.close()
+            self._segments = []
+        self._docs.close()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    if self._pending_docs:
+                        self._write_segment()
+                    return
+                if isinstance(item, threading.Event):
+                    item.set()
+                    continue
+                self._append(*item)
+                if len(self._pending_docs) >= self.segment_docs:
+                    self._write_segment()
+                    self._merge_segments()
+            except Exception as e:
+                logger.error(f"Local index update failed: {str(e)}")
+                if item is None:
+                    return
+
+    def _append(self, results: List[Dict[str, Any]], query: str, retrieved_at: float) -> None:
+        self._docs.seek(0, os.SEEK_END)
+        offset = self._docs.tell()
+        documents = []
+        lines = []
+        for result in results:
+            document = {
+                "url": result.get("url", ""),
+                "title": result.get("title", ""),
+                "content": result.get("content", ""),
+                "score": result.get("score"),
+                "query": query,
+                "time": retrieved_at
+            }
+            line = (json.dumps(document, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+            documents.append((document, offset, len(line)))
+            lines.append(line)
+            offset += len(line)
+        self._docs.write(b"".join(lines))
+        self._docs.flush()
+        with self._lock:
+            for document, offset, size in documents:
+                self._index_document(document, offset, size)
+
+    def _index_document(self, document: Dict[str, Any], offset: int, size: int) -> None:
+        # Called with the lock held, or before the writer thread starts
+        doc_id = len(self._doc_meta)
+        tokens = tokenize(f"{document['title']} {document['content']}")
+        for term, frequency in Counter(tokens).items():
+            self._pending_postings.setdefault(term, []).append((doc_id, frequency))
+        meta = [offset, size, len(tokens), document["time"], canonicalize_url(document["url"])]
+        self._pending_docs.append(meta)
+        self._register(doc_id, meta)
+
+    def _write_segment_files(self, base: int, docs: List[list], postings: Iterable[Tuple[str, bytes]]) -> _Segment:
+        """Write a segment from packed postings grouped by term."""
+        stem = self.path / f"seg-{base:010d}-{base + len(docs):010d}"
+        terms: Dict[str, List[int]] = {}
+        with open(f"{stem}.post", "wb") as f:
+            offset = 0
+            for term, packed in postings:
+                f.write(packed)
+                terms[term] = [offset, len(packed) // _POSTING.size]
+                offset += len(packed)
+        # The metadata file is renamed into place last, making the segment visible atomically
+        tmp_path = f"{stem}.json.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"base": base, "docs": docs, "terms": terms}, f, separators=(",", ":"))
+        os.replace(tmp_path, f"{stem}.json")
+        return _Segment(Path(f"{stem}.json"))
+
+    def _write_segment(self) -> None:
+        """Write the buffered documents as a new segment."""
+        segment = self._write_segment_files(self._segmented, self._pending_docs, (
+            (term, b"".join(_POSTING.pack(doc_id, frequency) for doc_id, frequency in postings))
+            for term, postings in self._pending_postings.items()
+        ))
+        with self._lock:
+            self._segments.append(segment)
+            self._pending_docs = []
+            self._pending_postings = {}
+        self._segmented = segment.end
+
+    def _tier(self, segment: _Segment) -> int:
+        tier = 0
+        size = self.segment_docs
+        while len(segment.docs) > size:
+            size *= self.merge_factor
+            tier += 1
+        return tier
+
+    def _merge_segments(self) -> None:
+        """Merge the newest segments while ``merge_factor`` of them share a size tier."""
+        while len(self._segments) >= self.merge_factor:
+            merging = self._segments[-self.merge_factor:]
+            tier = self._tier(merging[-1])
+            if any(self._tier(segment) != tier for segment in merging):
+                return
+            # Doc ids are global and segments are in doc id order, so merged
+            # postings are the concatenation of each segment's postings
+            terms = dict.fromkeys(term for segment in merging for term in segment.terms)
+            merged = self._write_segment_files(
+                merging[0].base,
+                [meta for segment in merging for meta in segment.docs],
+                ((term, b"".join(segment.posting_bytes(term) for segment in merging)) for term in terms)
+            )
+            with self._lock:
+                self._segments[-self.merge_factor:] = [merged]
+            for segment in merging:
+                segment.remove()
+
+    def _read_document(self, doc_id: int) -> Dict[str, Any]:
+        offset, size = self._doc_meta[doc_id][:2]
+        return json.loads(os.pread(self._docs.fileno(), size, offset))
+
+    def search(self, query: str, max_results: int = 5, max_age: Optional[float] = None) -> SearchResponse:
+        """Search indexed results with BM25.
+
+        Args:
+            query: Search query
+            max_results: Maximum number of results to return
+            max_age: Ignore results retrieved more than this many seconds ago (optional)
+
+        Returns:
+            SearchResponse of local results; ``score`` holds the BM25 score.
+            ``metadata["local"]`` reports the share of query terms found in the
+            returned results (``coverage``), the age in seconds of the oldest
+            returned result (``oldest_age``) and the number of indexed documents.
+        """
+        start_time = time.time()
+        terms = query_terms(query)
+        with self._lock:
+            segments = list(self._segments)
+            pending = {term: list(self._pending_postings.get(term, ())) for term in terms}
+            documents = len(self._doc_meta)
+            total_length = self._total_length
+
+        scores: Dict[int, float] = {}
+        matched: Dict[int, set] = {}
+        if terms and documents:
+            average_length = total_length / documents or 1.0
+            oldest = start_time - max_age if max_age is not None else None
+            for term in terms:
+                postings = [posting for segment in segments for posting in segment.postings(term)] + pending[term]
+                if not postings:
+                    continue
+                idf = math.log1p((documents - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings:
+                    _, _, length, retrieved_at, url_key = self._doc_meta[doc_id]
+                    if self._latest.get(url_key) != doc_id or (oldest is not None and retrieved_at < oldest):
+                        continue
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                    matched.setdefault(doc_id, set()).add(term)
+
+        top = heapq.nlargest(max_results, scores, key=scores.get)
+        results = []
+        for doc_id in top:
+            document = self._read_document(doc_id)
+            results.append(SearchResult(
+                title=document["title"], url=document["url"], content=document["content"], score=scores[doc_id]
+            ))
+        found = set().union(*(matched[doc_id] for doc_id in top)) if top else set()
+        return SearchResponse(
+            query=query,
+            results=results,
+            total_results=len(results),
+            search_time=time.time() - start_time,
+            metadata={"local": {
+                "coverage": len(found) / len(terms) if terms else 0.0,
+                "oldest_age": max((start_time - self._doc_meta[doc_id][3] for doc_id in top), default=None),
+                "documents": documents
+            }}
+        )
+
+
+_default_index: Optional[LocalIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_local_index() -> Optional[LocalIndex]:
+    """Return the process-wide local index, or None when it is not configured.
+
+    The index lives in the directory named by REFINIRE_TOOL_TAVILY_LOCAL_INDEX_PATH
+    and is closed at exit.
+    """
+    global _default_index
+    path = os.getenv("REFINIRE_TOOL_TAVILY_LOCAL_INDEX_PATH")
+    if not path:
+        return None
+    with _default_index_lock:
+        if _default_index is None or _default_index._closed:
+            _default_index = LocalIndex(path)
+            atexit.register(_default_index.close)
+        return _default_index
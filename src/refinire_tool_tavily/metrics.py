@@ -0,0 +1,110 @@
+"""In-process service metrics."""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from .utils import percentile
+
+
+class ServiceMetrics:
+    """Thread-safe counters and value distributions.
+
+    Distributions keep their total count and sum plus a bounded window of
+    recent values, from which percentiles are computed when a snapshot is
+    taken. Recording is a dictionary lookup and an append under a lock, so it
+    is cheap enough to stay enabled on every search.
+    """
+
+    def __init__(self, window: int = 1024):
+        """Initialize service metrics.
+
+        Args:
+            window: Number of recent values kept per distribution for percentiles
+        """
+        self.window = window
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, Any] = {}
+        self._samples: Dict[str, Deque[float]] = {}
+        self._totals: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: float = 1) -> None:
+        """Add an amount to a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def set_gauge(self, name: str, value: Any) -> None:
+        """Set the current value of a gauge, such as a state or a level."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record one value of a distribution."""
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+                self._totals[name] = [0, 0.0]
+            samples.append(value)
+            totals = self._totals[name]
+            totals[0] += 1
+            totals[1] += value
+
+    def distribution(self, name: str) -> Optional[Dict[str, float]]:
+        """Summarize a distribution, or return None if nothing was recorded.
+
+        Returns:
+            Dictionary with count, mean, p50, p95 and max (percentiles and max
+            over the recent window)
+        """
+        with self._lock:
+            samples = self._samples.get(name)
+            if not samples:
+                return None
+            values = sorted(samples)
+            count, total = self._totals[name]
+        return {
+            "count": count,
+            "mean": total / count,
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "max": values[-1]
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return every counter, gauge and distribution summary.
+
+        Returns:
+            Dictionary with ``counters``, ``gauges`` and ``distributions``
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            names = list(self._samples)
+        return {
+            "counters": counters,
+            "gauges": gauges,
+            "distributions": {name: self.distribution(name) for name in names}
+        }
+
+    def reset(self) -> None:
+        """Discard all recorded metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._samples.clear()
+            self._totals.clear()
+
+
+_default_metrics: Optional[ServiceMetrics] = None
+_default_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> ServiceMetrics:
+    """Return the process-wide metrics shared by every ``TavilyService``."""
+    global _default_metrics
+    with _default_metrics_lock:
+        if _default_metrics is None:
+            _default_metrics = ServiceMetrics()
+        return _default_metrics
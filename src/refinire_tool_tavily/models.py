@@ -1,8 +1,10 @@
 """Data models for Tavily search functionality."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel, Field, field_validator
 
+from .domains import normalize_domains
+
 
 class SearchRequest(BaseModel):
     """Search request parameters."""
@@ -13,20 +15,60 @@ class SearchRequest(BaseModel):
     exclude_domains: Optional[List[str]] = Field(default=None, description="List of domains to exclude from search")
     include_answer: bool = Field(default=False, description="Include AI-generated answer in response")
     include_raw_content: bool = Field(default=False, description="Include raw content of web pages")
+    search_depth: Optional[Literal["basic", "advanced"]] = Field(default=None, description="Tavily search depth (default: Tavily's own default, basic)")
+    latency_budget: Optional[float] = Field(default=None, description="Latency budget in seconds; search depth and result count are chosen to fit it when search_depth is not set", gt=0)
+    local_first: bool = Field(default=False, description="Answer from the local index of earlier results when it covers the query, falling back to Tavily")
+    progressive: bool = Field(default=False, description="Search a few results at basic depth first and widen only if they are insufficient")
+    deduplicate: bool = Field(default=False, description="Collapse duplicate URLs and near-duplicate snippets, keeping the best-scored copy")
+    rerank: bool = Field(default=False, description="Re-rank results locally with BM25 over content and raw content")
+    passages: Optional[int] = Field(default=None, description="Replace raw content with this many top passages per result", ge=1, le=10)
+    query_variants: Optional[List[str]] = Field(default=None, description="Query variants searched in parallel and merged with reciprocal rank fusion", min_length=1, max_length=5)
+    domain_shard_size: Optional[int] = Field(default=None, description="Split include_domains into shards of this size searched concurrently (0 disables sharding)", ge=0)
+    overfetch: Optional[int] = Field(default=None, description="Extra results to fetch so post-processing can still fill max_results (default: half of max_results when deduplicating)", ge=0, le=19)
     
     @field_validator('query')
     @classmethod
     def validate_query(cls, v):
         """Validate search query for security."""
-        if not v.strip():
-            raise ValueError("Search query cannot be empty")
-        
-        # Basic security check - prevent potential injection
-        dangerous_chars = ['<', '>', '"', "'", '&', ';']
-        if any(char in v for char in dangerous_chars):
-            raise ValueError("Search query contains potentially dangerous characters")
-        
-        return v.strip()
+        return _validate_query_text(v)
+    
+    @field_validator('include_domains', 'exclude_domains')
+    @classmethod
+    def validate_domains(cls, v):
+        """Normalize domains and reject invalid ones."""
+        if v is None:
+            return v
+        return normalize_domains(v)
+    
+    @field_validator('query_variants')
+    @classmethod
+    def validate_query_variants(cls, v):
+        """Validate every query variant like the main query."""
+        if v is None:
+            return v
+        return [_validate_query_text(variant) for variant in v]
+
+
+def _validate_query_text(v: str) -> str:
+    """Validate a query string for security and return it stripped."""
+    if not v.strip():
+        raise ValueError("Search query cannot be empty")
+    
+    # Basic security check - prevent potential injection
+    dangerous_chars = ['<', '>', '"', "'", '&', ';']
+    if any(char in v for char in dangerous_chars):
+        raise ValueError("Search query contains potentially dangerous characters")
+    
+    return v.strip()
+
+
+class Passage(BaseModel):
+    """Passage of a web page's raw content relevant to the query."""
+    
+    text: str = Field(..., description="Passage text")
+    start: int = Field(..., description="Start offset of the passage in the raw content")
+    end: int = Field(..., description="End offset of the passage in the raw content")
+    score: float = Field(..., description="BM25 relevance score of the passage")
 
 
 class SearchResult(BaseModel):
@@ -37,6 +79,8 @@ class SearchResult(BaseModel):
     content: str = Field(..., description="Content snippet from the web page")
     score: Optional[float] = Field(default=None, description="Relevance score")
     raw_content: Optional[str] = Field(default=None, description="Raw content of the web page")
+    rerank_score: Optional[float] = Field(default=None, description="Local BM25 relevance score when re-ranked")
+    passages: Optional[List[Passage]] = Field(default=None, description="Top passages extracted from the raw content")
 
 
 class SearchResponse(BaseModel):
@@ -47,4 +91,5 @@ class SearchResponse(BaseModel):
     answer: Optional[str] = Field(default=None, description="AI-generated answer")
     follow_up_questions: Optional[List[str]] = Field(default=None, description="Suggested follow-up questions")
     total_results: int = Field(..., description="Total number of results found")
-    search_time: Optional[float] = Field(default=None, description="Search execution time in seconds")
\ No newline at end of file
+    search_time: Optional[float] = Field(default=None, description="Search execution time in seconds")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Processing details such as stage timings")
\ No newline at end of file
@@ -0,0 +1,312 @@
+"""Normalization of raw page content before it is cached and returned.
+
+Raw content is cleaned in one pass per page: markdown code fences are split
+out and kept verbatim, markup left over from HTML and markdown is stripped
+from the text between them, the body is then walked paragraph by paragraph, and
+each paragraph has its whitespace collapsed and its boilerplate lines (such
+as "Skip to content" or cookie banners) dropped. Single words that are also
+real content, such as "Home" or "Contents", are only dropped when they
+repeat on the page or sit next to other boilerplate. Paragraphs already seen on
+the page, such as a navigation menu repeated in the footer, are dropped too.
+All patterns are compiled once at import.
+
+Pages are normalized in the calling thread, or in a process pool when a
+response carries enough raw content for the pool's overhead to pay off.
+"""
+
+import html
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Collection, Dict, Iterator, List, Optional
+
+from .metrics import ServiceMetrics, get_metrics
+
+
+logger = logging.getLogger(__name__)
+
+# Raw content of a response, in characters, above which pages are normalized in the pool
+PARALLEL_MIN_CHARS = 200_000
+# Lines longer than this are never taken for boilerplate
+BOILERPLATE_MAX_CHARS = 60
+
+_HTML_NOISE = re.compile(
+    r"<!--.*?-->|<(script|style|noscript|template|svg|nav|header|footer|aside|form)\b[^>]*>.*?</\1\s*>",
+    re.IGNORECASE | re.DOTALL
+)
+_HTML_BREAK = re.compile(r"</?(?:p|div|br|li|ul|ol|tr|table|section|article|h[1-6]|pre|blockquote)\b[^>]*>", re.IGNORECASE)
+# Known and custom element names only, so that generics such as List<String> survive
+_HTML_TAG = re.compile(
+    r"</?(?:a|abbr|address|area|article|aside|audio|b|base|bdi|bdo|big|blockquote|body|br|button|canvas|caption"
+    r"|center|cite|code|col|colgroup|data|dd|del|details|dfn|dialog|div|dl|dt|em|embed|fieldset|figcaption"
+    r"|figure|font|footer|form|h[1-6]|head|header|hr|html|i|iframe|img|input|ins|kbd|label|legend|li|link|main"
+    r"|map|mark|meta|meter|nav|noscript|object|ol|optgroup|option|output|p|param|picture|pre|progress|q|rp|rt"
+    r"|ruby|s|samp|script|section|select|small|source|span|strike|strong|style|sub|summary|sup|svg|table|tbody"
+    r"|td|template|textarea|tfoot|th|thead|time|title|tr|track|tt|u|ul|var|video|wbr|[a-z][a-z0-9]*-[a-z0-9-]*)"
+    r"(?:\s[^<>]*)?/?>",
+    re.IGNORECASE
+)
+_MD_IMAGE = re.compile(r"!\[[^\]\n]*\]\([^)\n]*\)")
+_MD_LINK = re.compile(r"\[([^\]\n]*)\]\([^)\n]*\)")
+_MD_HEADING = re.compile(r"^[ \t]{0,3}#{1,6}[ \t]+", re.MULTILINE)
+# A markdown code fence, up to its closing fence or the end of the page
+_CODE_FENCE = re.compile(r"^([ \t]{0,3}```[^\n]*(?:\n.*?^[ \t]{0,3}```[ \t]*$|.*\Z))", re.MULTILINE | re.DOTALL)
+_PARAGRAPH_BREAK = re.compile(r"\n(?:[ \t\u00a0]*\n)+")
+_EDGE_SPACE = re.compile(r"^[ \t\u00a0\f\v]+|[ \t\u00a0\f\v]+$", re.MULTILINE)
+_INNER_SPACE = re.compile(r"[ \t\u00a0\f\v]{2,}")
+_SEPARATOR_LINE = re.compile(r"^[\s|:\-=_*#~•·>]*$")
+_BOILERPLATE_LINE = re.compile(
+    r"^(?:skip to (?:main )?content|jump to (?:navigation|search)|toggle (?:navigation|menu)|main menu"
+    r"|sign in|log ?in|sign up|subscribe(?: now)?|share this(?: article| page)?|back to top|table of contents"
+    r"|advertisement|related (?:articles|posts)"
+    r"|accept(?: all)? cookies|cookie (?:policy|settings|preferences)|we use cookies.*|privacy policy"
+    r"|terms (?:of (?:use|service)|and conditions)|all rights reserved\.?"
+    r"|(?:copyright ?)?(?:©|\(c\)) ?(?:(?:19|20)\d\d\b|copyright\b).*)$",
+    re.IGNORECASE
+)
+# Words that are boilerplate as a line of their own, but may also be content
+_BOILERPLATE_WORD = re.compile(r"^(?:menu|home|search|register|share|tweet|print|contents)$", re.IGNORECASE)
+_BOILERPLATE_WORD_LINE = re.compile(
+    r"^[ \t\u00a0]*(menu|home|search|register|share|tweet|print|contents)[ \t\u00a0]*$",
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def _strip_markup(text: str, is_html: bool) -> str:
+    if is_html:
+        text = _HTML_NOISE.sub("", text)
+        text = _HTML_BREAK.sub("\n\n", text)
+        text = _HTML_TAG.sub("", text)
+    if "&" in text:
+        text = html.unescape(text)
+    if "](" in text:
+        text = _MD_IMAGE.sub("", text)
+        text = _MD_LINK.sub(r"\1", text)
+    return text
+
+
+def _repeated_words(text: str) -> Collection[str]:
+    counts = Counter(match.group(1).lower() for match in _BOILERPLATE_WORD_LINE.finditer(text))
+    return {word for word, count in counts.items() if count > 1}
+
+
+def _clean_paragraph(paragraph: str, repeated_words: Collection[str] = ()) -> str:
+    paragraph = _MD_HEADING.sub("", paragraph)
+    lines = [
+        line for line in _INNER_SPACE.sub(" ", _EDGE_SPACE.sub("", paragraph)).split("\n")
+        if not _SEPARATOR_LINE.match(line)
+    ]
+    boilerplate = [len(line) <= BOILERPLATE_MAX_CHARS and bool(_BOILERPLATE_LINE.match(line.strip())) for line in lines]
+    words = [bool(_BOILERPLATE_WORD.match(line.strip())) for line in lines]
+    kept = []
+    for i, line in enumerate(lines):
+        if boilerplate[i]:
+            continue
+        if words[i] and (
+            line.strip().lower() in repeated_words
+            or any(boilerplate[j] or words[j] for j in (i - 1, i + 1) if 0 <= j < len(lines))
+        ):
+            continue
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def _iter_paragraphs(text: str) -> Iterator[str]:
+    start = 0
+    for match in _PARAGRAPH_BREAK.finditer(text):
+        yield text[start:match.start()]
+        start = match.end()
+    yield text[start:]
+
+
+def iter_normalized_paragraphs(text: str) -> Iterator[str]:
+    """Yield the cleaned paragraphs of a page's raw content.
+
+    Markdown code fences are yielded as one paragraph each, unchanged apart
+    from trailing whitespace, so markup and whitespace inside them are kept.
+    Empty paragraphs and paragraphs repeating an earlier one (ignoring
+    case) are skipped.
+
+    Args:
+        text: Raw content, possibly with HTML or markdown markup
+
+    Yields:
+        Paragraphs with boilerplate lines removed and whitespace collapsed
+    """
+    # Odd parts are code fences
+    parts = _CODE_FENCE.split(text) if "```" in text else [text]
+    # Only pages with closing tags outside code are taken for HTML
+    is_html = any("</" in part for part in parts[::2])
+    parts[::2] = [_strip_markup(part, is_html) for part in parts[::2]]
+    repeated_words = _repeated_words("\n".join(parts[::2]))
+
+    seen = set()
+    for i, part in enumerate(parts):
+        if i % 2:
+            paragraphs: Iterator[str] = iter([part.rstrip()])
+        else:
+            paragraphs = (_clean_paragraph(paragraph, repeated_words) for paragraph in _iter_paragraphs(part))
+        for paragraph in paragraphs:
+            key = paragraph.strip().lower()
+            if key and key not in seen:
+                seen.add(key)
+                yield paragraph
+
+
+def normalize_raw_content(text: str) -> str:
+    """Normalize a page's raw content, separating paragraphs with blank lines."""
+    return "\n\n".join(iter_normalized_paragraphs(text))
+
+
+class RawContentNormalizer:
+    """Normalizes the raw content of Tavily responses.
+
+    Responses are normalized before they reach the cache and the local index,
+    so boilerplate is not stored or returned. The UTF-8 bytes removed from
+    each response are observed as ``normalize.bytes_saved``.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        parallel_min_chars: int = PARALLEL_MIN_CHARS,
+        start_method: str = "spawn",
+        metrics: Optional[ServiceMetrics] = None
+    ):
+        """Initialize raw-content normalizer.
+
+        Args:
+            workers: Processes of the pool used for large responses (0 disables
+                the pool)
+            parallel_min_chars: Raw content of a response, in characters, from
+                which its pages are normalized in the pool
+            start_method: Multiprocessing start method of the pool; spawned
+                workers are safe to start from multi-threaded services
+            metrics: Metrics receiving the bytes saved (defaults to the
+                process-wide metrics)
+        """
+        self.workers = workers
+        self.parallel_min_chars = parallel_min_chars
+        self.start_method = start_method
+        self.metrics = metrics if metrics is not None else get_metrics()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._starting = False
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def start_pool(self, wait: bool = False) -> bool:
+        """Start the worker pool unless it is running or starting.
+
+        Starting workers takes as long as importing this package, so the pool
+        starts in the background and large responses are normalized in the
+        calling thread until it is ready.
+
+        Args:
+            wait: Block until the pool is ready or has failed to start
+
+        Returns:
+            Whether the pool is ready
+        """
+        with self._lock:
+            if self._pool is None and not self._starting and self.workers > 0:
+                self._starting = True
+                self._ready.clear()
+                threading.Thread(target=self._start_pool, name="tavily-normalize-pool", daemon=True).start()
+            starting = self._starting
+        if wait and starting:
+            self._ready.wait()
+        return self._pool is not None
+
+    def _start_pool(self) -> None:
+        pool: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(self.start_method)
+        )
+        try:
+            pool.submit(normalize_raw_content, "").result()
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"Normalizing raw content in-process, the worker pool did not start: {str(e)}")
+            pool.shutdown(wait=False)
+            pool = None
+        with self._lock:
+            self._starting = False
+            if pool is not None and self.workers == 0:
+                # Shut down while starting
+                pool.shutdown(wait=False)
+                pool = None
+            if pool is None:
+                self.workers = 0
+            self._pool = pool
+        self._ready.set()
+
+    def _normalize_all(self, bodies: List[str]) -> List[str]:
+        if len(bodies) > 1 and sum(map(len, bodies)) >= self.parallel_min_chars and self.start_pool():
+            pool = self._pool
+            try:
+                if pool is not None:
+                    return list(pool.map(normalize_raw_content, bodies))
+            except (BrokenProcessPool, OSError, RuntimeError) as e:
+                logger.warning(f"Normalizing raw content in-process: {str(e)}")
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = None
+        return [normalize_raw_content(body) for body in bodies]
+
+    def normalize_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a raw Tavily response with the raw content of its results normalized.
+
+        Args:
+            response: Raw Tavily response; it is not modified
+
+        Returns:
+            The response itself if no result has raw content, else a copy
+        """
+        results = response.get("results", [])
+        indexes = [i for i, result in enumerate(results) if result.get("raw_content")]
+        if not indexes:
+            return response
+
+        bodies = [results[i]["raw_content"] for i in indexes]
+        normalized = self._normalize_all(bodies)
+        results = list(results)
+        for i, body in zip(indexes, normalized):
+            results[i] = dict(results[i], raw_content=body)
+
+        saved = sum(len(body.encode("utf-8")) for body in bodies) - sum(len(body.encode("utf-8")) for body in normalized)
+        self.metrics.observe("normalize.bytes_saved", saved)
+        self.metrics.increment("normalize.pages", len(bodies))
+        return dict(response, results=results)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool and normalize in the calling thread from now on."""
+        with self._lock:
+            self.workers = 0
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+
+_default_normalizer: Optional[RawContentNormalizer] = None
+_default_normalizer_lock = threading.Lock()
+
+
+def get_normalizer() -> Optional[RawContentNormalizer]:
+    """Return the process-wide raw-content normalizer, or None when it is disabled.
+
+    Normalization is enabled by REFINIRE_TOOL_TAVILY_NORMALIZE_RAW_CONTENT and
+    runs large responses on REFINIRE_TOOL_TAVILY_NORMALIZE_WORKERS processes.
+    """
+    global _default_normalizer
+    if os.getenv("REFINIRE_TOOL_TAVILY_NORMALIZE_RAW_CONTENT", "false").lower() != "true":
+        return None
+    with _default_normalizer_lock:
+        if _default_normalizer is None:
+            _default_normalizer = RawContentNormalizer(
+                workers=int(os.getenv("REFINIRE_TOOL_TAVILY_NORMALIZE_WORKERS", "2") or 2)
+            )
+        return _default_normalizer
@@ -15,6 +15,24 @@ def tavily_template():
                     "default": "your_tavily_api_key_here",
                     "required": True,
                     "importance": "critical"
+                },
+                "TAVILY_API_KEYS": {
+                    "description": "Comma-separated Tavily API keys to balance searches across; replaces TAVILY_API_KEY when set",
+                    "default": "",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_KEY_CREDITS": {
+                    "description": "Credits each pooled API key may spend per quota period (0 for unlimited)",
+                    "default": "0",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_KEY_COOLDOWN": {
+                    "description": "Base seconds a rate-limited pooled API key is taken out of rotation (doubles on repeated 429s)",
+                    "default": "60",
+                    "required": False,
+                    "importance": "optional"
                 }
             },
             "Search Defaults": {
@@ -36,6 +54,230 @@ def tavily_template():
                     "required": False,
                     "importance": "optional"
                 }
+            },
+            "Domains": {
+                "REFINIRE_TOOL_TAVILY_DOMAIN_POLICY_FILE": {
+                    "description": "JSON file overriding the domain allow/block lists of the news, research and programming tools (re-read when changed)",
+                    "default": "",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_DOMAIN_SHARD_SIZE": {
+                    "description": "Split include_domains lists longer than this into shards searched concurrently (0 disables sharding)",
+                    "default": "0",
+                    "required": False,
+                    "importance": "optional"
+                }
+            },
+            "Latency Planning": {
+                "REFINIRE_TOOL_TAVILY_PLANNER_STATE": {
+                    "description": "JSON file keeping the planner's per-configuration latency statistics across restarts",
+                    "default": "",
+                    "required": False,
+                    "importance": "optional"
+                }
+            },
+            "Local Index": {
+                "REFINIRE_TOOL_TAVILY_LOCAL_INDEX_PATH": {
+                    "description": "Directory of the local index every retrieved result is added to (empty disables the index)",
+                    "default": "",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_LOCAL_MAX_AGE": {
+                    "description": "Maximum age in seconds of results used to answer local-first searches",
+                    "default": "86400",
+                    "required": False,
+                    "importance": "optional"
+                }
+            },
+            "Raw Content": {
+                "REFINIRE_TOOL_TAVILY_NORMALIZE_RAW_CONTENT": {
+                    "description": "Strip markup, boilerplate lines, repeated paragraphs and extra whitespace from raw content before it is cached",
+                    "default": "false",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_NORMALIZE_WORKERS": {
+                    "description": "Processes normalizing the raw content of large responses (0 normalizes in the calling thread)",
+                    "default": "2",
+                    "required": False,
+                    "importance": "optional"
+                }
+            },
+            "Watches": {
+                "REFINIRE_TOOL_TAVILY_WATCH_PATH": {
+                    "description": "Directory holding saved-query watches and the seen-URL filters they report new results against",
+                    "default": "",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_WATCH_ERROR_RATE": {
+                    "description": "False-positive rate of new seen-URL filters (new results wrongly taken as seen)",
+                    "default": "0.001",
+                    "required": False,
+                    "importance": "optional"
+                }
+            },
+            "Response Journal": {
+                "REFINIRE_TOOL_TAVILY_JOURNAL_PATH": {
+                    "description": "Directory of the binary journal receiving every search_web response (empty disables the journal)",
+                    "default": "",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_JOURNAL_SEGMENT_MB": {
+                    "description": "Journal segment size in megabytes before a new segment is started",
+                    "default": "64",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_JOURNAL_COMPRESS": {
+                    "description": "Compress journal records with zlib",
+                    "default": "false",
+                    "required": False,
+                    "importance": "optional"
+                }
+            },
+            "Concurrency": {
+                "REFINIRE_TOOL_TAVILY_MAX_CONCURRENCY": {
+                    "description": "Highest number of concurrent Tavily calls the adaptive limiter may allow (0 disables the limiter)",
+                    "default": "0",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_CONCURRENCY_MAX_WAIT": {
+                    "description": "Seconds a search waits for a Tavily call slot before failing",
+                    "default": "30",
+                    "required": False,
+                    "importance": "optional"
+                }
+            },
+            "Scheduling": {
+                "REFINIRE_TOOL_TAVILY_SCHEDULER_SLOTS": {
+                    "description": "Searches run at the same time by the priority scheduler; interactive searches go ahead of batch and background ones (0 disables scheduling)",
+                    "default": "0",
+                    "required": False,
+                    "importance": "optional"
+                }
+            },
+            "Caching": {
+                "REFINIRE_TOOL_TAVILY_CACHE_TTL": {
+                    "description": "Time-to-live in seconds of the shared response cache (0 disables caching)",
+                    "default": "0",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_CACHE_MAX_ENTRIES": {
+                    "description": "Maximum number of responses kept in the shared cache",
+                    "default": "1024",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_CACHE_STALE_TTL": {
+                    "description": "Seconds expired responses are kept to be served while the circuit breaker is open",
+                    "default": "0",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_CACHE_SNAPSHOT_PATH": {
+                    "description": "File the hottest cache entries are saved to at exit and warmed from at start-up",
+                    "default": "",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_CACHE_SNAPSHOT_ENTRIES": {
+                    "description": "Most frequently used cache entries kept in the snapshot",
+                    "default": "256",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_CACHE_SNAPSHOT_INTERVAL": {
+                    "description": "Seconds between cache snapshots in addition to the one at exit (0 snapshots only at exit)",
+                    "default": "0",
+                    "required": False,
+                    "importance": "optional"
+                }
+            },
+            "Prefetching": {
+                "REFINIRE_TOOL_TAVILY_PREFETCH_FOLLOW_UPS": {
+                    "description": "Follow-up questions of each search prefetched into the cache in the background (0 disables prefetching; needs the cache)",
+                    "default": "0",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_PREFETCH_CREDITS_PER_HOUR": {
+                    "description": "Tavily credits prefetches may spend per hour",
+                    "default": "60",
+                    "required": False,
+                    "importance": "optional"
+                }
+            },
+            "Circuit Breaker": {
+                "REFINIRE_TOOL_TAVILY_BREAKER_ENABLED": {
+                    "description": "Fail fast with a shared circuit breaker while Tavily is failing or slow",
+                    "default": "false",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_BREAKER_FAILURE_RATE": {
+                    "description": "Share of failed calls in the last minute that opens the breaker",
+                    "default": "0.5",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_BREAKER_SLOW_CALL_SECONDS": {
+                    "description": "Latency in seconds above which a call counts as slow",
+                    "default": "10",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_BREAKER_OPEN_SECONDS": {
+                    "description": "Seconds the breaker stays open before probing Tavily again",
+                    "default": "30",
+                    "required": False,
+                    "importance": "optional"
+                }
+            },
+            "Profiling": {
+                "REFINIRE_TOOL_TAVILY_PROFILE_SAMPLE_RATE": {
+                    "description": "Profile one in this many search_web/get_search_context calls with cProfile and tracemalloc (0 disables profiling)",
+                    "default": "0",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_PROFILE_OUTPUT": {
+                    "description": "Rotating file receiving profile reports (empty keeps reports in memory)",
+                    "default": "",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_PROFILE_TOP": {
+                    "description": "Number of hot functions and allocation sites listed per profile report",
+                    "default": "20",
+                    "required": False,
+                    "importance": "optional"
+                }
+            },
+            "Load Testing": {
+                "REFINIRE_TOOL_TAVILY_RECORD_PATH": {
+                    "description": "Record every Tavily request/response pair to this journal file",
+                    "default": "",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_REPLAY_PATH": {
+                    "description": "Serve responses from this recorded journal instead of calling the Tavily API",
+                    "default": "",
+                    "required": False,
+                    "importance": "optional"
+                },
+                "REFINIRE_TOOL_TAVILY_REPLAY_LATENCY_SCALE": {
+                    "description": "Reproduce recorded latencies multiplied by this factor while replaying (empty disables latency shaping)",
+                    "default": "",
+                    "required": False,
+                    "importance": "optional"
+                }
             }
         }
     }
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""Top-passage extraction from raw page content.
+
+Raw content is split into overlapping character windows snapped to word
+boundaries. Query-term positions are collected in a single regex scan of the
+body, and every window is then scored at once with BM25 on a windows x terms
+count matrix built with ``searchsorted``. Only the offsets of windows are kept
+while scoring; text is sliced out for the top-k passages alone.
+"""
+
+import bisect
+import re
+from typing import List, Sequence, Tuple
+
+from .models import Passage
+from .rerank import BM25_B, BM25_K1, _bm25_python, bm25_from_counts, np, query_terms
+
+
+PASSAGE_WINDOW_CHARS = 1000
+PASSAGE_STRIDE_CHARS = 500
+# How far a window edge may move to land on whitespace
+_SNAP_CHARS = 100
+
+
+def window_offsets(
+    text: str,
+    window_chars: int = PASSAGE_WINDOW_CHARS,
+    stride_chars: int = PASSAGE_STRIDE_CHARS
+) -> Tuple[List[int], List[int]]:
+    """Compute overlapping window offsets over a text.
+
+    Window edges are moved to nearby whitespace so that words are not cut.
+    Only bounded ``str.find``/``str.rfind`` calls are made, so the text is
+    never copied.
+
+    Args:
+        text: Text to split
+        window_chars: Target window length in characters
+        stride_chars: Distance between window starts in characters
+
+    Returns:
+        Tuple of (window start offsets, window end offsets)
+    """
+    starts: List[int] = []
+    ends: List[int] = []
+    length = len(text)
+    start = 0
+    while start < length:
+        end = min(length, start + window_chars)
+        if end < length:
+            cut = text.rfind(" ", max(start + 1, end - _SNAP_CHARS), end)
+            if cut != -1:
+                end = cut
+        starts.append(start)
+        ends.append(end)
+        if end >= length:
+            break
+
+        next_start = start + stride_chars
+        space = text.find(" ", next_start, next_start + _SNAP_CHARS)
+        start = space + 1 if space != -1 else next_start
+    return starts, ends
+
+
+def term_positions(text: str, terms: Sequence[str]) -> List[List[int]]:
+    """Collect the start offsets of every whole-word, case-insensitive term match.
+
+    Args:
+        text: Text to scan
+        terms: Lowercase query terms
+
+    Returns:
+        One sorted list of offsets per term
+    """
+    column = {term: index for index, term in enumerate(terms)}
+    alternatives = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    pattern = re.compile(rf"\b(?:{alternatives})\b", re.IGNORECASE)
+    positions: List[List[int]] = [[] for _ in terms]
+    for match in pattern.finditer(text):
+        index = column.get(match.group().lower())
+        if index is not None:
+            positions[index].append(match.start())
+    return positions
+
+
+def _score_windows_python(
+    positions: List[List[int]],
+    starts: List[int],
+    ends: List[int]
+) -> List[float]:
+    tf = [
+        [bisect.bisect_left(offsets, end) - bisect.bisect_left(offsets, start) for offsets in positions]
+        for start, end in zip(starts, ends)
+    ]
+    lengths = [end - start for start, end in zip(starts, ends)]
+    return _bm25_python(tf, lengths, BM25_K1, BM25_B)
+
+
+def extract_passages(
+    query: str,
+    text: str,
+    top_k: int = 3,
+    window_chars: int = PASSAGE_WINDOW_CHARS,
+    stride_chars: int = PASSAGE_STRIDE_CHARS
+) -> List[Passage]:
+    """Extract the passages of a text most relevant to a query.
+
+    Args:
+        query: Search query
+        text: Raw page content
+        top_k: Maximum number of passages to return
+        window_chars: Target passage length in characters
+        stride_chars: Distance between passage starts in characters
+
+    Returns:
+        Top non-overlapping passages in document order, each with its offsets
+        and score. Passages that contain no query term are not returned.
+    """
+    terms = query_terms(query)
+    if not terms or not text:
+        return []
+
+    positions = term_positions(text, terms)
+    if not any(positions):
+        return []
+    starts, ends = window_offsets(text, window_chars, stride_chars)
+
+    if np is None:
+        scores = _score_windows_python(positions, starts, ends)
+    else:
+        start_array = np.asarray(starts)
+        end_array = np.asarray(ends)
+        tf = np.empty((len(starts), len(terms)))
+        for column, offsets in enumerate(positions):
+            offsets = np.asarray(offsets, dtype=np.int64)
+            tf[:, column] = np.searchsorted(offsets, end_array) - np.searchsorted(offsets, start_array)
+        scores = bm25_from_counts(tf, (end_array - start_array).astype(float)).tolist()
+
+    # Greedily take the best windows, skipping ones that overlap a chosen window
+    selected: List[int] = []
+    for index in sorted(range(len(scores)), key=lambda index: -scores[index]):
+        if len(selected) >= top_k or scores[index] <= 0:
+            break
+        if all(ends[index] <= starts[other] or starts[index] >= ends[other] for other in selected):
+            selected.append(index)
+    selected.sort()
+    return [
+        Passage(text=text[starts[index]:ends[index]], start=starts[index], end=ends[index], score=scores[index])
+        for index in selected
+    ]
@@ -0,0 +1,184 @@
+"""Latency-budget planning of Tavily search parameters."""
+
+import atexit
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import SearchRequest
+
+
+logger = logging.getLogger(__name__)
+
+# Latency assumed for a configuration before it has been observed, in seconds
+PRIOR_LATENCY = {"basic": 1.5, "advanced": 4.0}
+# Smoothing factors of the latency and deviation estimates (as for TCP RTT)
+EWMA_ALPHA = 0.125
+EWMA_BETA = 0.25
+# Deviations added to the mean so most calls finish within the budget
+DEVIATION_MARGIN = 2.0
+# Result count of the smallest plan considered
+MIN_PLANNED_RESULTS = 3
+
+
+class LatencyStats:
+    """Smoothed latency and latency deviation of one configuration."""
+
+    def __init__(self, mean: float, deviation: float, count: int = 0):
+        self.mean = mean
+        self.deviation = deviation
+        self.count = count
+
+    def observe(self, latency: float) -> None:
+        """Fold one observed latency into the estimates."""
+        if self.count == 0:
+            self.mean = latency
+            self.deviation = latency / 2
+        else:
+            self.deviation += EWMA_BETA * (abs(latency - self.mean) - self.deviation)
+            self.mean += EWMA_ALPHA * (latency - self.mean)
+        self.count += 1
+
+    def estimate(self) -> float:
+        """Latency that most calls of this configuration stay under."""
+        return self.mean + DEVIATION_MARGIN * self.deviation
+
+
+class LatencyPlanner:
+    """Chooses search depth and result count to fit a latency budget.
+
+    Latency is tracked per (search depth, result count) configuration from
+    live Tavily calls. For a request with a budget, candidate plans are tried
+    from the most thorough (advanced depth, all requested results) to the
+    cheapest (basic depth, a few results) and the first whose estimated
+    latency fits is chosen; if none fits, the fastest estimate is used.
+    """
+
+    def __init__(self, state_path: Optional[str] = None):
+        """Initialize latency planner.
+
+        Args:
+            state_path: JSON file the latency statistics are loaded from and
+                saved to, so they are kept across restarts (optional)
+        """
+        self.state_path = state_path
+        self._stats: Dict[Tuple[str, int], LatencyStats] = {}
+        self._lock = threading.Lock()
+        if state_path and os.path.exists(state_path):
+            try:
+                self.load(state_path)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Ignoring unreadable planner state {state_path}: {str(e)}")
+
+    def observe(self, search_depth: str, max_results: int, latency: float) -> None:
+        """Record the latency of a Tavily call."""
+        key = (search_depth, max_results)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = LatencyStats(0.0, 0.0)
+            stats.observe(latency)
+
+    def estimate(self, search_depth: str, max_results: int) -> float:
+        """Estimate the latency of a configuration.
+
+        Configurations never observed borrow the estimate of the observed
+        configuration of the same depth with the closest result count, or the
+        prior for the depth.
+        """
+        with self._lock:
+            stats = self._stats.get((search_depth, max_results))
+            if stats is None:
+                same_depth = [key for key in self._stats if key[0] == search_depth]
+                if same_depth:
+                    stats = self._stats[min(same_depth, key=lambda key: abs(key[1] - max_results))]
+            if stats is not None:
+                return stats.estimate()
+        return PRIOR_LATENCY.get(search_depth, PRIOR_LATENCY["advanced"])
+
+    def candidates(self, request: SearchRequest) -> List[Tuple[str, int]]:
+        """Candidate (depth, result count) plans, most thorough first."""
+        plans = [("advanced", request.max_results), ("basic", request.max_results)]
+        fewer = min(MIN_PLANNED_RESULTS, request.max_results)
+        if fewer < request.max_results:
+            plans.append(("basic", fewer))
+        return plans
+
+    def plan(self, request: SearchRequest) -> Dict[str, Any]:
+        """Choose parameters for a request with a latency budget.
+
+        Args:
+            request: Search request with ``latency_budget`` set
+
+        Returns:
+            Decision with the chosen ``search_depth`` and ``max_results``,
+            its ``estimated_latency``, the ``budget``, a ``reason`` and the
+            estimate of every candidate
+        """
+        budget = request.latency_budget
+        estimates = [(depth, count, self.estimate(depth, count)) for depth, count in self.candidates(request)]
+        chosen = next((plan for plan in estimates if plan[2] <= budget), None)
+        reason = "fits_budget"
+        if chosen is None:
+            chosen = min(estimates, key=lambda plan: plan[2])
+            reason = "fastest_available"
+        return {
+            "budget": budget,
+            "search_depth": chosen[0],
+            "max_results": chosen[1],
+            "estimated_latency": chosen[2],
+            "reason": reason,
+            "candidates": [
+                {"search_depth": depth, "max_results": count, "estimated_latency": estimate}
+                for depth, count, estimate in estimates
+            ]
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the latency statistics as JSON-serializable data."""
+        with self._lock:
+            return {
+                f"{depth}:{count}": {"mean": stats.mean, "deviation": stats.deviation, "count": stats.count}
+                for (depth, count), stats in self._stats.items()
+            }
+
+    def load(self, path: str) -> None:
+        """Load latency statistics saved by ``save``."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        with self._lock:
+            for key, values in data.items():
+                depth, count = key.rsplit(":", 1)
+                self._stats[(depth, int(count))] = LatencyStats(values["mean"], values["deviation"], values["count"])
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Save latency statistics to a JSON file (the state path by default)."""
+        path = path or self.state_path
+        if not path:
+            return
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+
+_default_planner: Optional[LatencyPlanner] = None
+_default_planner_lock = threading.Lock()
+
+
+def get_planner() -> LatencyPlanner:
+    """Return the process-wide planner shared by every ``TavilyService``.
+
+    When REFINIRE_TOOL_TAVILY_PLANNER_STATE is set, statistics are loaded from
+    that file and saved back at exit.
+    """
+    global _default_planner
+    with _default_planner_lock:
+        if _default_planner is None:
+            state_path = os.getenv("REFINIRE_TOOL_TAVILY_PLANNER_STATE") or None
+            _default_planner = LatencyPlanner(state_path)
+            if state_path:
+                atexit.register(_default_planner.save)
+        return _default_planner
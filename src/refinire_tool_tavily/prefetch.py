@@ -0,0 +1,204 @@
+"""Speculative prefetch of follow-up questions into the response cache."""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Deque, Dict, Optional, Tuple
+
+from .metrics import ServiceMetrics, get_metrics
+from .models import SearchRequest, SearchResponse
+from .progressive import SEARCH_DEPTH_CREDITS
+from .utils import canonical_request_key
+
+if TYPE_CHECKING:
+    from .service import TavilyService
+
+
+logger = logging.getLogger(__name__)
+
+# Window over which the credit budget applies, in seconds
+BUDGET_WINDOW = 3600.0
+# Prefetched keys remembered for hit tracking
+MAX_TRACKED = 1024
+
+
+class FollowUpPrefetcher:
+    """Searches likely follow-up questions in the background.
+
+    After a search, its top follow-up questions are searched with the same
+    result count and answer setting, as background-priority searches whose
+    raw responses land in the cache. A later search for one of them is then
+    a cache hit, counted as a prefetch hit. Prefetches are skipped when the
+    response is already cached, when ``max_pending`` are in flight or when
+    they would spend more than ``credits_per_hour``.
+    """
+
+    def __init__(
+        self,
+        top_n: int = 2,
+        credits_per_hour: float = 60,
+        workers: int = 2,
+        max_pending: int = 8,
+        metrics: Optional[ServiceMetrics] = None
+    ):
+        """Initialize follow-up prefetcher.
+
+        Args:
+            top_n: Follow-up questions prefetched per search
+            credits_per_hour: Tavily credits prefetches may spend per hour
+            workers: Prefetches run at the same time
+            max_pending: Prefetches queued or running before new ones are skipped
+            metrics: Metrics receiving prefetch counts and the hit rate
+                (defaults to the process-wide metrics)
+        """
+        self.top_n = top_n
+        self.credits_per_hour = credits_per_hour
+        self.max_pending = max_pending
+        self.metrics = metrics if metrics is not None else get_metrics()
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tavily-prefetch")
+        self._pending = 0
+        self._spent: Deque[Tuple[float, float]] = deque()  # time, credits
+        self._prefetched: "OrderedDict[str, float]" = OrderedDict()
+        self._completed = 0
+        self._hits = 0
+        self._lock = threading.Lock()
+
+    def prefetch(self, service: "TavilyService", request: SearchRequest, response: SearchResponse) -> None:
+        """Queue background searches for the follow-up questions of a response.
+
+        Args:
+            service: Service whose cache receives the prefetched responses
+            request: Request that produced the response
+            response: Response holding ``follow_up_questions``
+        """
+        if service.cache is None or not response.follow_up_questions:
+            return
+        for question in response.follow_up_questions[:self.top_n]:
+            try:
+                follow_up = SearchRequest(
+                    query=question,
+                    max_results=request.max_results,
+                    include_answer=request.include_answer
+                )
+            except ValueError:
+                continue
+            search_params = service._build_search_params(follow_up)
+            key = canonical_request_key(search_params)
+            if key in service.cache or not self._reserve(key, search_params):
+                continue
+            self.metrics.increment("prefetch.scheduled")
+            self._executor.submit(self._run, service, search_params, key)
+
+    def _reserve(self, key: str, search_params: Dict[str, Any]) -> bool:
+        now = time.time()
+        credits = SEARCH_DEPTH_CREDITS.get(search_params.get("search_depth", "basic"), 1)
+        with self._lock:
+            if key in self._prefetched:
+                return False
+            while self._spent and self._spent[0][0] < now - BUDGET_WINDOW:
+                self._spent.popleft()
+            if self._pending >= self.max_pending:
+                self.metrics.increment("prefetch.skipped_pending")
+                return False
+            if sum(spent for _, spent in self._spent) + credits > self.credits_per_hour:
+                self.metrics.increment("prefetch.skipped_budget")
+                return False
+            self._spent.append((now, credits))
+            self._pending += 1
+            self._prefetched[key] = now
+            while len(self._prefetched) > MAX_TRACKED:
+                self._prefetched.popitem(last=False)
+        return True
+
+    def _run(self, service: "TavilyService", search_params: Dict[str, Any], key: str) -> None:
+        # Imported here because the scheduler depends on the service, which uses the prefetcher
+        from .scheduler import get_scheduler
+
+        def fetch() -> None:
+            service.cache.put(key, service._call_client(search_params))
+
+        try:
+            scheduler = get_scheduler()
+            if scheduler is not None:
+                scheduler.run(fetch, "background", "prefetch")
+            else:
+                fetch()
+            with self._lock:
+                self._completed += 1
+            self.metrics.increment("prefetch.completed")
+        except Exception as e:
+            with self._lock:
+                self._prefetched.pop(key, None)
+            self.metrics.increment("prefetch.failed")
+            logger.debug(f"Prefetch of {search_params['query']!r} failed: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+            self._update_hit_rate()
+
+    def claim(self, key: str) -> bool:
+        """Record a cache hit, returning whether a prefetch put the response there.
+
+        Each prefetched response counts as a hit at most once.
+        """
+        with self._lock:
+            if self._prefetched.pop(key, None) is None:
+                return False
+            self._hits += 1
+        self.metrics.increment("prefetch.hits")
+        self._update_hit_rate()
+        return True
+
+    def _update_hit_rate(self) -> None:
+        with self._lock:
+            hit_rate = self._hits / self._completed if self._completed else 0.0
+        self.metrics.set_gauge("prefetch.hit_rate", hit_rate)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return prefetch statistics.
+
+        Returns:
+            Dictionary with completed prefetches, hits, hit_rate, pending
+            prefetches and credits spent in the budget window
+        """
+        with self._lock:
+            return {
+                "completed": self._completed,
+                "hits": self._hits,
+                "hit_rate": self._hits / self._completed if self._completed else 0.0,
+                "pending": self._pending,
+                "credits": sum(spent for _, spent in self._spent)
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting prefetches, optionally waiting for queued ones."""
+        self._executor.shutdown(wait=wait)
+
+
+_default_prefetcher: Optional[FollowUpPrefetcher] = None
+_default_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher() -> Optional[FollowUpPrefetcher]:
+    """Return the process-wide follow-up prefetcher, or None when it is disabled.
+
+    Prefetching is enabled by setting REFINIRE_TOOL_TAVILY_PREFETCH_FOLLOW_UPS
+    to the number of follow-up questions prefetched per search, spends at most
+    REFINIRE_TOOL_TAVILY_PREFETCH_CREDITS_PER_HOUR credits, and needs the
+    response cache to be enabled.
+    """
+    global _default_prefetcher
+    top_n = int(os.getenv("REFINIRE_TOOL_TAVILY_PREFETCH_FOLLOW_UPS", "0") or 0)
+    if top_n <= 0:
+        return None
+    with _default_prefetcher_lock:
+        if _default_prefetcher is None:
+            _default_prefetcher = FollowUpPrefetcher(
+                top_n=top_n,
+                credits_per_hour=float(os.getenv("REFINIRE_TOOL_TAVILY_PREFETCH_CREDITS_PER_HOUR", "60") or 60)
+            )
+        return _default_prefetcher
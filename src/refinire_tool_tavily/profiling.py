@@ -0,0 +1,198 @@
+"""Opt-in sampling profiler for search calls.
+
+One in every N profiled calls runs under cProfile and tracemalloc. Each sample
+produces a report with the hottest functions and the top allocation sites, and
+the cProfile statistics of all samples are aggregated so that recurring hot
+spots stand out. Reports go to a rotating file or an in-memory buffer.
+
+Profiling is controlled by REFINIRE_TOOL_TAVILY_PROFILE_SAMPLE_RATE. When it is
+unset or 0 the wrapped functions pay a single ``None`` check per call.
+"""
+
+import cProfile
+import functools
+import io
+import itertools
+import logging
+import logging.handlers
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class SearchProfiler:
+    """Sampling profiler that captures CPU and allocation hot spots."""
+
+    def __init__(
+        self,
+        sample_every: int,
+        output_path: Optional[str] = None,
+        top: int = 20,
+        max_bytes: int = 1_000_000,
+        backup_count: int = 3,
+        max_reports: int = 50
+    ):
+        """Initialize search profiler.
+
+        Args:
+            sample_every: Profile one call in this many
+            output_path: Rotating report file. If None, reports are kept in memory.
+            top: Number of functions and allocation sites listed per report
+            max_bytes: Size at which the report file is rotated
+            backup_count: Number of rotated report files kept
+            max_reports: Number of reports kept in memory
+        """
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+
+        self.sample_every = sample_every
+        self.top = top
+        self.reports: Deque[str] = deque(maxlen=max_reports)
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self._aggregate: Optional[pstats.Stats] = None
+        self.samples = 0
+
+        self._file_logger: Optional[logging.Logger] = None
+        if output_path:
+            handler = logging.handlers.RotatingFileHandler(
+                output_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._file_logger = logging.getLogger(f"{__name__}.reports")
+            self._file_logger.handlers = [handler]
+            self._file_logger.setLevel(logging.INFO)
+            self._file_logger.propagate = False
+
+    def should_sample(self) -> bool:
+        """Return True if the next call should be profiled."""
+        return next(self._counter) % self.sample_every == 0
+
+    def profile(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a function under cProfile and tracemalloc and record a report.
+
+        Profiling runs are serialized because cProfile and tracemalloc are
+        process-wide; unsampled calls are never blocked.
+        """
+        with self._lock:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            profiler = cProfile.Profile()
+            start_time = time.perf_counter()
+            try:
+                return profiler.runcall(func, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start_time
+                snapshot = tracemalloc.take_snapshot()
+                if started_tracing:
+                    tracemalloc.stop()
+                self._record(func, args, kwargs, profiler, snapshot, elapsed)
+
+    def _record(
+        self,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+        profiler: cProfile.Profile,
+        snapshot: tracemalloc.Snapshot,
+        elapsed: float
+    ) -> None:
+        self.samples += 1
+        stats = pstats.Stats(profiler)
+        if self._aggregate is None:
+            self._aggregate = pstats.Stats(profiler)
+        else:
+            self._aggregate.add(stats)
+
+        query = kwargs.get("query", args[0] if args else "")
+        lines = [
+            f"=== Profile sample #{self.samples}: {func.__name__}(query={query!r}) {elapsed * 1000:.1f}ms ===",
+            "Hot functions (cumulative time):",
+            self._format_stats(stats),
+            "Top allocation sites:",
+        ]
+        lines.extend(self._format_allocations(snapshot))
+        report = "\n".join(lines)
+
+        self.reports.append(report)
+        if self._file_logger is not None:
+            self._file_logger.info(report)
+
+    def _format_stats(self, stats: pstats.Stats) -> str:
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats("cumulative").print_stats(self.top)
+        return stream.getvalue().strip()
+
+    def _format_allocations(self, snapshot: tracemalloc.Snapshot) -> List[str]:
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        lines = []
+        for stat in snapshot.statistics("lineno")[:self.top]:
+            frame = stat.traceback[0]
+            lines.append(f"  {frame.filename}:{frame.lineno}: {stat.size / 1024:.1f} KiB in {stat.count} blocks")
+        return lines
+
+    def aggregate_report(self) -> str:
+        """Return the hottest functions aggregated over all samples."""
+        with self._lock:
+            if self._aggregate is None:
+                return "No samples collected"
+            return f"Aggregated over {self.samples} samples:\n{self._format_stats(self._aggregate)}"
+
+
+_profiler: Optional[SearchProfiler] = None
+_configured = False
+_config_lock = threading.Lock()
+
+
+def get_profiler() -> Optional[SearchProfiler]:
+    """Return the process-wide profiler configured by environment variables.
+
+    Configuration is read once, on the first profiled call, so that variables
+    loaded from ``.env`` after import are honoured.
+    """
+    global _profiler, _configured
+    if _configured:
+        return _profiler
+    with _config_lock:
+        if not _configured:
+            sample_every = int(os.getenv("REFINIRE_TOOL_TAVILY_PROFILE_SAMPLE_RATE", "0") or 0)
+            if sample_every > 0:
+                _profiler = SearchProfiler(
+                    sample_every,
+                    output_path=os.getenv("REFINIRE_TOOL_TAVILY_PROFILE_OUTPUT") or None,
+                    top=int(os.getenv("REFINIRE_TOOL_TAVILY_PROFILE_TOP", "20"))
+                )
+                logger.info(f"Search profiling enabled for 1 in {sample_every} calls")
+            _configured = True
+    return _profiler
+
+
+def set_profiler(profiler: Optional[SearchProfiler]) -> None:
+    """Install a profiler explicitly, overriding environment configuration."""
+    global _profiler, _configured
+    with _config_lock:
+        _profiler = profiler
+        _configured = True
+
+
+def sampled(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator that profiles one in N calls of ``func`` when enabled."""
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profiler = _profiler if _configured else get_profiler()
+        if profiler is None or not profiler.should_sample():
+            return func(*args, **kwargs)
+        return profiler.profile(func, *args, **kwargs)
+    return wrapper
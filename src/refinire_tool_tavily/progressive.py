@@ -0,0 +1,125 @@
+"""Progressive searches that widen only when a cheap first pass falls short."""
+
+import logging
+import time
+from typing import Callable, List, Optional, Set
+from urllib.parse import urlsplit
+
+from .models import SearchRequest, SearchResponse
+from .sharding import merge_by_score
+
+
+logger = logging.getLogger(__name__)
+
+# Results requested by the first, basic-depth pass
+PROGRESSIVE_INITIAL_RESULTS = 3
+# Tavily API credits per request by search depth
+SEARCH_DEPTH_CREDITS = {"basic": 1, "advanced": 2}
+
+
+class SufficiencyCheck:
+    """Decides whether a first-pass response is good enough to return.
+
+    A response is sufficient when it has the results it asked for, its top
+    result scores at least ``min_score``, its results come from at least
+    ``min_unique_domains`` domains and, if an answer was requested, it has one.
+    """
+
+    def __init__(self, min_score: float = 0.6, min_unique_domains: int = 2, require_answer: bool = True):
+        """Initialize sufficiency check.
+
+        Args:
+            min_score: Minimum Tavily score of the top result
+            min_unique_domains: Minimum number of distinct result domains
+            require_answer: Require an answer when the request includes one
+        """
+        self.min_score = min_score
+        self.min_unique_domains = min_unique_domains
+        self.require_answer = require_answer
+
+    def failures(self, request: SearchRequest, response: SearchResponse) -> List[str]:
+        """Return the reasons a response is insufficient (empty when sufficient)."""
+        reasons = []
+        if len(response.results) < request.max_results:
+            reasons.append("too_few_results")
+        top_score = max((result.score or 0.0 for result in response.results), default=0.0)
+        if top_score < self.min_score:
+            reasons.append("low_score")
+        hosts: Set[Optional[str]] = {urlsplit(result.url).hostname for result in response.results}
+        if len(hosts - {None}) < min(self.min_unique_domains, request.max_results):
+            reasons.append("few_domains")
+        if self.require_answer and request.include_answer and not response.answer:
+            reasons.append("no_answer")
+        return reasons
+
+
+def search_progressive(
+    request: SearchRequest,
+    search: Callable[[SearchRequest], SearchResponse],
+    check: Optional[SufficiencyCheck] = None,
+    initial_results: int = PROGRESSIVE_INITIAL_RESULTS
+) -> SearchResponse:
+    """Search with a small basic-depth request first and widen only if needed.
+
+    The first pass asks for ``initial_results`` results at basic depth. If it
+    passes the sufficiency check it is returned as is, possibly with fewer
+    than ``request.max_results`` results. Otherwise a second pass asks for
+    ``request.max_results`` results at the requested depth (advanced by
+    default) and both passes are merged by score. The second pass is skipped
+    when it would repeat the first.
+
+    Args:
+        request: Search request
+        search: Function performing a single non-progressive search
+        check: Sufficiency check (default thresholds when omitted)
+        initial_results: Results requested by the first pass
+
+    Returns:
+        SearchResponse. ``metadata["progressive"]`` lists each pass with its
+        size, depth, latency and estimated credits, whether the search was
+        expanded, and why.
+    """
+    check = check or SufficiencyCheck()
+    start_time = time.time()
+    passes = []
+
+    def run(max_results: int, search_depth: str) -> SearchResponse:
+        pass_start = time.perf_counter()
+        response = search(request.model_copy(update={
+            "max_results": max_results,
+            "search_depth": search_depth,
+            "progressive": False
+        }))
+        passes.append({
+            "max_results": max_results,
+            "search_depth": search_depth,
+            "results": len(response.results),
+            "latency": time.perf_counter() - pass_start,
+            "credits": SEARCH_DEPTH_CREDITS.get(search_depth, 1)
+        })
+        return response
+
+    first_request = request.model_copy(update={"max_results": min(initial_results, request.max_results)})
+    first = run(first_request.max_results, "basic")
+    reasons = check.failures(first_request, first)
+
+    responses = [first]
+    wider_depth = request.search_depth or "advanced"
+    if reasons and (request.max_results > first_request.max_results or wider_depth != "basic"):
+        logger.info(f"Expanding progressive search ({', '.join(reasons)})")
+        responses.append(run(request.max_results, wider_depth))
+    expanded = len(responses) > 1
+
+    results = merge_by_score(request, responses)
+    last = responses[-1]
+    metadata = dict(last.metadata)
+    metadata["progressive"] = {"passes": passes, "expanded": expanded, "reasons": reasons}
+    return SearchResponse(
+        query=request.query,
+        results=results,
+        answer=last.answer or first.answer,
+        follow_up_questions=last.follow_up_questions or first.follow_up_questions,
+        total_results=len(results),
+        search_time=time.time() - start_time,
+        metadata=metadata
+    )
@@ -0,0 +1,107 @@
+"""Field projection of search responses for compact tool output."""
+
+from typing import Any, Dict, Optional, Sequence
+
+from .context import truncate_to_sentence
+from .models import SearchResponse, SearchResult
+
+
+RESULT_FIELDS = ("title", "url", "content", "score", "raw_content", "rerank_score", "passages")
+RESPONSE_FIELDS = ("answer", "follow_up_questions", "search_time", "metadata")
+# Fields that can be capped to a token length
+TEXT_FIELDS = ("title", "content", "raw_content", "answer")
+
+# Fields and token caps of compact output: enough for an agent to pick and cite
+# a source without filling its context with page text
+COMPACT_FIELDS = ("title", "url", "content", "answer")
+COMPACT_MAX_TOKENS = {"title": 32, "content": 80, "answer": 200}
+
+
+class FieldProjection:
+    """Selects the fields of a tool response and caps the length of text fields.
+
+    Responses are built with only the selected fields, so unrequested ones are
+    never converted or copied. ``success``, ``query``, ``results`` and
+    ``total_results`` are always present.
+    """
+
+    def __init__(self, fields: Optional[Sequence[str]] = None, max_tokens: Optional[Dict[str, int]] = None):
+        """Initialize a projection.
+
+        Args:
+            fields: Result fields (such as ``url`` or ``raw_content``) and
+                response fields (such as ``answer``) to keep (defaults to all)
+            max_tokens: Token cap per text field, truncating at a sentence
+                boundary (optional)
+
+        Raises:
+            ValueError: If a field is unknown or a cap is not for a text field
+        """
+        selected = set(RESULT_FIELDS + RESPONSE_FIELDS if fields is None else fields)
+        unknown = selected - set(RESULT_FIELDS + RESPONSE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        max_tokens = dict(max_tokens or {})
+        uncappable = set(max_tokens) - set(TEXT_FIELDS)
+        if uncappable:
+            raise ValueError(f"Only text fields can be capped, not: {', '.join(sorted(uncappable))}")
+        if any(cap < 1 for cap in max_tokens.values()):
+            raise ValueError("Field caps must be at least 1 token")
+
+        self.result_fields = tuple(field for field in RESULT_FIELDS if field in selected)
+        self.response_fields = tuple(field for field in RESPONSE_FIELDS if field in selected)
+        self.max_tokens = max_tokens
+
+    @classmethod
+    def from_options(
+        cls,
+        fields: Optional[Sequence[str]] = None,
+        compact: bool = False,
+        max_tokens: Optional[Dict[str, int]] = None
+    ) -> Optional["FieldProjection"]:
+        """Build the projection of tool options, or None when nothing is projected.
+
+        Compact mode defaults the fields to ``COMPACT_FIELDS`` and the caps to
+        ``COMPACT_MAX_TOKENS``; explicit fields and caps take precedence.
+        """
+        if compact:
+            fields = COMPACT_FIELDS if fields is None else fields
+            max_tokens = {**COMPACT_MAX_TOKENS, **(max_tokens or {})}
+        if fields is None and not max_tokens:
+            return None
+        return cls(fields, max_tokens)
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.result_fields or field in self.response_fields
+
+    def _text(self, field: str, text: str) -> str:
+        cap = self.max_tokens.get(field)
+        return text if cap is None else truncate_to_sentence(text, cap)
+
+    def result_to_dict(self, result: SearchResult) -> Dict[str, Any]:
+        """Convert a search result to a dictionary of the selected fields."""
+        result_dict: Dict[str, Any] = {}
+        for field in self.result_fields:
+            value = getattr(result, field)
+            if value is None:
+                continue
+            if field == "passages":
+                value = [passage.model_dump() for passage in value]
+            elif field in self.max_tokens:
+                value = self._text(field, value)
+            result_dict[field] = value
+        return result_dict
+
+    def response_to_dict(self, response: SearchResponse) -> Dict[str, Any]:
+        """Convert a search response to a tool response of the selected fields."""
+        response_dict: Dict[str, Any] = {
+            "success": True,
+            "query": response.query,
+            "results": [self.result_to_dict(result) for result in response.results],
+            "total_results": response.total_results
+        }
+        for field in self.response_fields:
+            value = getattr(response, field)
+            if value:
+                response_dict[field] = self._text(field, value) if field == "answer" else value
+        return response_dict
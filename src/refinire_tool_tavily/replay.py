@@ -0,0 +1,276 @@
+"""Record-and-replay transport for deterministic load testing.
+
+Recorded journals are plain text files with one record per line::
+
+    <sha256 request key>\\t{"p": params, "r": response, "t": elapsed}
+
+Lookups go through a companion ``.idx`` file holding an open-addressing hash
+table that is memory-mapped on replay, so each request costs a constant number
+of probes plus one positioned read of its own record.
+"""
+
+import atexit
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .utils import canonical_request_key
+
+
+logger = logging.getLogger(__name__)
+
+_INDEX_MAGIC = b"RTVIDX1\0"
+_HEADER = struct.Struct("<8sQQ")  # magic, journal size, slot count
+_SLOT = struct.Struct("<QQI")  # key prefix, record offset + 1, record length
+_KEY_LENGTH = 64
+
+
+class ReplayMissError(LookupError):
+    """Raised when a replayed request was never recorded."""
+    pass
+
+
+def _index_path(journal_path: Path) -> Path:
+    return journal_path.with_name(journal_path.name + ".idx")
+
+
+def _key_prefix(key: str) -> int:
+    return int(key[:16], 16)
+
+
+def build_replay_index(journal_path: Union[str, Path]) -> Path:
+    """Build the hash index for a recorded journal.
+
+    The journal is streamed twice (once to count records, once to insert them)
+    so memory use stays constant regardless of the journal size. Later records
+    win when the same request was recorded more than once.
+
+    Args:
+        journal_path: Path to the recorded journal
+
+    Returns:
+        Path of the written index file
+    """
+    journal_path = Path(journal_path)
+    index_path = _index_path(journal_path)
+
+    with open(journal_path, "rb") as journal:
+        count = sum(1 for _ in journal)
+
+    slot_count = 8
+    while slot_count < count * 2:
+        slot_count *= 2
+    mask = slot_count - 1
+
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp_path, "w+b") as index:
+        index.truncate(_HEADER.size + slot_count * _SLOT.size)
+        with mmap.mmap(index.fileno(), 0) as table, open(journal_path, "rb") as journal:
+            offset = 0
+            for line in journal:
+                if len(line) > _KEY_LENGTH and line[_KEY_LENGTH:_KEY_LENGTH + 1] == b"\t":
+                    prefix = _key_prefix(line[:_KEY_LENGTH].decode("ascii"))
+                    slot = prefix & mask
+                    while True:
+                        position = _HEADER.size + slot * _SLOT.size
+                        existing, stored, _ = _SLOT.unpack_from(table, position)
+                        if stored == 0 or existing == prefix:
+                            _SLOT.pack_into(table, position, prefix, offset + 1, len(line))
+                            break
+                        slot = (slot + 1) & mask
+                offset += len(line)
+            _HEADER.pack_into(table, 0, _INDEX_MAGIC, offset, slot_count)
+            table.flush()
+    os.replace(tmp_path, index_path)
+
+    logger.info(f"Built replay index for {count} records at {index_path}")
+    return index_path
+
+
+class ReplayJournalWriter:
+    """Append-only writer for recorded request/response pairs."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize journal writer.
+
+        Args:
+            path: Journal file path. Existing journals are appended to.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def append(self, params: Dict[str, Any], response: Dict[str, Any], elapsed: float) -> None:
+        """Append a single request/response pair to the journal."""
+        key = canonical_request_key(params)
+        body = json.dumps(
+            {"p": params, "r": response, "t": round(elapsed, 6)},
+            separators=(",", ":"),
+            ensure_ascii=False
+        )
+        line = f"{key}\t{body}\n".encode("utf-8")
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the journal and rebuild its index."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._file.close()
+        build_replay_index(self.path)
+
+
+class ReplayJournalReader:
+    """Random-access reader for recorded journals."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize journal reader.
+
+        The index is rebuilt automatically if it is missing or was built for a
+        different journal size.
+
+        Args:
+            path: Journal file path
+        """
+        self.path = Path(path)
+        index_path = _index_path(self.path)
+        journal_size = self.path.stat().st_size
+
+        if not index_path.exists() or self._indexed_size(index_path) != journal_size:
+            build_replay_index(self.path)
+
+        self._fd = os.open(self.path, os.O_RDONLY)
+        with open(index_path, "rb") as index:
+            self._table = mmap.mmap(index.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, self._slot_count = _HEADER.unpack_from(self._table, 0)
+        self._mask = self._slot_count - 1
+
+    @staticmethod
+    def _indexed_size(index_path: Path) -> Optional[int]:
+        with open(index_path, "rb") as index:
+            header = index.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            return None
+        magic, journal_size, _ = _HEADER.unpack(header)
+        return journal_size if magic == _INDEX_MAGIC else None
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a recorded record by canonical request key.
+
+        Args:
+            key: Canonical request key
+
+        Returns:
+            Record dictionary with ``p``, ``r`` and ``t`` entries, or None
+        """
+        prefix = _key_prefix(key)
+        slot = prefix & self._mask
+        for _ in range(self._slot_count):
+            existing, stored, length = _SLOT.unpack_from(self._table, _HEADER.size + slot * _SLOT.size)
+            if stored == 0:
+                return None
+            if existing == prefix:
+                line = os.pread(self._fd, length, stored - 1)
+                if line[:_KEY_LENGTH].decode("ascii") != key:
+                    return None
+                return json.loads(line[_KEY_LENGTH + 1:])
+            slot = (slot + 1) & self._mask
+        return None
+
+    def close(self) -> None:
+        """Release the index mapping and journal descriptor."""
+        self._table.close()
+        os.close(self._fd)
+
+
+class RecordingClient:
+    """Client wrapper that records every search to a journal."""
+
+    def __init__(self, client: Any, journal: ReplayJournalWriter):
+        """Initialize recording client.
+
+        Args:
+            client: Underlying client exposing ``search(**params)``
+            journal: Journal writer receiving request/response pairs
+        """
+        self.client = client
+        self.journal = journal
+
+    def search(self, **params: Any) -> Dict[str, Any]:
+        """Perform a search through the wrapped client and record it."""
+        start_time = time.perf_counter()
+        response = self.client.search(**params)
+        self.journal.append(params, response, time.perf_counter() - start_time)
+        return response
+
+
+class ReplayClient:
+    """Client stand-in that serves recorded responses locally."""
+
+    def __init__(self, journal: ReplayJournalReader, latency_scale: Optional[float] = None):
+        """Initialize replay client.
+
+        Args:
+            journal: Journal reader holding recorded responses
+            latency_scale: If set, sleep for the recorded latency multiplied by
+                this factor before returning (1.0 reproduces recorded timings)
+        """
+        self.journal = journal
+        self.latency_scale = latency_scale
+
+    def search(self, **params: Any) -> Dict[str, Any]:
+        """Serve a recorded response for the given search parameters.
+
+        Raises:
+            ReplayMissError: If the request is not in the journal
+        """
+        record = self.journal.lookup(canonical_request_key(params))
+        if record is None:
+            raise ReplayMissError(f"No recorded response for query: {params.get('query')}")
+        if self.latency_scale:
+            time.sleep(record.get("t", 0.0) * self.latency_scale)
+        return record["r"]
+
+
+_writers: Dict[Path, ReplayJournalWriter] = {}
+_readers: Dict[Path, ReplayJournalReader] = {}
+_registry_lock = threading.Lock()
+
+
+def get_journal_writer(path: Union[str, Path]) -> ReplayJournalWriter:
+    """Return the process-wide writer for a journal path.
+
+    Writers are shared so that every ``TavilyService`` instance recording to
+    the same path appends to one file, and they are closed at interpreter exit
+    so the index is always rebuilt.
+    """
+    resolved = Path(path).resolve()
+    with _registry_lock:
+        writer = _writers.get(resolved)
+        if writer is None or writer._closed:
+            writer = ReplayJournalWriter(resolved)
+            _writers[resolved] = writer
+            atexit.register(writer.close)
+        return writer
+
+
+def get_journal_reader(path: Union[str, Path]) -> ReplayJournalReader:
+    """Return the process-wide reader for a journal path."""
+    resolved = Path(path).resolve()
+    with _registry_lock:
+        reader = _readers.get(resolved)
+        if reader is None:
+            reader = ReplayJournalReader(resolved)
+            _readers[resolved] = reader
+        return reader
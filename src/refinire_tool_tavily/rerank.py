@@ -0,0 +1,141 @@
+"""Local BM25 re-ranking of search results.
+
+Only query terms contribute to BM25, so documents are reduced to a
+documents x query-terms count matrix (counted with C-level string search rather
+than full tokenization) and all scoring is done on that matrix.
+NumPy is used for the scoring when it is installed (``pip install
+refinire-tool-tavily[rerank]``); otherwise an equivalent pure Python path runs.
+"""
+
+import math
+import re
+from typing import List, Sequence
+
+from .models import SearchResult
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in",
+    "is", "it", "of", "on", "or", "that", "the", "this", "to", "was", "what",
+    "when", "where", "which", "who", "why", "with",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens, dropping stopwords."""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def query_terms(query: str) -> List[str]:
+    """Return the unique query tokens in order of first appearance."""
+    return list(dict.fromkeys(tokenize(query)))
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def count_term(text: str, term: str) -> int:
+    """Count whole-word occurrences of a term in lowercased text.
+
+    Candidates are located with ``str.find``, which runs in C, and only actual
+    occurrences are checked for word boundaries.
+    """
+    count = 0
+    length = len(term)
+    start = text.find(term)
+    while start != -1:
+        end = start + length
+        if (start == 0 or not _is_word_char(text[start - 1])) and (end == len(text) or not _is_word_char(text[end])):
+            count += 1
+        start = text.find(term, end)
+    return count
+
+
+def bm25_from_counts(tf, lengths, k1: float = BM25_K1, b: float = BM25_B):
+    """Score a documents x terms count matrix with BM25.
+
+    Args:
+        tf: NumPy array of shape (documents, terms) with term frequencies
+        lengths: NumPy array of document lengths. Only ratios to the average
+            matter, so character counts serve as well as token counts.
+
+    Returns:
+        NumPy array of per-document scores
+    """
+    documents = tf.shape[0]
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((documents - df + 0.5) / (df + 0.5))
+    average_length = lengths.mean() if documents and lengths.mean() > 0 else 1.0
+    norm = k1 * (1 - b + b * lengths / average_length)
+    return (idf * tf * (k1 + 1) / (tf + norm[:, None])).sum(axis=1)
+
+
+def _bm25_python(tf: List[List[int]], lengths: List[int], k1: float, b: float) -> List[float]:
+    documents = len(tf)
+    terms = len(tf[0]) if tf else 0
+    df = [sum(1 for row in tf if row[column]) for column in range(terms)]
+    idf = [math.log1p((documents - df[column] + 0.5) / (df[column] + 0.5)) for column in range(terms)]
+    average_length = (sum(lengths) / documents) or 1.0
+    scores = []
+    for row, length in zip(tf, lengths):
+        norm = k1 * (1 - b + b * length / average_length)
+        scores.append(sum(idf[c] * row[c] * (k1 + 1) / (row[c] + norm) for c in range(terms)))
+    return scores
+
+
+def bm25_scores(query: str, documents: Sequence[str], k1: float = BM25_K1, b: float = BM25_B) -> List[float]:
+    """Score documents against a query with BM25.
+
+    Args:
+        query: Query text
+        documents: Document texts
+
+    Returns:
+        One score per document (0.0 when no query term occurs)
+    """
+    terms = query_terms(query)
+    if not terms or not documents:
+        return [0.0] * len(documents)
+    lowered = [document.lower() for document in documents]
+    tf = [[count_term(text, term) for term in terms] for text in lowered]
+    lengths = [len(text) for text in lowered]
+
+    if np is None:
+        return _bm25_python(tf, lengths, k1, b)
+    return bm25_from_counts(np.asarray(tf, dtype=float), np.asarray(lengths, dtype=float), k1, b).tolist()
+
+
+def rerank_results(query: str, results: Sequence[SearchResult], use_raw_content: bool = True) -> List[SearchResult]:
+    """Re-order search results by local BM25 relevance.
+
+    Each result is scored on its title, content and (optionally) raw content.
+    The sort is stable, so results with equal scores keep Tavily's order.
+    Tavily's ``score`` is left untouched; the BM25 score is stored in
+    ``rerank_score``.
+
+    Args:
+        query: Search query
+        results: Search results in Tavily's order
+        use_raw_content: Include ``raw_content`` in the scored text
+
+    Returns:
+        Re-ordered results
+    """
+    documents = [
+        " ".join(filter(None, [result.title, result.content, result.raw_content if use_raw_content else None]))
+        for result in results
+    ]
+    scores = bm25_scores(query, documents)
+    order = sorted(range(len(results)), key=lambda index: -scores[index])
+    return [results[index].model_copy(update={"rerank_score": scores[index]}) for index in order]
@@ -0,0 +1,476 @@
+"""Append-only binary journal of search responses.
+
+Layout of a journal directory:
+
+- ``segment-<first seq>.log``: records of ``<length:uint32><flags:uint8>
+  <crc32:uint32>`` followed by the JSON-encoded ``SearchResponse``
+  (zlib-compressed when flag bit 0 is set). A new segment is started when the
+  current one would exceed the segment size.
+- ``journal.idx``: one fixed-size entry per sequence number holding the first
+  sequence number of its segment, the record offset and length, and a 64-bit
+  hash of the query. Entry ``n`` is at byte ``n * 28``, so it is found in O(1)
+  through a memory map.
+- ``journal.qidx``: the ``(query hash, sequence number)`` pairs of the first
+  ``covered`` index entries, sorted, after a header holding ``covered``.
+  Responses to a query are found by bisecting it through a memory map. The
+  writer rewrites it, merging in the newer entries, whenever it starts a new
+  segment and when it is closed; readers keep only the entries after
+  ``covered`` in memory.
+
+Writers queue responses and a background thread encodes and appends them, so
+callers never wait for disk I/O. On open, index entries pointing past the end
+of their segment are dropped and records written after the last index entry
+are indexed again; a torn last record is truncated.
+"""
+
+import atexit
+import hashlib
+import heapq
+import json
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .models import SearchResponse
+
+
+logger = logging.getLogger(__name__)
+
+_RECORD = struct.Struct("<IBI")  # payload length, flags, crc32 of payload
+_ENTRY = struct.Struct("<QQIQ")  # segment first seq, record offset, record length, query hash
+_FLAG_ZLIB = 1
+_INDEX_FILE = "journal.idx"
+_QUERY_HEADER = struct.Struct("<4sHQ")  # magic, version, index entries covered
+_QUERY_ENTRY = struct.Struct("<QQ")  # query hash, sequence number
+_QUERY_MAGIC = b"TVQX"
+_QUERY_VERSION = 1
+_QUERY_INDEX_FILE = "journal.qidx"
+# Query index entries read at a time while merging
+_QUERY_CHUNK = 65536
+
+# Size at which a new segment is started
+SEGMENT_BYTES = 64 * 1024 * 1024
+# Responses that may wait for the writer before new ones are dropped
+QUEUE_SIZE = 1024
+
+
+def query_hash(query: str) -> int:
+    """Return the 64-bit hash under which responses to a query are indexed."""
+    return int.from_bytes(hashlib.blake2b(query.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _segment_path(path: Path, first_seq: int) -> Path:
+    return path / f"segment-{first_seq:012d}.log"
+
+
+def _decode(header: bytes, payload: bytes) -> Dict[str, Any]:
+    _, flags, _ = _RECORD.unpack(header)
+    if flags & _FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return json.loads(payload)
+
+
+def _scan_records(segment: Path, offset: int) -> Iterator[Tuple[int, int, bytes, bytes]]:
+    """Yield (offset, length, header, payload) of the intact records from an offset."""
+    with open(segment, "rb") as f:
+        f.seek(offset)
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            length, _, crc = _RECORD.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return
+            yield offset, _RECORD.size + length, header, payload
+            offset += _RECORD.size + length
+
+
+class _QueryIndex:
+    """Sorted ``(query hash, sequence number)`` pairs, bisected through a memory map."""
+
+    def __init__(self, path: Path):
+        self.covered = 0
+        self.size = 0
+        self.inode: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        try:
+            with open(path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                if stat.st_size < _QUERY_HEADER.size:
+                    return
+                index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return
+        magic, version, covered = _QUERY_HEADER.unpack_from(index_map, 0)
+        if magic != _QUERY_MAGIC or version != _QUERY_VERSION:
+            index_map.close()
+            logger.warning(f"Ignoring unreadable response journal query index {path}")
+            return
+        self._map = index_map
+        self.covered = covered
+        self.size = (stat.st_size - _QUERY_HEADER.size) // _QUERY_ENTRY.size
+        self.inode = stat.st_ino
+
+    def _entry(self, position: int) -> Tuple[int, int]:
+        return _QUERY_ENTRY.unpack_from(self._map, _QUERY_HEADER.size + position * _QUERY_ENTRY.size)
+
+    def find(self, digest: int) -> List[int]:
+        """Return the sequence numbers indexed under a query hash, in order."""
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if self._entry(middle)[0] < digest:
+                low = middle + 1
+            else:
+                high = middle
+        seqs = []
+        while low < self.size:
+            entry_hash, seq = self._entry(low)
+            if entry_hash != digest:
+                break
+            seqs.append(seq)
+            low += 1
+        return seqs
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for start in range(0, self.size, _QUERY_CHUNK):
+            offset = _QUERY_HEADER.size + start * _QUERY_ENTRY.size
+            chunk = self._map[offset:offset + min(_QUERY_CHUNK, self.size - start) * _QUERY_ENTRY.size]
+            yield from _QUERY_ENTRY.iter_unpack(chunk)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class ResponseJournalWriter:
+    """Background writer of the response journal.
+
+    ``append`` only enqueues; when the bounded queue is full the response is
+    dropped and counted in ``dropped``.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        segment_bytes: int = SEGMENT_BYTES,
+        compress: bool = False,
+        queue_size: int = QUEUE_SIZE
+    ):
+        """Open or create a response journal for writing.
+
+        Args:
+            path: Journal directory
+            segment_bytes: Size at which a new segment is started
+            compress: Compress records with zlib
+            queue_size: Maximum responses waiting for the writer thread
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.compress = compress
+        self.dropped = 0
+
+        self._index = open(self.path / _INDEX_FILE, "a+b")
+        self._recover()
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="tavily-response-journal", daemon=True)
+        self._thread.start()
+
+    def _recover(self) -> None:
+        index_size = os.fstat(self._index.fileno()).st_size
+        entries = index_size // _ENTRY.size
+        with open(self.path / _INDEX_FILE, "rb") as f:
+            # Drop entries whose record did not reach its segment
+            while entries:
+                f.seek((entries - 1) * _ENTRY.size)
+                first_seq, offset, length, _ = _ENTRY.unpack(f.read(_ENTRY.size))
+                segment = _segment_path(self.path, first_seq)
+                if segment.exists() and segment.stat().st_size >= offset + length:
+                    break
+                entries -= 1
+        self._index.truncate(entries * _ENTRY.size)
+
+        if entries:
+            first_seq, offset, length, _ = _ENTRY.unpack(self._read_entry(entries - 1))
+            self._segment_seq, end = first_seq, offset + length
+        else:
+            self._segment_seq, end = 0, 0
+        self._seq = entries
+
+        # Index records written after the last index entry, including those of
+        # segments started for them, and truncate a torn record
+        for path in sorted(self.path.glob("segment-*.log")):
+            segment_seq = int(path.stem.split("-")[1])
+            if segment_seq < self._segment_seq:
+                continue
+            if segment_seq > self._segment_seq:
+                if segment_seq != self._seq:
+                    logger.warning(f"Ignoring response journal segment {path} that does not follow the index")
+                    continue
+                self._segment_seq, end = segment_seq, 0
+            for offset, length, header, payload in _scan_records(path, end):
+                self._write_entry(offset, length, _decode(header, payload).get("query", ""))
+                end = offset + length
+            with open(path, "r+b") as f:
+                f.truncate(end)
+        self._index.flush()
+        self._segment = open(_segment_path(self.path, self._segment_seq), "a+b")
+
+        query_index = _QueryIndex(self.path / _QUERY_INDEX_FILE)
+        stale = query_index.covered > self._seq
+        query_index.close()
+        if stale:
+            # It indexes entries that were dropped; rebuilt when next written
+            (self.path / _QUERY_INDEX_FILE).unlink()
+
+    def _read_entry(self, seq: int) -> bytes:
+        self._index.seek(seq * _ENTRY.size)
+        return self._index.read(_ENTRY.size)
+
+    def _write_entry(self, offset: int, length: int, query: str) -> None:
+        self._index.write(_ENTRY.pack(self._segment_seq, offset, length, query_hash(query)))
+        self._seq += 1
+
+    def _write_query_index(self) -> None:
+        """Rewrite the query index to cover every index entry written so far."""
+        path = self.path / _QUERY_INDEX_FILE
+        previous = _QueryIndex(path)
+        try:
+            if previous.covered == self._seq:
+                return
+            self._index.flush()
+            self._index.seek(previous.covered * _ENTRY.size)
+            entries = self._index.read((self._seq - previous.covered) * _ENTRY.size)
+            new = sorted(
+                (entry[3], seq) for seq, entry in enumerate(_ENTRY.iter_unpack(entries), previous.covered)
+            )
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(_QUERY_HEADER.pack(_QUERY_MAGIC, _QUERY_VERSION, self._seq))
+                # Both runs are sorted, so they are merged in one streaming pass
+                for entry in heapq.merge(previous, new):
+                    f.write(_QUERY_ENTRY.pack(*entry))
+            os.replace(tmp_path, path)
+        finally:
+            previous.close()
+
+    def append(self, response: SearchResponse) -> None:
+        """Queue a response for the journal without blocking."""
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait(response)
+        except queue.Full:
+            self.dropped += 1
+            logger.debug("Response journal queue full, dropped a response")
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait until every queued response has been written."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self) -> None:
+        """Write queued responses, stop the writer thread and close the files."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            self._write_query_index()
+        except OSError as e:
+            logger.warning(f"Could not write the response journal query index: {str(e)}")
+        self._segment.close()
+        self._index.close()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            try:
+                self._write(item)
+            except Exception as e:
+                logger.error(f"Response journal write failed: {str(e)}")
+
+    def _write(self, response: SearchResponse) -> None:
+        payload = response.model_dump_json().encode("utf-8")
+        flags = 0
+        if self.compress:
+            payload = zlib.compress(payload)
+            flags |= _FLAG_ZLIB
+        record = _RECORD.pack(len(payload), flags, zlib.crc32(payload)) + payload
+
+        offset = self._segment.seek(0, os.SEEK_END)
+        if offset and offset + len(record) > self.segment_bytes:
+            self._write_query_index()
+            self._segment.close()
+            self._segment_seq = self._seq
+            self._segment = open(_segment_path(self.path, self._segment_seq), "a+b")
+            offset = 0
+        self._segment.write(record)
+        self._segment.flush()
+        # The index entry is written after its record, so it never points at missing data
+        self._write_entry(offset, len(record), response.query)
+        self._index.flush()
+
+
+class ResponseJournalReader:
+    """Random-access and streaming reader of a response journal.
+
+    The index is memory-mapped and re-mapped when the journal has grown, so a
+    reader can follow a journal that is still being written. Query lookups
+    bisect the memory-mapped query index and check the few newer entries it
+    does not cover yet, which are the only ones kept in memory.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Open a response journal for reading.
+
+        Args:
+            path: Journal directory
+        """
+        self.path = Path(path)
+        self._index_file = open(self.path / _INDEX_FILE, "rb")
+        self._map: Optional[mmap.mmap] = None
+        self._entries = 0
+        self._query_index = _QueryIndex(self.path / _QUERY_INDEX_FILE)
+        self._recent_by_query: Dict[int, List[int]] = {}
+        self._segments: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        self._refresh()
+        return self._entries
+
+    def _refresh(self) -> None:
+        with self._lock:
+            entries = os.fstat(self._index_file.fileno()).st_size // _ENTRY.size
+            try:
+                query_inode: Optional[int] = os.stat(self.path / _QUERY_INDEX_FILE).st_ino
+            except FileNotFoundError:
+                query_inode = None
+            if entries == self._entries and query_inode == self._query_index.inode:
+                return
+            if entries != self._entries:
+                if self._map is not None:
+                    self._map.close()
+                self._map = mmap.mmap(self._index_file.fileno(), entries * _ENTRY.size, access=mmap.ACCESS_READ)
+
+            if query_inode != self._query_index.inode:
+                # The writer replaced the query index; keep only what it does not cover
+                self._query_index.close()
+                self._query_index = _QueryIndex(self.path / _QUERY_INDEX_FILE)
+                self._recent_by_query = {}
+                start = self._query_index.covered
+            else:
+                start = max(self._entries, self._query_index.covered)
+            for seq in range(start, entries):
+                self._recent_by_query.setdefault(_ENTRY.unpack_from(self._map, seq * _ENTRY.size)[3], []).append(seq)
+            self._entries = entries
+
+    def _entry(self, seq: int) -> Tuple[int, int, int, int]:
+        if seq >= self._entries:
+            self._refresh()
+        if not 0 <= seq < self._entries:
+            raise IndexError(f"No journal record {seq}")
+        return _ENTRY.unpack_from(self._map, seq * _ENTRY.size)
+
+    def _segment_fd(self, first_seq: int) -> int:
+        with self._lock:
+            segment = self._segments.get(first_seq)
+            if segment is None:
+                segment = self._segments[first_seq] = open(_segment_path(self.path, first_seq), "rb")
+            return segment.fileno()
+
+    def get(self, seq: int) -> SearchResponse:
+        """Return the response with a sequence number.
+
+        Raises:
+            IndexError: If no record has this sequence number
+        """
+        first_seq, offset, length, _ = self._entry(seq)
+        record = os.pread(self._segment_fd(first_seq), length, offset)
+        return SearchResponse.model_validate(_decode(record[:_RECORD.size], record[_RECORD.size:]))
+
+    def find(self, query: str) -> List[int]:
+        """Return the sequence numbers of the responses to a query, oldest first."""
+        self._refresh()
+        digest = query_hash(query)
+        with self._lock:
+            return self._query_index.find(digest) + self._recent_by_query.get(digest, [])
+
+    def iter_responses(self, start: int = 0) -> Iterator[Tuple[int, SearchResponse]]:
+        """Stream responses in sequence order from a sequence number.
+
+        Segments are read record by record through a buffered file, never
+        loaded whole.
+
+        Yields:
+            Tuples of (sequence number, response)
+        """
+        self._refresh()
+        seq = start
+        while seq < self._entries:
+            first_seq, offset, _, _ = self._entry(seq)
+            for _, _, header, payload in _scan_records(_segment_path(self.path, first_seq), offset):
+                if seq >= self._entries:
+                    return
+                yield seq, SearchResponse.model_validate(_decode(header, payload))
+                seq += 1
+            # Continue with the next segment, which starts at the current sequence number
+            self._refresh()
+
+    def close(self) -> None:
+        """Release the index map and segment files."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._query_index.close()
+            for segment in self._segments.values():
+                segment.close()
+            self._segments = {}
+            self._index_file.close()
+
+
+_default_writer: Optional[ResponseJournalWriter] = None
+_default_writer_lock = threading.Lock()
+
+
+def get_response_journal() -> Optional[ResponseJournalWriter]:
+    """Return the process-wide response journal, or None when it is not configured.
+
+    The journal is written to REFINIRE_TOOL_TAVILY_JOURNAL_PATH, rotated at
+    REFINIRE_TOOL_TAVILY_JOURNAL_SEGMENT_MB and compressed when
+    REFINIRE_TOOL_TAVILY_JOURNAL_COMPRESS is true. It is closed at exit.
+    """
+    global _default_writer
+    path = os.getenv("REFINIRE_TOOL_TAVILY_JOURNAL_PATH")
+    if not path:
+        return None
+    with _default_writer_lock:
+        if _default_writer is None or _default_writer._closed:
+            segment_mb = float(os.getenv("REFINIRE_TOOL_TAVILY_JOURNAL_SEGMENT_MB", "64") or 64)
+            compress = os.getenv("REFINIRE_TOOL_TAVILY_JOURNAL_COMPRESS", "false").lower() == "true"
+            _default_writer = ResponseJournalWriter(path, segment_bytes=int(segment_mb * 1024 * 1024), compress=compress)
+            atexit.register(_default_writer.close)
+        return _default_writer
@@ -0,0 +1,178 @@
+"""Priority scheduling of searches from interactive and background callers."""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from .metrics import ServiceMetrics, get_metrics
+from .service import TavilyServiceError
+
+
+T = TypeVar("T")
+
+# Priority classes, most urgent first
+PRIORITY_CLASSES = ("interactive", "batch", "background")
+# Searches that may wait per class before new ones are shed (None for no bound)
+MAX_QUEUE = {"interactive": None, "batch": 64, "background": 8}
+# Seconds a search may wait per class before it is shed (None for no bound)
+MAX_WAIT = {"interactive": None, "batch": 60.0, "background": 5.0}
+
+
+class SchedulerOverloadError(TavilyServiceError):
+    """Raised when a low-priority search is shed under load."""
+    pass
+
+
+class _Waiter:
+    """A queued search waiting to be granted a slot."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+
+
+class SearchScheduler:
+    """Runs searches in a fixed number of slots, by priority class.
+
+    A free slot always goes to the most urgent class with waiting searches,
+    so interactive searches overtake queued batch and background work. Within
+    a class, tenants take turns, so one tenant's burst cannot starve the
+    others. Batch and background searches are shed when their class queue is
+    full or they waited too long; interactive searches are never shed.
+    """
+
+    def __init__(
+        self,
+        slots: int = 4,
+        max_queue: Optional[Dict[str, Optional[int]]] = None,
+        max_wait: Optional[Dict[str, Optional[float]]] = None,
+        metrics: Optional[ServiceMetrics] = None
+    ):
+        """Initialize search scheduler.
+
+        Args:
+            slots: Searches run at the same time
+            max_queue: Queue depth per class before new searches are shed
+                (defaults to ``MAX_QUEUE``)
+            max_wait: Seconds per class a search may wait before it is shed
+                (defaults to ``MAX_WAIT``)
+            metrics: Metrics receiving queue depth, wait time and shed counts
+                per class (defaults to the process-wide metrics)
+        """
+        self.slots = slots
+        self.max_queue = {**MAX_QUEUE, **(max_queue or {})}
+        self.max_wait = {**MAX_WAIT, **(max_wait or {})}
+        self.metrics = metrics if metrics is not None else get_metrics()
+
+        self._running = 0
+        self._queues: Dict[str, "OrderedDict[str, Deque[_Waiter]]"] = {
+            priority: OrderedDict() for priority in PRIORITY_CLASSES
+        }
+        self._depths = {priority: 0 for priority in PRIORITY_CLASSES}
+        self._lock = threading.Lock()
+
+    def queue_depth(self, priority: str) -> int:
+        """Number of searches of a class waiting for a slot."""
+        with self._lock:
+            return self._depths[priority]
+
+    def run(self, search: Callable[[], T], priority: str = "interactive", tenant: Optional[str] = None) -> T:
+        """Run a search once a slot is granted to it.
+
+        Args:
+            search: Callable performing the search
+            priority: Priority class, one of ``PRIORITY_CLASSES``
+            tenant: Tenant or caller tag sharing its class fairly with others
+
+        Returns:
+            The search's return value
+
+        Raises:
+            ValueError: If the priority class is unknown
+            SchedulerOverloadError: If the search is shed
+        """
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority class: {priority} (expected one of {', '.join(PRIORITY_CLASSES)})")
+        start = time.perf_counter()
+        self._acquire(priority, tenant or "default")
+        self.metrics.observe(f"scheduler.{priority}.wait", time.perf_counter() - start)
+        self.metrics.increment(f"scheduler.{priority}.started")
+        try:
+            return search()
+        finally:
+            self._release()
+
+    def _acquire(self, priority: str, tenant: str) -> None:
+        with self._lock:
+            if self._running < self.slots and not any(self._depths[p] for p in self._queued_ahead(priority)):
+                self._running += 1
+                return
+            limit = self.max_queue[priority]
+            if limit is not None and self._depths[priority] >= limit:
+                self._shed(priority, "queue full")
+            waiter = _Waiter()
+            self._queues[priority].setdefault(tenant, deque()).append(waiter)
+            self._set_depth(priority, 1)
+
+        if waiter.event.wait(self.max_wait[priority]):
+            return
+        with self._lock:
+            if waiter.granted:
+                return
+            waiters = self._queues[priority][tenant]
+            waiters.remove(waiter)
+            if not waiters:
+                del self._queues[priority][tenant]
+            self._set_depth(priority, -1)
+            self._shed(priority, "waited too long")
+
+    def _queued_ahead(self, priority: str) -> Tuple[str, ...]:
+        """Classes whose waiting searches a new search of a class queues behind."""
+        return PRIORITY_CLASSES[:PRIORITY_CLASSES.index(priority) + 1]
+
+    def _shed(self, priority: str, reason: str) -> None:
+        self.metrics.increment(f"scheduler.{priority}.shed")
+        raise SchedulerOverloadError(f"Search scheduler overloaded, {priority} search shed: {reason}")
+
+    def _set_depth(self, priority: str, change: int) -> None:
+        self._depths[priority] += change
+        self.metrics.set_gauge(f"scheduler.{priority}.queue_depth", self._depths[priority])
+
+    def _release(self) -> None:
+        with self._lock:
+            for priority in PRIORITY_CLASSES:
+                tenants = self._queues[priority]
+                if not tenants:
+                    continue
+                # Serve the tenant at the front and move it to the back
+                tenant, waiters = tenants.popitem(last=False)
+                waiter = waiters.popleft()
+                if waiters:
+                    tenants[tenant] = waiters
+                self._set_depth(priority, -1)
+                waiter.granted = True
+                waiter.event.set()
+                return
+            self._running -= 1
+
+
+_default_scheduler: Optional[SearchScheduler] = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Optional[SearchScheduler]:
+    """Return the process-wide search scheduler, or None when it is disabled.
+
+    The scheduler is enabled by setting REFINIRE_TOOL_TAVILY_SCHEDULER_SLOTS
+    to the number of searches run at the same time.
+    """
+    global _default_scheduler
+    slots = int(os.getenv("REFINIRE_TOOL_TAVILY_SCHEDULER_SLOTS", "0") or 0)
+    if slots <= 0:
+        return None
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = SearchScheduler(slots=slots)
+        return _default_scheduler
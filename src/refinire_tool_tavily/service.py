@@ -1,40 +1,162 @@
 """Tavily service implementation for web search functionality."""
 
+import asyncio
 import os
 import time
 import logging
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, Iterator, List, Optional, Dict, Any, Tuple
+from urllib.parse import urlsplit
 from tavily import TavilyClient
+from tavily.errors import UsageLimitExceededError
 from .models import SearchRequest, SearchResponse, SearchResult
 from .config import check_config
+from .context import format_search_context, iter_context_chunks
+from .dedup import deduplicate_results
+from .domains import DomainPolicy, compile_policy
+from .fanout import fan_out
+from .keys import get_key_pool
+from .limiter import ConcurrencyLimiter, get_concurrency_limiter
+from .local_index import LocalIndex, get_local_index
+from .metrics import ServiceMetrics, get_metrics
+from .normalize import RawContentNormalizer, get_normalizer
+from .passages import extract_passages
+from .planner import LatencyPlanner, get_planner
+from .prefetch import FollowUpPrefetcher, get_prefetcher
+from .progressive import SufficiencyCheck, search_progressive
+from .rerank import rerank_results
+from .breaker import CircuitBreaker, get_circuit_breaker
+from .cache import SearchCache, get_default_cache
+from .replay import RecordingClient, ReplayClient, get_journal_reader, get_journal_writer
+from .sharding import shard_domains, search_sharded
+from .utils import canonical_request_key
 
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on results per Tavily request
+MAX_FETCH_RESULTS = 20
+
 
 class TavilyServiceError(Exception):
     """Custom exception for Tavily service errors."""
     pass
 
 
+class CircuitOpenError(TavilyServiceError):
+    """Raised without calling Tavily while the circuit breaker is open."""
+    
+    def __init__(self, circuit: Dict[str, Any]):
+        super().__init__(f"Circuit breaker is {circuit['state']}; retry after {circuit['retry_after']:.0f}s")
+        self.circuit = circuit
+
+
+class ConcurrencyLimitError(TavilyServiceError):
+    """Raised when no Tavily call slot frees up within the limiter's wait."""
+    pass
+
+
 class TavilyService:
     """Service class for interacting with Tavily API."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        record_path: Optional[str] = None,
+        replay_path: Optional[str] = None,
+        replay_latency_scale: Optional[float] = None,
+        cache: Optional[SearchCache] = None,
+        domain_shard_size: Optional[int] = None,
+        metrics: Optional[ServiceMetrics] = None,
+        sufficiency: Optional[SufficiencyCheck] = None,
+        planner: Optional[LatencyPlanner] = None,
+        local_index: Optional[LocalIndex] = None,
+        local_max_age: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        limiter: Optional[ConcurrencyLimiter] = None,
+        prefetcher: Optional[FollowUpPrefetcher] = None,
+        normalizer: Optional[RawContentNormalizer] = None
+    ):
         """Initialize Tavily service.
         
         Args:
-            api_key: Tavily API key. If not provided, will use TAVILY_API_KEY environment variable.
+            api_key: Tavily API key. If not provided, searches are balanced across the
+                keys in TAVILY_API_KEYS, or use the TAVILY_API_KEY environment variable.
+            record_path: Record every request/response pair to this journal file.
+                Defaults to REFINIRE_TOOL_TAVILY_RECORD_PATH.
+            replay_path: Serve responses from this recorded journal instead of the
+                Tavily API. No API key is needed in replay mode.
+                Defaults to REFINIRE_TOOL_TAVILY_REPLAY_PATH.
+            replay_latency_scale: Reproduce recorded latencies multiplied by this
+                factor while replaying. Defaults to REFINIRE_TOOL_TAVILY_REPLAY_LATENCY_SCALE.
+            cache: Response cache to use. Defaults to the shared cache enabled by
+                REFINIRE_TOOL_TAVILY_CACHE_TTL.
+            domain_shard_size: Split include_domains lists longer than this into
+                shards searched concurrently. Defaults to
+                REFINIRE_TOOL_TAVILY_DOMAIN_SHARD_SIZE (0, sharding disabled).
+            metrics: Metrics recorder. Defaults to the process-wide metrics.
+            sufficiency: Check deciding whether the first pass of a progressive
+                search is enough. Defaults to ``SufficiencyCheck()``.
+            planner: Planner fitting searches to a latency budget. Defaults to the
+                process-wide planner.
+            local_index: Index that retrieved results are added to and that
+                local-first searches are answered from. Defaults to the index
+                enabled by REFINIRE_TOOL_TAVILY_LOCAL_INDEX_PATH.
+            local_max_age: Maximum age in seconds of locally answered results.
+                Defaults to REFINIRE_TOOL_TAVILY_LOCAL_MAX_AGE (86400).
+            breaker: Circuit breaker around Tavily calls. Defaults to the shared
+                breaker enabled by REFINIRE_TOOL_TAVILY_BREAKER_ENABLED.
+            limiter: Adaptive limit on concurrent Tavily calls. Defaults to the
+                shared limiter enabled by REFINIRE_TOOL_TAVILY_MAX_CONCURRENCY.
+            prefetcher: Prefetcher of follow-up questions into the cache. Defaults
+                to the shared prefetcher enabled by REFINIRE_TOOL_TAVILY_PREFETCH_FOLLOW_UPS.
+            normalizer: Normalizer of raw content applied before responses are cached.
+                Defaults to the shared normalizer enabled by
+                REFINIRE_TOOL_TAVILY_NORMALIZE_RAW_CONTENT.
         """
-        # Check configuration if api_key is not provided
-        if not api_key and not check_config():
-            raise TavilyServiceError("Configuration is invalid. Please set up your environment variables.")
+        record_path = record_path or os.getenv("REFINIRE_TOOL_TAVILY_RECORD_PATH") or None
+        replay_path = replay_path or os.getenv("REFINIRE_TOOL_TAVILY_REPLAY_PATH") or None
+        if replay_latency_scale is None and os.getenv("REFINIRE_TOOL_TAVILY_REPLAY_LATENCY_SCALE"):
+            replay_latency_scale = float(os.getenv("REFINIRE_TOOL_TAVILY_REPLAY_LATENCY_SCALE"))
         
-        self.api_key = api_key or os.getenv("TAVILY_API_KEY")
-        if not self.api_key:
-            raise TavilyServiceError("Tavily API key is required. Set TAVILY_API_KEY environment variable or provide api_key parameter.")
+        if replay_path:
+            # Replay mode serves recorded responses locally and never calls the API
+            self.api_key = api_key or os.getenv("TAVILY_API_KEY")
+            self.client = ReplayClient(get_journal_reader(replay_path), latency_scale=replay_latency_scale)
+        else:
+            # Check configuration if api_key is not provided
+            if not api_key and not check_config():
+                raise TavilyServiceError("Configuration is invalid. Please set up your environment variables.")
+            
+            key_pool = None if api_key else get_key_pool()
+            if key_pool is not None:
+                # Searches are balanced across the shared pool of TAVILY_API_KEYS
+                self.api_key = None
+                self.client = key_pool
+            else:
+                self.api_key = api_key or os.getenv("TAVILY_API_KEY")
+                if not self.api_key:
+                    raise TavilyServiceError("Tavily API key is required. Set TAVILY_API_KEY environment variable or provide api_key parameter.")
+                
+                self.client = TavilyClient(api_key=self.api_key)
+        
+        if record_path:
+            self.client = RecordingClient(self.client, get_journal_writer(record_path))
         
-        self.client = TavilyClient(api_key=self.api_key)
+        self.cache = cache if cache is not None else get_default_cache()
+        if domain_shard_size is None:
+            domain_shard_size = int(os.getenv("REFINIRE_TOOL_TAVILY_DOMAIN_SHARD_SIZE", "0") or 0)
+        self.domain_shard_size = domain_shard_size
+        self.metrics = metrics if metrics is not None else get_metrics()
+        self.sufficiency = sufficiency or SufficiencyCheck()
+        self.planner = planner if planner is not None else get_planner()
+        self.local_index = local_index if local_index is not None else get_local_index()
+        if local_max_age is None:
+            local_max_age = float(os.getenv("REFINIRE_TOOL_TAVILY_LOCAL_MAX_AGE", "86400") or 86400)
+        self.local_max_age = local_max_age
+        self.breaker = breaker if breaker is not None else get_circuit_breaker()
+        self.limiter = limiter if limiter is not None else get_concurrency_limiter()
+        self.prefetcher = prefetcher if prefetcher is not None else get_prefetcher()
+        self.normalizer = normalizer if normalizer is not None else get_normalizer()
     
     def search(self, request: SearchRequest) -> SearchResponse:
         """Perform web search using Tavily API.
@@ -48,66 +170,430 @@ class TavilyService:
         Raises:
             TavilyServiceError: If search fails
         """
+        if request.local_first:
+            return self._search_local_first(request)
+        if request.query_variants:
+            return fan_out(request, request.query_variants, self.search)
+        if request.progressive:
+            response = search_progressive(request, self.search, self.sufficiency)
+            self.metrics.increment("progressive.requests")
+            if response.metadata["progressive"]["expanded"]:
+                self.metrics.increment("progressive.expanded")
+            return response
+        if request.latency_budget is not None and request.search_depth is None:
+            decision = self.planner.plan(request)
+            response = self.search(request.model_copy(update={
+                "search_depth": decision["search_depth"],
+                "max_results": decision["max_results"]
+            }))
+            response.metadata["planner"] = decision
+            return response
+        
+        shards = self._domain_shards(request)
+        if len(shards) > 1:
+            search_response = search_sharded(request, shards, self._search_once)
+        else:
+            search_response = self._search_once(request)
+        if request.include_domains:
+            self._record_domain_search(request, search_response, sharded=len(shards) > 1)
+        return search_response
+    
+    def _search_local_first(self, request: SearchRequest) -> SearchResponse:
+        """Answer from the local index when it covers the query, else search Tavily.
+        
+        Local results are used when enough fresh results contain every query
+        term and the request needs nothing only Tavily provides (an answer or
+        raw content). The decision is reported in ``metadata["local"]``.
+        """
+        reasons = []
+        local = None
+        if self.local_index is None:
+            reasons.append("no_index")
+        elif request.include_answer or request.include_raw_content or request.passages:
+            reasons.append("needs_remote_fields")
+        else:
+            local = self.local_index.search(request.query, MAX_FETCH_RESULTS, max_age=self.local_max_age)
+            results = local.results
+            policy = self._domain_policy(request)
+            if policy is not None:
+                results = policy.filter_results(results)
+            local.results = results[:request.max_results]
+            local.total_results = len(local.results)
+            if len(local.results) < request.max_results:
+                reasons.append("too_few_results")
+            if local.metadata["local"]["coverage"] < 1.0:
+                reasons.append("low_coverage")
+        
+        if not reasons:
+            self.metrics.increment("local.hits")
+            local.metadata["local"]["hit"] = True
+            return local
+        
+        self.metrics.increment("local.misses")
+        response = self.search(request.model_copy(update={"local_first": False}))
+        response.metadata["local"] = {"hit": False, "reasons": reasons}
+        return response
+    
+    def _search_once(self, request: SearchRequest) -> SearchResponse:
+        """Perform a single Tavily search for a request."""
         try:
             start_time = time.time()
             
-            # Prepare search parameters
-            search_params = {
-                "query": request.query,
-                "max_results": request.max_results,
-                "include_answer": request.include_answer,
-                "include_raw_content": request.include_raw_content,
-            }
-            
-            # Add domain filters if provided
-            if request.include_domains:
-                search_params["include_domains"] = request.include_domains
-            if request.exclude_domains:
-                search_params["exclude_domains"] = request.exclude_domains
+            search_params = self._build_search_params(request)
             
             logger.info(f"Performing Tavily search for query: {request.query}")
             
             # Execute search
-            response = self.client.search(**search_params)
+            response, stale = self._execute_or_stale(search_params, request.max_results)
             
             search_time = time.time() - start_time
             
-            # Parse results
-            results = []
-            for result in response.get("results", []):
-                search_result = SearchResult(
-                    title=result.get("title", ""),
-                    url=result.get("url", ""),
-                    content=result.get("content", ""),
-                    score=result.get("score"),
-                    raw_content=result.get("raw_content") if request.include_raw_content else None
-                )
-                results.append(search_result)
-            
-            # Build response
-            search_response = SearchResponse(
-                query=request.query,
-                results=results,
-                answer=response.get("answer") if request.include_answer else None,
-                follow_up_questions=response.get("follow_up_questions"),
-                total_results=len(results),
-                search_time=search_time
-            )
+            search_response = self._build_response(request, response, search_time)
+            if stale:
+                search_response.metadata["circuit"] = {"state": self.breaker.state, "stale": True}
             
-            logger.info(f"Search completed successfully. Found {len(results)} results in {search_time:.2f}s")
+            logger.info(f"Search completed successfully. Found {search_response.total_results} results in {search_time:.2f}s")
             
             return search_response
             
+        except TavilyServiceError:
+            raise
         except Exception as e:
             logger.error(f"Tavily search failed: {str(e)}")
             raise TavilyServiceError(f"Search failed: {str(e)}") from e
     
-    def get_search_context(self, query: str, max_results: int = 5) -> str:
+    def _domain_shards(self, request: SearchRequest) -> List[List[str]]:
+        """Split the request's include_domains into shards searched concurrently."""
+        shard_size = request.domain_shard_size
+        if shard_size is None:
+            shard_size = self.domain_shard_size
+        return shard_domains(request.include_domains or [], shard_size)
+    
+    def _record_domain_search(self, request: SearchRequest, response: SearchResponse, sharded: bool) -> None:
+        """Record latency and recall of a domain-restricted search.
+        
+        Sharded and unsharded searches are recorded under separate names so the
+        two can be compared. Without ground truth, recall is approximated by the
+        share of max_results filled and the number of distinct domains returned.
+        """
+        prefix = "domain_search.sharded" if sharded else "domain_search.unsharded"
+        hosts = {urlsplit(result.url).hostname for result in response.results}
+        self.metrics.increment(f"{prefix}.requests")
+        self.metrics.observe(f"{prefix}.latency", response.search_time)
+        self.metrics.observe(f"{prefix}.fill_rate", len(response.results) / request.max_results)
+        self.metrics.observe(f"{prefix}.distinct_domains", len(hosts - {None}))
+    
+    def _build_search_params(self, request: SearchRequest) -> Dict[str, Any]:
+        """Build Tavily client keyword arguments from a search request."""
+        search_params = {
+            "query": request.query,
+            "max_results": self._fetch_count(request),
+            "include_answer": request.include_answer,
+            "include_raw_content": request.include_raw_content or request.passages is not None,
+        }
+        
+        if request.search_depth:
+            search_params["search_depth"] = request.search_depth
+        
+        # Add domain filters if provided
+        if request.include_domains:
+            search_params["include_domains"] = request.include_domains
+        if request.exclude_domains:
+            search_params["exclude_domains"] = request.exclude_domains
+        
+        return search_params
+    
+    def _fetch_count(self, request: SearchRequest) -> int:
+        """Number of results to request so post-processing can fill max_results."""
+        overfetch = request.overfetch
+        if overfetch is None:
+            overfetch = (request.max_results + 1) // 2 if request.deduplicate else 0
+        return min(MAX_FETCH_RESULTS, request.max_results + overfetch)
+    
+    def _post_process(
+        self,
+        request: SearchRequest,
+        results: List[SearchResult],
+        metadata: Dict[str, Any]
+    ) -> List[SearchResult]:
+        """Apply result-list post-processing stages and trim to max_results."""
+        policy = self._domain_policy(request)
+        if policy is not None:
+            allowed = policy.filter_results(results)
+            metadata["domains_filtered"] = len(results) - len(allowed)
+            results = allowed
+        if request.deduplicate:
+            deduplicated = deduplicate_results(results)
+            if len(deduplicated) < len(results):
+                logger.info(f"Removed {len(results) - len(deduplicated)} duplicate results")
+            metadata["duplicates_removed"] = len(results) - len(deduplicated)
+            results = deduplicated
+        if request.rerank:
+            rerank_start = time.perf_counter()
+            results = rerank_results(request.query, results)
+            metadata["rerank_time"] = time.perf_counter() - rerank_start
+        results = results[:request.max_results]
+        if request.passages:
+            passage_start = time.perf_counter()
+            results = [self._with_passages(request, result) for result in results]
+            metadata["passage_time"] = time.perf_counter() - passage_start
+        return results
+    
+    def _domain_policy(self, request: SearchRequest) -> Optional[DomainPolicy]:
+        """Compiled policy of the request's domain filters, enforced on results locally."""
+        if not request.include_domains and not request.exclude_domains:
+            return None
+        return compile_policy(tuple(request.include_domains or ()), tuple(request.exclude_domains or ()))
+    
+    def _with_passages(self, request: SearchRequest, result: SearchResult) -> SearchResult:
+        """Replace a result's raw content with its top passages when requested."""
+        if not request.passages or result.raw_content is None:
+            return result
+        return result.model_copy(update={
+            "passages": extract_passages(request.query, result.raw_content, request.passages),
+            "raw_content": None
+        })
+    
+    def _needs_full_results(self, request: SearchRequest) -> bool:
+        """Whether post-processing needs the whole result list before yielding."""
+        return (
+            request.deduplicate or request.rerank or request.progressive or request.local_first
+            or bool(request.query_variants)
+            or len(self._domain_shards(request)) > 1
+        )
+    
+    def _execute(self, search_params: Dict[str, Any], requested_results: Optional[int] = None) -> Dict[str, Any]:
+        """Execute a Tavily search, serving it from the cache when possible."""
+        if self.cache is None:
+            return self._call_client(search_params, requested_results)
+        
+        key = canonical_request_key(search_params)
+        response = self.cache.get(key)
+        if response is None:
+            response = self._call_client(search_params, requested_results)
+            self.cache.put(key, response)
+        elif self.prefetcher is not None:
+            self.prefetcher.claim(key)
+        return response
+    
+    def _execute_or_stale(
+        self,
+        search_params: Dict[str, Any],
+        requested_results: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Execute a search, falling back to a stale cached response while the circuit is open.
+        
+        Returns:
+            Tuple of (raw response, whether it is a stale cached response)
+        
+        Raises:
+            CircuitOpenError: If the circuit is open and nothing is cached
+        """
+        try:
+            return self._execute(search_params, requested_results), False
+        except CircuitOpenError:
+            stale = self.cache.get_stale(canonical_request_key(search_params)) if self.cache is not None else None
+            if stale is None:
+                raise
+            self.metrics.increment("circuit.stale_served")
+            return stale, True
+    
+    def _call_client(self, search_params: Dict[str, Any], requested_results: Optional[int] = None) -> Dict[str, Any]:
+        """Call the Tavily client, feeding its latency to the planner and its results to the local index.
+        
+        Raw content is normalized here, so the cache and the local index hold
+        the normalized response.
+        
+        Args:
+            search_params: Tavily client keyword arguments
+            requested_results: The request's max_results, which the planner keys
+                its latencies on; ``max_results`` of the call also counts the
+                overfetch of deduplication (defaults to it)
+        
+        Raises:
+            CircuitOpenError: If the circuit breaker rejects the call
+            ConcurrencyLimitError: If no call slot frees up in time
+        """
+        if self.breaker is not None and not self.breaker.allow():
+            raise CircuitOpenError(self.breaker.snapshot())
+        if self.limiter is not None and not self.limiter.acquire():
+            if self.breaker is not None:
+                # The call is not made, so a half-open probe must not stay reserved
+                self.breaker.cancel()
+            raise ConcurrencyLimitError(f"No Tavily call slot within {self.limiter.max_wait:.0f}s")
+        call_start = time.perf_counter()
+        try:
+            response = self.client.search(**search_params)
+        except Exception as e:
+            latency = time.perf_counter() - call_start
+            if self.limiter is not None:
+                overloaded = isinstance(e, UsageLimitExceededError)
+                self.limiter.release(latency, overloaded=overloaded, failed=not overloaded)
+            if self.breaker is not None:
+                self.breaker.record(latency, failed=True)
+            raise
+        latency = time.perf_counter() - call_start
+        if self.limiter is not None:
+            self.limiter.release(latency)
+        if self.breaker is not None:
+            self.breaker.record(latency)
+        self.planner.observe(
+            search_params.get("search_depth", "basic"),
+            requested_results if requested_results is not None else search_params["max_results"],
+            latency
+        )
+        if self.normalizer is not None:
+            response = self.normalizer.normalize_response(response)
+        if self.local_index is not None:
+            self.local_index.add(response.get("results", []), search_params["query"])
+        return response
+    
+    def _build_response(self, request: SearchRequest, response: Dict[str, Any], search_time: float) -> SearchResponse:
+        """Convert a raw Tavily response into a SearchResponse."""
+        metadata: Dict[str, Any] = {}
+        results = [self._parse_result(request, result) for result in response.get("results", [])]
+        results = self._post_process(request, results, metadata)
+        
+        return SearchResponse(
+            query=request.query,
+            results=results,
+            answer=response.get("answer") if request.include_answer else None,
+            follow_up_questions=response.get("follow_up_questions"),
+            total_results=len(results),
+            search_time=search_time,
+            metadata=metadata
+        )
+    
+    def _parse_result(self, request: SearchRequest, result: Dict[str, Any]) -> SearchResult:
+        """Convert a single raw Tavily result into a SearchResult."""
+        return SearchResult(
+            title=result.get("title", ""),
+            url=result.get("url", ""),
+            content=result.get("content", ""),
+            score=result.get("score"),
+            raw_content=result.get("raw_content") if request.include_raw_content or request.passages else None
+        )
+    
+    def iter_search(self, request: SearchRequest) -> Iterator[SearchResult]:
+        """Perform web search and yield results one at a time.
+        
+        Results are parsed lazily, so the caller can consume the top result
+        before the rest of the response has been converted.
+        
+        Args:
+            request: Search request parameters
+            
+        Yields:
+            Parsed search results in ranking order
+            
+        Raises:
+            TavilyServiceError: If search fails
+        """
+        if self._needs_full_results(request):
+            yield from self.search(request).results
+            return
+        yield from self._iter_parsed(request, self._fetch(request))
+    
+    def _iter_parsed(self, request: SearchRequest, response: Dict[str, Any]) -> Iterator[SearchResult]:
+        """Lazily parse up to max_results results allowed by the request's domain policy."""
+        policy = self._domain_policy(request)
+        count = 0
+        for raw_result in response.get("results", []):
+            if count >= request.max_results:
+                return
+            if policy is not None and not policy.allows_url(raw_result.get("url", "")):
+                continue
+            count += 1
+            yield self._with_passages(request, self._parse_result(request, raw_result))
+    
+    def iter_search_context(self, query: str, max_results: int = 5, max_tokens: Optional[int] = None) -> Iterator[str]:
+        """Yield search context as formatted chunks.
+        
+        Concatenating the chunks gives the same text as ``get_search_context``,
+        but the full string is never built.
+        
+        Args:
+            query: Search query
+            max_results: Maximum number of results to include
+            max_tokens: Approximate token budget for the context (optional)
+            
+        Yields:
+            Formatted context chunks
+        """
+        try:
+            request = SearchRequest(query=query, max_results=max_results, include_answer=True)
+            response = self._fetch(request)
+            raw_results = response.get("results", [])
+            yield from iter_context_chunks(
+                response.get("answer"),
+                (self._parse_result(request, result) for result in raw_results),
+                max_tokens,
+                scores=[result.get("score") for result in raw_results]
+            )
+        except Exception as e:
+            logger.error(f"Failed to get search context: {str(e)}")
+            yield f"Search failed: {str(e)}"
+    
+    async def asearch(self, request: SearchRequest) -> SearchResponse:
+        """Perform web search without blocking the event loop.
+        
+        Args:
+            request: Search request parameters
+            
+        Returns:
+            SearchResponse containing search results and metadata
+            
+        Raises:
+            TavilyServiceError: If search fails
+        """
+        return await asyncio.to_thread(self.search, request)
+    
+    async def aiter_search(self, request: SearchRequest) -> AsyncIterator[SearchResult]:
+        """Async-iterator version of ``iter_search``.
+        
+        The HTTP call runs in a worker thread; results are then parsed and
+        yielded one at a time.
+        """
+        if self._needs_full_results(request):
+            response = await self.asearch(request)
+            for result in response.results:
+                yield result
+            return
+        response = await asyncio.to_thread(self._fetch, request)
+        for result in self._iter_parsed(request, response):
+            yield result
+    
+    async def aiter_search_context(self, query: str, max_results: int = 5, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Async-iterator version of ``iter_search_context``."""
+        chunks = self.iter_search_context(query, max_results, max_tokens)
+        # Producing the first chunk performs the search, so run it off the event loop
+        first = await asyncio.to_thread(next, chunks, None)
+        if first is None:
+            return
+        yield first
+        for chunk in chunks:
+            yield chunk
+    
+    def _fetch(self, request: SearchRequest) -> Dict[str, Any]:
+        """Execute the Tavily call for a request and return the raw response."""
+        try:
+            logger.info(f"Performing Tavily search for query: {request.query}")
+            return self._execute_or_stale(self._build_search_params(request), request.max_results)[0]
+        except TavilyServiceError:
+            raise
+        except Exception as e:
+            logger.error(f"Tavily search failed: {str(e)}")
+            raise TavilyServiceError(f"Search failed: {str(e)}") from e
+    
+    def get_search_context(self, query: str, max_results: int = 5, max_tokens: Optional[int] = None) -> str:
         """Get search context as a formatted string.
         
         Args:
             query: Search query
             max_results: Maximum number of results to include
+            max_tokens: Approximate token budget for the context. The answer and
+                results are truncated at sentence boundaries and low-score results
+                are dropped to fit (optional, unlimited by default)
             
         Returns:
             Formatted search context string
@@ -121,22 +607,7 @@ class TavilyService:
             
             response = self.search(request)
             
-            # Format context
-            context_parts = []
-            
-            if response.answer:
-                context_parts.append(f"Answer: {response.answer}")
-                context_parts.append("")
-            
-            if response.results:
-                context_parts.append("Search Results:")
-                for i, result in enumerate(response.results, 1):
-                    context_parts.append(f"{i}. {result.title}")
-                    context_parts.append(f"   URL: {result.url}")
-                    context_parts.append(f"   Content: {result.content}")
-                    context_parts.append("")
-            
-            return "\n".join(context_parts)
+            return format_search_context(response, max_tokens)
             
         except Exception as e:
             logger.error(f"Failed to get search context: {str(e)}")
@@ -0,0 +1,137 @@
+"""Sharded searches over large include_domains lists."""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .dedup import canonicalize_url
+from .models import SearchRequest, SearchResponse, SearchResult
+
+
+logger = logging.getLogger(__name__)
+
+
+def shard_domains(domains: List[str], shard_size: int) -> List[List[str]]:
+    """Split a domain list into contiguous shards of at most ``shard_size``.
+
+    Shards are balanced rather than leaving a small remainder, and the order of
+    the list is kept, so domains listed together (such as the categories of the
+    tool domain lists) stay in the same shard.
+
+    Args:
+        domains: Domains to split
+        shard_size: Maximum number of domains per shard (0 or less disables sharding)
+
+    Returns:
+        List of shards; a single shard when no split is needed
+    """
+    if shard_size <= 0 or len(domains) <= shard_size:
+        return [list(domains)]
+    shard_count = -(-len(domains) // shard_size)
+    base, extra = divmod(len(domains), shard_count)
+    shards = []
+    start = 0
+    for index in range(shard_count):
+        end = start + base + (1 if index < extra else 0)
+        shards.append(list(domains[start:end]))
+        start = end
+    return shards
+
+
+def _sort_key(request: SearchRequest) -> Callable[[SearchResult], float]:
+    if request.rerank:
+        return lambda result: -(result.rerank_score or 0.0)
+    return lambda result: -(result.score or 0.0)
+
+
+def merge_by_score(request: SearchRequest, responses: List[SearchResponse]) -> List[SearchResult]:
+    """Merge the results of several responses by score.
+
+    Results are ordered by Tavily score, or by BM25 score when the request
+    re-ranks; a page present in several responses is kept once, with its best
+    score.
+
+    Args:
+        request: Search request the responses answer
+        responses: Responses to merge
+
+    Returns:
+        Up to ``request.max_results`` merged results
+    """
+    sort_key = _sort_key(request)
+    merged: Dict[str, SearchResult] = {}
+    for response in responses:
+        for result in response.results:
+            url_key = canonicalize_url(result.url)
+            kept = merged.get(url_key)
+            if kept is None or sort_key(result) < sort_key(kept):
+                merged[url_key] = result
+    return sorted(merged.values(), key=sort_key)[:request.max_results]
+
+
+def search_sharded(
+    request: SearchRequest,
+    shards: List[List[str]],
+    search: Callable[[SearchRequest], SearchResponse]
+) -> SearchResponse:
+    """Search every domain shard concurrently and merge the results by score.
+
+    Each shard is searched for ``request.max_results`` results, so the merged
+    top results are the same as if one list had been ranked across all shards.
+    Results are merged with ``merge_by_score``.
+
+    Args:
+        request: Search request whose ``include_domains`` are sharded
+        shards: Domain shards from ``shard_domains``
+        search: Function performing a single unsharded search
+
+    Returns:
+        Merged SearchResponse. ``metadata["sharding"]["shards"]`` holds the
+        domain count, latency, result count and status of every shard.
+
+    Raises:
+        Exception: The last shard error if every shard failed
+    """
+    start_time = time.time()
+
+    def run(shard: List[str]) -> Tuple[Optional[SearchResponse], Dict[str, Any]]:
+        shard_start = time.perf_counter()
+        entry: Dict[str, Any] = {"domains": len(shard)}
+        try:
+            response = search(request.model_copy(update={"include_domains": shard}))
+            entry.update(status="ok", results=len(response.results))
+            return response, entry
+        except Exception as e:
+            logger.warning(f"Domain shard search failed: {str(e)}")
+            entry.update(status="error", error=str(e))
+            entry["exception"] = e
+            return None, entry
+        finally:
+            entry["latency"] = time.perf_counter() - shard_start
+
+    with ThreadPoolExecutor(max_workers=len(shards), thread_name_prefix="tavily-shard") as executor:
+        outcomes = list(executor.map(run, shards))
+
+    responses = [response for response, _ in outcomes if response is not None]
+    if not responses:
+        raise outcomes[-1][1]["exception"]
+
+    results = merge_by_score(request, responses)
+
+    # The answer of the shard holding the best result is the most relevant one
+    sort_key = _sort_key(request)
+    best = min(responses, key=lambda response: min(map(sort_key, response.results), default=0.0))
+    answer = best.answer or next((response.answer for response in responses if response.answer), None)
+
+    return SearchResponse(
+        query=request.query,
+        results=results,
+        answer=answer,
+        follow_up_questions=best.follow_up_questions,
+        total_results=len(results),
+        search_time=time.time() - start_time,
+        metadata={"sharding": {
+            "shards": [{key: value for key, value in entry.items() if key != "exception"} for _, entry in outcomes]
+        }}
+    )
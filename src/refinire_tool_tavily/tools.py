@@ -5,6 +5,7 @@ from typing import List, Optional
 from dotenv import load_dotenv
 from refinire import tool
 from .api import search_web, get_search_context
+from .domains import get_domain_policy
 
 # Load environment variables
 load_dotenv()
@@ -20,7 +21,13 @@ def refinire_web_search(
     include_domains: Optional[List[str]] = None,
     exclude_domains: Optional[List[str]] = None,
     include_answer: bool = False,
-    include_raw_content: bool = False
+    include_raw_content: bool = False,
+    deduplicate: bool = False,
+    rerank: bool = False,
+    progressive: bool = False,
+    latency_budget: Optional[float] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False
 ) -> dict:
     """Search the web using Tavily API.
     
@@ -34,6 +41,15 @@ def refinire_web_search(
         exclude_domains: List of domains to exclude from search (optional) 
         include_answer: Include AI-generated answer in response (default: False)
         include_raw_content: Include raw content of web pages (default: False)
+        deduplicate: Drop duplicate and syndicated copies of the same page (default: False)
+        rerank: Re-rank results locally with BM25 (default: False)
+        progressive: Try a few quick results first and search wider and deeper
+            only when they are not good enough (default: False)
+        latency_budget: Seconds the search should take at most; search depth and
+            result count are chosen to fit it (optional)
+        fields: Fields to return, such as ["title", "url", "answer"]; fields left
+            out are not fetched (optional, defaults to all)
+        compact: Return only short titles, URLs, snippets and the answer (default: False)
     
     Returns:
         Dictionary containing search results with titles, URLs, content snippets,
@@ -51,7 +67,13 @@ def refinire_web_search(
         include_domains=include_domains,
         exclude_domains=exclude_domains,
         include_answer=include_answer,
-        include_raw_content=include_raw_content
+        include_raw_content=include_raw_content,
+        deduplicate=deduplicate,
+        rerank=rerank,
+        progressive=progressive,
+        latency_budget=latency_budget,
+        fields=fields,
+        compact=compact
     )
 
 
@@ -61,7 +83,8 @@ def refinire_web_search(
 )
 def refinire_web_search_context(
     query: str,
-    max_results: int = 5
+    max_results: int = 5,
+    max_tokens: Optional[int] = None
 ) -> str:
     """Get web search results formatted as context for language models.
     
@@ -71,6 +94,8 @@ def refinire_web_search_context(
     Args:
         query: Search query string
         max_results: Maximum number of results to include (default: 5)
+        max_tokens: Approximate token budget for the context (optional).
+            Low-score results are dropped and content is shortened to fit.
     
     Returns:
         Formatted string containing search results with AI answer,
@@ -80,7 +105,7 @@ def refinire_web_search_context(
         context = web_search_context("machine learning trends 2024")
         # Returns formatted text with search results and AI summary
     """
-    return get_search_context(query, max_results)
+    return get_search_context(query, max_results, max_tokens=max_tokens)
 
 
 @tool(
@@ -89,7 +114,11 @@ def refinire_web_search_context(
 )
 def refinire_web_search_news(
     query: str,
-    max_results: int = 5
+    max_results: int = 5,
+    rerank: bool = False,
+    fanout: bool = False,
+    fields: Optional[List[str]] = None,
+    compact: bool = False
 ) -> dict:
     """Search for recent news and current events.
     
@@ -99,6 +128,12 @@ def refinire_web_search_news(
     Args:
         query: News search query
         max_results: Maximum number of news results (default: 5)
+        rerank: Re-rank results locally with BM25 (default: False)
+        fanout: Also search the unmodified query in parallel and merge both
+            rankings, which helps recall when the suffix hurts (default: False)
+        fields: Fields to return, such as ["title", "url", "answer"]; fields left
+            out are not fetched (optional, defaults to all)
+        compact: Return only short titles, URLs, snippets and the answer (default: False)
     
     Returns:
         Dictionary containing news search results with AI-generated summary.
@@ -108,16 +143,19 @@ def refinire_web_search_news(
         print(news["answer"])  # AI summary of recent news
     """
     # Focus on news domains and include AI answer for news summary
-    news_domains = [
-        "reuters.com", "bbc.com", "cnn.com", "apnews.com",
-        "nytimes.com", "wsj.com", "bloomberg.com", "techcrunch.com"
-    ]
+    news_policy = get_domain_policy("news")
     
+    news_query = f"{query} news recent"
     return search_web(
-        query=f"{query} news recent",
+        query=news_query,
         max_results=max_results,
-        include_domains=news_domains,
-        include_answer=True
+        include_domains=list(news_policy.include_domains),
+        exclude_domains=list(news_policy.exclude_domains) or None,
+        include_answer=True,
+        rerank=rerank,
+        query_variants=[news_query, query] if fanout else None,
+        fields=fields,
+        compact=compact
     )
 
 
@@ -127,7 +165,12 @@ def refinire_web_search_news(
 )
 def refinire_web_search_research(
     query: str,
-    max_results: int = 5
+    max_results: int = 5,
+    rerank: bool = False,
+    passages: Optional[int] = None,
+    fanout: bool = False,
+    fields: Optional[List[str]] = None,
+    compact: bool = False
 ) -> dict:
     """Search for research papers, academic content, and technical documentation.
     
@@ -137,6 +180,14 @@ def refinire_web_search_research(
     Args:
         query: Research search query
         max_results: Maximum number of research results (default: 5)
+        rerank: Re-rank results locally with BM25 over the raw content (default: False)
+        passages: Return only this many top passages per page, with offsets,
+            instead of the whole raw content (optional, 1-10)
+        fanout: Also search the unmodified query in parallel and merge both
+            rankings, which helps recall when the suffix hurts (default: False)
+        fields: Fields to return, such as ["title", "url", "answer"]; fields left
+            out are not fetched (optional, defaults to all)
+        compact: Return only short titles, URLs, snippets and the answer (default: False)
     
     Returns:
         Dictionary containing research-focused search results with raw content.
@@ -149,24 +200,21 @@ def refinire_web_search_research(
                 pass
     """
     # Focus on academic and technical domains
-    research_domains = [
-        # Academic & Research
-        "arxiv.org", "ar5iv.labs.arxiv.org", "scholar.google.com", "ieee.org", "acm.org",
-        "nature.com", "science.org", "researchgate.net", "semanticscholar.org",
-        "pubmed.ncbi.nlm.nih.gov", "doi.org",
-        
-        # Technical Documentation & API References
-        "docs.python.org", "github.com", "stackoverflow.com", "developer.mozilla.org",
-        "docs.microsoft.com", "cloud.google.com", "aws.amazon.com",
-        
-    ]
+    research_policy = get_domain_policy("research")
     
+    research_query = f"{query} research paper academic"
     return search_web(
-        query=f"{query} research paper academic",
+        query=research_query,
         max_results=max_results,
-        include_domains=research_domains,
+        include_domains=list(research_policy.include_domains),
+        exclude_domains=list(research_policy.exclude_domains) or None,
         include_answer=True,
-        include_raw_content=True
+        include_raw_content=True,
+        rerank=rerank,
+        passages=passages,
+        query_variants=[research_query, query] if fanout else None,
+        fields=fields,
+        compact=compact
     )
 
 
@@ -176,7 +224,12 @@ def refinire_web_search_research(
 )
 def refinire_web_search_programming(
     query: str,
-    max_results: int = 5
+    max_results: int = 5,
+    rerank: bool = False,
+    passages: Optional[int] = None,
+    fanout: bool = False,
+    fields: Optional[List[str]] = None,
+    compact: bool = False
 ) -> dict:
     """Search for programming documentation, API references, and developer resources.
     
@@ -186,6 +239,14 @@ def refinire_web_search_programming(
     Args:
         query: Programming or API search query
         max_results: Maximum number of results (default: 5)
+        rerank: Re-rank results locally with BM25 over the raw content (default: False)
+        passages: Return only this many top passages per page, with offsets,
+            instead of the whole raw content (optional, 1-10)
+        fanout: Also search the unmodified query in parallel and merge both
+            rankings, which helps recall when the suffix hurts (default: False)
+        fields: Fields to return, such as ["title", "url", "answer"]; fields left
+            out are not fetched (optional, defaults to all)
+        compact: Return only short titles, URLs, snippets and the answer (default: False)
     
     Returns:
         Dictionary containing programming and API-focused search results.
@@ -195,41 +256,19 @@ def refinire_web_search_programming(
         doc_results = web_search_programming("Python requests library documentation")
     """
     # Focus on programming and API documentation domains
-    programming_api_domains = [
-        # API Documentation & Tools
-        "postman.com", "swagger.io", "openapi.org", "restfulapi.net",
-        "apidog.com", "insomnia.rest", "rapidapi.com", "apidocs.io",
-        
-        # Major Platform APIs
-        "developers.google.com", "developer.apple.com", "developer.twitter.com",
-        "docs.github.com", "developer.spotify.com", "developers.facebook.com",
-        "developer.mozilla.org", "docs.microsoft.com", "cloud.google.com", "aws.amazon.com",
-        
-        # Technical Documentation
-        "docs.python.org", "nodejs.org", "reactjs.org", "vuejs.org", "angular.io",
-        "django-rest-framework.org", "flask.palletsprojects.com", "fastapi.tiangolo.com",
-        "kubernetes.io", "docker.com", "redis.io", "mongodb.com", "postgresql.org",
-        
-        # Development Communities & Resources
-        "github.com", "stackoverflow.com", "dev.to", "hashnode.com",
-        "freecodecamp.org", "codecademy.com", "tutorialspoint.com", "w3schools.com",
-        
-        # US Tech Sites & Blogs
-        "techcrunch.com", "venturebeat.com", "arstechnica.com", "wired.com",
-        "medium.com", "hackernoon.com", "smashingmagazine.com", "css-tricks.com",
-        
-        # Japanese Tech Sites
-        "qiita.com", "zenn.dev", "speakerdeck.com", "slideshare.net",
-        "tech.recruit-mp.co.jp", "engineering.mercari.com", "techblog.yahoo.co.jp",
-        
-        # Open Source & Package Repositories
-        "pypi.org", "npmjs.com", "packagist.org", "rubygems.org", "crates.io"
-    ]
+    programming_policy = get_domain_policy("programming")
     
+    programming_query = f"{query} documentation API guide tutorial"
     return search_web(
-        query=f"{query} documentation API guide tutorial",
+        query=programming_query,
         max_results=max_results,
-        include_domains=programming_api_domains,
+        include_domains=list(programming_policy.include_domains),
+        exclude_domains=list(programming_policy.exclude_domains) or None,
         include_answer=True,
-        include_raw_content=True
+        include_raw_content=True,
+        rerank=rerank,
+        passages=passages,
+        query_variants=[programming_query, query] if fanout else None,
+        fields=fields,
+        compact=compact
     )
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""Shared utilities for refinire-tool-tavily."""
+
+import hashlib
+import json
+import math
+from typing import Any, Dict, List
+
+
+def canonical_request_key(params: Dict[str, Any]) -> str:
+    """Return a stable hash for a set of Tavily search parameters.
+
+    Keys are sorted and separators are fixed so that logically identical
+    requests always produce the same key, regardless of argument order.
+
+    Args:
+        params: Keyword arguments passed to ``TavilyClient.search``
+
+    Returns:
+        Hex-encoded SHA-256 digest of the canonical JSON form
+    """
+    payload = json.dumps(params, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
@@ -0,0 +1,288 @@
+"""Saved-query watches that return only results not seen before."""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .dedup import canonicalize_url
+from .metrics import ServiceMetrics, get_metrics
+
+
+logger = logging.getLogger(__name__)
+
+_BLOOM_HEADER = struct.Struct("<4sHQIQQd")  # magic, version, bits, hashes, items, capacity, error rate
+_BLOOM_MAGIC = b"TVBF"
+_BLOOM_VERSION = 1
+_WATCHES_FILE = "watches.json"
+
+# Distinct URLs a watch's filter is sized for
+WATCH_CAPACITY = 100_000
+# False-positive rate of a filter holding its capacity: the share of new URLs
+# wrongly taken as seen
+WATCH_ERROR_RATE = 0.001
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings.
+
+    Sized for ``capacity`` items at ``error_rate`` false positives; beyond its
+    capacity the false-positive rate grows. ``k`` bit positions per item are
+    derived from one BLAKE2b digest by double hashing.
+    """
+
+    def __init__(self, capacity: int = WATCH_CAPACITY, error_rate: float = WATCH_ERROR_RATE):
+        """Initialize an empty Bloom filter.
+
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: False-positive rate at capacity
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.items = 0
+        self._array = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first, second = struct.unpack("<QQ", digest)
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._array[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def add(self, item: str) -> bool:
+        """Add an item, returning whether it was (probably) not present before."""
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self._array[position >> 3] & mask:
+                self._array[position >> 3] |= mask
+                added = True
+        if added:
+            self.items += 1
+            if self.items == self.capacity + 1:
+                logger.warning(f"Bloom filter over its capacity of {self.capacity}, false positives will grow")
+        return added
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Atomically write the filter to a file."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_BLOOM_HEADER.pack(
+                _BLOOM_MAGIC, _BLOOM_VERSION, self.bits, self.hashes, self.items, self.capacity, self.error_rate
+            ))
+            f.write(self._array)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "BloomFilter":
+        """Read a filter written by ``save``.
+
+        Raises:
+            ValueError: If the file is not a Bloom filter
+        """
+        with open(path, "rb") as f:
+            header = f.read(_BLOOM_HEADER.size)
+            if len(header) < _BLOOM_HEADER.size:
+                raise ValueError(f"Not a Bloom filter: {path}")
+            magic, version, bits, hashes, items, capacity, error_rate = _BLOOM_HEADER.unpack(header)
+            if magic != _BLOOM_MAGIC or version != _BLOOM_VERSION:
+                raise ValueError(f"Not a Bloom filter: {path}")
+            array = bytearray(f.read())
+        if len(array) != (bits + 7) // 8:
+            raise ValueError(f"Truncated Bloom filter: {path}")
+        bloom = cls.__new__(cls)
+        bloom.capacity, bloom.error_rate = capacity, error_rate
+        bloom.bits, bloom.hashes, bloom.items = bits, hashes, items
+        bloom._array = array
+        return bloom
+
+
+def _default_search(tool: str) -> Callable[..., Dict[str, Any]]:
+    # Imported lazily so that watching with search_web does not need the agent framework
+    from .bench import resolve_tool
+    return resolve_tool(tool)
+
+
+class Watcher:
+    """Reruns saved queries and reports only results with unseen URLs.
+
+    Each watch has its own Bloom filter of the canonical URLs it has returned,
+    saved next to the watch definitions, so a result is reported once even
+    across restarts. A false positive hides a new result; the rate is set by
+    ``error_rate``.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        capacity: int = WATCH_CAPACITY,
+        error_rate: float = WATCH_ERROR_RATE,
+        search: Optional[Callable[[str], Callable[..., Dict[str, Any]]]] = None,
+        metrics: Optional[ServiceMetrics] = None
+    ):
+        """Open or create a watch directory.
+
+        Args:
+            path: Directory holding the watch definitions and their filters
+            capacity: Distinct URLs each new watch's filter is sized for
+            error_rate: False-positive rate of new filters at capacity
+            search: Maps a tool name to the callable searched with (defaults
+                to the search_web function and web_search tools)
+            metrics: Metrics receiving new and seen result counts (defaults to
+                the process-wide metrics)
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.search = search or _default_search
+        self.metrics = metrics if metrics is not None else get_metrics()
+        self._filters: Dict[str, BloomFilter] = {}
+        self._lock = threading.Lock()
+
+        watches_path = self.path / _WATCHES_FILE
+        self._watches: Dict[str, Dict[str, Any]] = {}
+        if watches_path.exists():
+            with open(watches_path, encoding="utf-8") as f:
+                self._watches = json.load(f)
+
+    def _save_watches(self) -> None:
+        tmp_path = self.path / f"{_WATCHES_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._watches, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path / _WATCHES_FILE)
+
+    def _filter_path(self, name: str) -> Path:
+        return self.path / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}.bloom"
+
+    def _filter(self, name: str) -> BloomFilter:
+        bloom = self._filters.get(name)
+        if bloom is None:
+            path = self._filter_path(name)
+            if path.exists():
+                try:
+                    bloom = BloomFilter.load(path)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Starting a new filter for watch {name}: {str(e)}")
+            if bloom is None:
+                bloom = BloomFilter(self.capacity, self.error_rate)
+            self._filters[name] = bloom
+        return bloom
+
+    def add(self, name: str, query: str, interval: float = 300.0, tool: str = "search_web", **kwargs: Any) -> None:
+        """Save a watch, replacing one with the same name.
+
+        Args:
+            name: Watch name
+            query: Search query
+            interval: Seconds between runs of ``run_due``
+            tool: Function or tool searched with, such as ``web_search_news``
+            **kwargs: Further arguments of the tool, such as ``max_results``
+        """
+        with self._lock:
+            self._watches[name] = {"query": query, "interval": interval, "tool": tool, "kwargs": kwargs, "last_run": 0.0}
+            self._save_watches()
+
+    def remove(self, name: str) -> None:
+        """Delete a watch and its filter."""
+        with self._lock:
+            if self._watches.pop(name, None) is not None:
+                self._save_watches()
+            self._filters.pop(name, None)
+            self._filter_path(name).unlink(missing_ok=True)
+
+    def watches(self) -> Dict[str, Dict[str, Any]]:
+        """Return the saved watches by name."""
+        with self._lock:
+            return json.loads(json.dumps(self._watches))
+
+    def check(self, name: str) -> Dict[str, Any]:
+        """Run a watch now and return only its unseen results.
+
+        Returns:
+            The tool's response with ``results`` reduced to unseen URLs and
+            ``watch`` holding the ``name`` and the ``new`` and ``seen`` counts
+
+        Raises:
+            KeyError: If no watch has this name
+            TypeError: If the watch's tool does not return search results
+        """
+        with self._lock:
+            watch = dict(self._watches[name])
+        response = self.search(watch["tool"])(query=watch["query"], **watch["kwargs"])
+        if not isinstance(response, dict):
+            raise TypeError(f"Watch tool {watch['tool']} does not return search results")
+
+        with self._lock:
+            bloom = self._filter(name)
+            results = response.get("results", [])
+            new_results = [result for result in results if bloom.add(canonicalize_url(result.get("url", "")))]
+            if new_results:
+                bloom.save(self._filter_path(name))
+            if name in self._watches:
+                self._watches[name]["last_run"] = time.time()
+                self._save_watches()
+
+        self.metrics.increment(f"watch.{name}.new", len(new_results))
+        self.metrics.increment(f"watch.{name}.seen", len(results) - len(new_results))
+        response = dict(response, results=new_results)
+        if "total_results" in response:
+            response["total_results"] = len(new_results)
+        response["watch"] = {"name": name, "new": len(new_results), "seen": len(results) - len(new_results)}
+        return response
+
+    def run_due(self) -> Dict[str, Dict[str, Any]]:
+        """Run every watch whose interval has passed since its last run.
+
+        Returns:
+            Responses of the watches that ran, by name
+        """
+        now = time.time()
+        with self._lock:
+            due = [name for name, watch in self._watches.items() if watch["last_run"] + watch["interval"] <= now]
+        return {name: self.check(name) for name in due}
+
+    def run_forever(
+        self,
+        callback: Callable[[str, Dict[str, Any]], None],
+        poll_interval: float = 5.0,
+        stop: Optional[threading.Event] = None
+    ) -> None:
+        """Run due watches until stopped, passing each response with new results to a callback.
+
+        Args:
+            callback: Called with the watch name and its response
+            poll_interval: Seconds between checks for due watches
+            stop: Event ending the loop when set (optional)
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            for name, response in self.run_due().items():
+                if response.get("results"):
+                    callback(name, response)
+            stop.wait(poll_interval)
+
+
+def get_watcher() -> Optional[Watcher]:
+    """Return a watcher of the directory in REFINIRE_TOOL_TAVILY_WATCH_PATH, or None.
+
+    New watch filters use REFINIRE_TOOL_TAVILY_WATCH_ERROR_RATE false positives.
+    """
+    path = os.getenv("REFINIRE_TOOL_TAVILY_WATCH_PATH")
+    if not path:
+        return None
+    error_rate = float(os.getenv("REFINIRE_TOOL_TAVILY_WATCH_ERROR_RATE", str(WATCH_ERROR_RATE)) or WATCH_ERROR_RATE)
+    return Watcher(path, error_rate=error_rate)
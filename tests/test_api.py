@@ -138,7 +138,7 @@ class TestGetSearchContext:
         
         # Verify result
         assert result == "Formatted search context"
-        mock_service.get_search_context.assert_called_once_with("test query", 3)
+        mock_service.get_search_context.assert_called_once_with("test query", 3, max_tokens=None)
     
     @patch('src.refinire_tool_tavily.api.TavilyService')
     def test_context_error_handling(self, mock_service_class):
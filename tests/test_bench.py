@@ -0,0 +1,53 @@
+"""Tests for the load-generator CLI."""
+
+import io
+import pytest
+from src.refinire_tool_tavily.bench import iter_queries, percentile, run_bench, scheduled_offset
+
+
+class TestSchedule:
+    """Test cases for open-loop scheduling helpers."""
+
+    def test_fixed_rate_offsets(self):
+        """Test that a fixed rate spaces requests evenly."""
+        assert scheduled_offset(0, 10) == 0
+        assert scheduled_offset(5, 10) == pytest.approx(0.5)
+
+    def test_ramp_offsets(self):
+        """Test that a ramp accelerates and then holds the final rate."""
+        # 1 -> 3 QPS over 10s schedules 20 requests during the ramp
+        assert scheduled_offset(20, 1, ramp_to=3, ramp_duration=10) == pytest.approx(10)
+        assert scheduled_offset(23, 1, ramp_to=3, ramp_duration=10) == pytest.approx(11)
+        assert scheduled_offset(5, 1, ramp_to=3, ramp_duration=10) < 5
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([], 50) == 0.0
+
+
+class TestRunBench:
+    """Test cases for running a benchmark."""
+
+    def test_iter_queries(self):
+        """Test parsing of string, object and malformed log lines."""
+        stream = io.StringIO('"plain"\n{"query": "q", "max_results": 3}\nnot json\n{"title": "t"}\n')
+        assert list(iter_queries(stream)) == [{"query": "plain"}, {"query": "q", "max_results": 3}]
+
+    def test_report_counts_errors(self, monkeypatch):
+        """Test that failed tool results are counted as errors."""
+        monkeypatch.delenv("REFINIRE_TOOL_TAVILY_CACHE_TTL", raising=False)
+
+        def tool(query):
+            return {"success": query != "bad"}
+
+        queries = iter([{"query": "good"}, {"query": "bad"}, {"query": "good"}, {"query": "good"}])
+        report = run_bench(queries, tool, qps=1000)
+
+        assert report["requests"] == 4
+        assert report["errors"] == 1
+        assert report["error_rate"] == 0.25
+        assert report["cache_hit_rate"] is None
+        assert report["latency"]["max"] >= report["latency"]["p50"] >= 0
@@ -0,0 +1,119 @@
+"""Tests for the circuit breaker."""
+
+import time
+import pytest
+from unittest.mock import Mock
+from src.refinire_tool_tavily.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from src.refinire_tool_tavily.cache import SearchCache
+from src.refinire_tool_tavily.metrics import ServiceMetrics
+from src.refinire_tool_tavily.models import SearchRequest
+from src.refinire_tool_tavily.service import CircuitOpenError, TavilyService
+
+
+def make_breaker(**kwargs):
+    options = {"min_calls": 4, "open_seconds": 60, "probe_calls": 2, "metrics": ServiceMetrics()}
+    options.update(kwargs)
+    return CircuitBreaker(**options)
+
+
+class TestCircuitBreaker:
+    """Test cases for breaker state transitions."""
+
+    def test_opens_on_failure_rate(self):
+        """Test that the breaker opens once enough calls fail."""
+        breaker = make_breaker()
+        for failed in (False, True, True):
+            breaker.record(0.1, failed=failed)
+        assert breaker.state == CLOSED
+
+        breaker.record(0.1, failed=True)
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        assert breaker.snapshot()["retry_after"] > 0
+        assert breaker.metrics.snapshot()["counters"]["circuit.rejected"] == 1
+
+    def test_opens_on_slow_calls(self):
+        """Test that slow successful calls also open the breaker."""
+        breaker = make_breaker(slow_call_seconds=1.0, slow_call_rate=0.75)
+        for _ in range(4):
+            breaker.record(2.0)
+        assert breaker.state == OPEN
+
+    def test_half_open_probes(self):
+        """Test that passing probes close the breaker and a failing one reopens it."""
+        breaker = make_breaker(open_seconds=0.01)
+        for _ in range(4):
+            breaker.record(0.1, failed=True)
+        time.sleep(0.02)
+
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow() and breaker.allow()
+        assert not breaker.allow()
+        breaker.record(0.1)
+        breaker.record(0.1)
+        assert breaker.state == CLOSED
+        assert breaker.metrics.snapshot()["gauges"]["circuit.state"] == CLOSED
+
+        for _ in range(4):
+            breaker.record(0.1, failed=True)
+        time.sleep(0.02)
+        assert breaker.allow()
+        breaker.record(0.1, failed=True)
+        assert breaker.state == OPEN
+
+
+    def test_lost_probe_is_reclaimed(self):
+        """Test that a probe never recorded does not keep the breaker half-open."""
+        breaker = make_breaker(open_seconds=0.01, probe_calls=1, probe_timeout=0.05)
+        for _ in range(4):
+            breaker.record(0.1, failed=True)
+        time.sleep(0.02)
+
+        assert breaker.allow()
+        assert not breaker.allow()
+        time.sleep(0.06)
+        assert breaker.allow()
+        breaker.record(0.1)
+        assert breaker.state == CLOSED
+        assert breaker.metrics.snapshot()["counters"]["circuit.probes_lost"] == 1
+
+
+class TestServiceBreaker:
+    """Test cases for the breaker around Tavily calls."""
+
+    def make_service(self, breaker, cache=None):
+        service = TavilyService(api_key="test-key", breaker=breaker, cache=cache, metrics=breaker.metrics)
+        service.client = Mock()
+        return service
+
+    def test_fails_fast_while_open(self):
+        """Test that an open breaker rejects searches without calling Tavily."""
+        breaker = make_breaker()
+        service = self.make_service(breaker)
+        service.client.search.side_effect = RuntimeError("upstream down")
+        for _ in range(4):
+            with pytest.raises(Exception):
+                service.search(SearchRequest(query="python"))
+        service.client.search.reset_mock()
+
+        with pytest.raises(CircuitOpenError) as exc_info:
+            service.search(SearchRequest(query="python"))
+        assert exc_info.value.circuit["state"] == OPEN
+        service.client.search.assert_not_called()
+
+    def test_serves_stale_cache_while_open(self):
+        """Test that expired cached responses are served while the breaker is open."""
+        breaker = make_breaker()
+        cache = SearchCache(ttl=-1, stale_ttl=60)
+        service = self.make_service(breaker, cache)
+        service.client.search.return_value = {"results": [{"title": "T", "url": "https://a.com", "content": "c"}]}
+        service.search(SearchRequest(query="python"))
+        for _ in range(4):
+            breaker.record(0.1, failed=True)
+
+        response = service.search(SearchRequest(query="python"))
+
+        assert response.total_results == 1
+        assert response.metadata["circuit"] == {"state": OPEN, "stale": True}
+        assert service.client.search.call_count == 1
+        assert breaker.metrics.snapshot()["counters"]["circuit.stale_served"] == 1
@@ -0,0 +1,83 @@
+"""Tests for the bulk search CLI."""
+
+import io
+import json
+import random
+import time
+from src.refinire_tool_tavily.bulk import iter_csv_queries, load_checkpoint, main, run_bulk
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestRunBulk:
+    """Test cases for bulk searching."""
+
+    def test_results_in_input_order(self, tmp_path):
+        """Test that concurrent results are written in input order."""
+        def tool(query):
+            time.sleep(random.random() / 100)
+            return {"success": query != "q3", "query": query}
+
+        path = tmp_path / "out.jsonl"
+        with open(path, "wb") as output:
+            summary = run_bulk(
+                ({"query": f"q{i}"} for i in range(20)), tool, output,
+                concurrency=4, checkpoint_path=str(tmp_path / "ckpt"), checkpoint_every=5
+            )
+
+        assert summary == {"processed": 20, "errors": 1, "skipped": 0, "next_index": 20}
+        assert [record["index"] for record in read_records(path)] == list(range(20))
+        assert load_checkpoint(str(tmp_path / "ckpt"))["next_index"] == 20
+
+    def test_tool_exceptions_are_recorded(self, tmp_path):
+        """Test that a failing search is written as an error record."""
+        def tool(query):
+            raise RuntimeError("boom")
+
+        path = tmp_path / "out.jsonl"
+        with open(path, "wb") as output:
+            summary = run_bulk(iter([{"query": "q"}]), tool, output)
+
+        assert summary["errors"] == 1
+        assert read_records(path) == [{"index": 0, "query": "q", "error": "boom"}]
+
+    def test_iter_csv_queries(self):
+        """Test parsing of CSV query files."""
+        stream = io.StringIO("query,max_results\nfirst,3\n,2\nsecond,\n")
+        assert list(iter_csv_queries(stream)) == [{"query": "first", "max_results": 3}, {"query": "second"}]
+
+
+class TestBulkMain:
+    """Test cases for the console entry point."""
+
+    def test_resume_from_checkpoint(self, tmp_path, monkeypatch, capsys):
+        """Test that a resumed run skips checkpointed queries and drops later output."""
+        searched = []
+
+        def search_web(query, priority, tenant):
+            searched.append(query)
+            return {"success": True, "query": query, "priority": priority}
+
+        monkeypatch.setattr("src.refinire_tool_tavily.bulk.resolve_tool", lambda name: search_web)
+        queries = tmp_path / "queries.jsonl"
+        queries.write_text("\n".join(json.dumps(f"q{i}") for i in range(6)) + "\n", encoding="utf-8")
+        output = tmp_path / "out.jsonl"
+
+        # An interrupted run that checkpointed after two results and wrote a third
+        first = json.dumps({"index": 0, "query": "q0", "result": {}}) + "\n"
+        second = json.dumps({"index": 1, "query": "q1", "result": {}}) + "\n"
+        output.write_text(first + second + '{"index": 2, "que', encoding="utf-8")
+        (tmp_path / "out.jsonl.checkpoint").write_text(
+            json.dumps({"next_index": 2, "output_offset": len((first + second).encode("utf-8"))}), encoding="utf-8"
+        )
+
+        assert main([str(queries), "-o", str(output)]) == 0
+
+        assert searched == ["q2", "q3", "q4", "q5"]
+        records = read_records(output)
+        assert [record["index"] for record in records] == list(range(6))
+        assert records[-1]["result"]["priority"] == "batch"
+        assert json.loads(capsys.readouterr().out)["skipped"] == 2
@@ -0,0 +1,98 @@
+"""Tests for the response cache."""
+
+import time
+from unittest.mock import Mock
+from src.refinire_tool_tavily.cache import SearchCache, _SnapshotValue
+from src.refinire_tool_tavily.models import SearchRequest
+from src.refinire_tool_tavily.service import TavilyService
+
+
+class TestSearchCache:
+    """Test cases for SearchCache."""
+
+    def test_hit_and_miss_statistics(self):
+        """Test that lookups are counted."""
+        cache = SearchCache(ttl=60)
+        assert cache.get("key") is None
+        cache.put("key", {"results": []})
+        assert cache.get("key") == {"results": []}
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_expired_entries_are_misses(self):
+        """Test that expired entries are not served."""
+        cache = SearchCache(ttl=-1)
+        cache.put("key", {"results": []})
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = SearchCache(ttl=60, max_entries=2)
+        cache.put("a", {})
+        cache.put("b", {})
+        cache.get("a")
+        cache.put("c", {})
+        assert cache.get("b") is None
+        assert cache.get("a") == {}
+
+    def test_service_serves_repeated_requests_from_cache(self):
+        """Test that the service only calls the client once per request."""
+        service = TavilyService(api_key="test-key", cache=SearchCache(ttl=60))
+        service.client = Mock()
+        service.client.search.return_value = {"results": [{"title": "T", "url": "https://a.com", "content": "C"}]}
+
+        service.search(SearchRequest(query="python"))
+        response = service.search(SearchRequest(query="python"))
+
+        assert service.client.search.call_count == 1
+        assert response.results[0].title == "T"
+
+
+class TestCacheSnapshot:
+    """Test cases for hot-key snapshots and warm start."""
+
+    def test_round_trip_keeps_hottest_entries(self, tmp_path):
+        """Test that the most used entries are restored with their frequencies."""
+        cache = SearchCache(ttl=60)
+        for key in ("cold", "warm", "hot"):
+            cache.put(key, {"results": [key]})
+        cache.get("hot")
+        cache.get("hot")
+        cache.get("warm")
+        path = tmp_path / "cache.snap"
+
+        assert cache.save_snapshot(path, max_entries=2) == 2
+
+        restored = SearchCache(ttl=60)
+        assert restored.load_snapshot(path) == 2
+        assert "cold" not in restored
+        assert restored._frequency["hot"] == 3
+        assert isinstance(restored._entries["hot"][1], _SnapshotValue)
+        assert restored.get("hot") == {"results": ["hot"]}
+        assert restored.get("warm") == {"results": ["warm"]}
+
+    def test_expired_entries_are_skipped(self, tmp_path):
+        """Test that entries past their TTL are not loaded."""
+        cache = SearchCache(ttl=0.05)
+        cache.put("short", {})
+        path = tmp_path / "cache.snap"
+        cache.save_snapshot(path)
+        time.sleep(0.1)
+
+        assert SearchCache(ttl=60).load_snapshot(path) == 0
+
+    def test_newer_entries_win(self, tmp_path):
+        """Test that loading does not replace entries cached since start-up."""
+        cache = SearchCache(ttl=60)
+        cache.put("key", {"results": ["old"]})
+        path = tmp_path / "cache.snap"
+        cache.save_snapshot(path)
+
+        restored = SearchCache(ttl=60)
+        restored.put("key", {"results": ["new"]})
+        assert restored.load_snapshot(path) == 0
+        assert restored.get("key") == {"results": ["new"]}
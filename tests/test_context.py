@@ -0,0 +1,70 @@
+"""Tests for context formatting."""
+
+from src.refinire_tool_tavily.context import (
+    estimate_tokens, format_search_context, truncate_to_sentence
+)
+from src.refinire_tool_tavily.models import SearchResponse, SearchResult
+
+
+def _response(answer=None):
+    results = [
+        SearchResult(
+            title=f"Title {i}",
+            url=f"https://example.com/{i}",
+            content="This is a sentence about the topic. " * 40,
+            score=score
+        )
+        for i, score in enumerate([0.9, 0.8, 0.1, 0.05], 1)
+    ]
+    return SearchResponse(query="topic", results=results, answer=answer, total_results=len(results))
+
+
+class TestTruncation:
+    """Test cases for token estimation and truncation."""
+
+    def test_estimate_tokens(self):
+        """Test the four-characters-per-token estimate."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+
+    def test_truncate_at_sentence_boundary(self):
+        """Test that truncation ends on a full sentence."""
+        text = "First sentence here. Second sentence is longer than the rest."
+        assert truncate_to_sentence(text, 7) == "First sentence here."
+        assert truncate_to_sentence(text, 100) == text
+
+    def test_truncate_without_sentence_boundary(self):
+        """Test that long sentences are cut at a word and marked."""
+        truncated = truncate_to_sentence("word " * 100, 5)
+        assert truncated.endswith("…")
+        assert len(truncated) <= 20
+
+
+class TestFormatSearchContext:
+    """Test cases for format_search_context."""
+
+    def test_unbounded_format(self):
+        """Test the unbounded format includes every result in full."""
+        response = _response(answer="The answer.")
+        context = format_search_context(response)
+
+        assert context.startswith("Answer: The answer.\n\nSearch Results:\n1. Title 1")
+        assert context.count("   Content: ") == 4
+
+    def test_budget_is_respected(self):
+        """Test that the context stays within the token budget."""
+        response = _response(answer="The answer. " * 50)
+        context = format_search_context(response, max_tokens=300)
+
+        assert estimate_tokens(context) <= 300
+        assert "1. Title 1" in context
+
+    def test_low_score_results_dropped_first(self):
+        """Test that tight budgets drop the lowest-scored results."""
+        context = format_search_context(_response(), max_tokens=150)
+
+        assert "1. Title 1" in context
+        assert "2. Title 2" in context
+        assert "Title 3" not in context
+        assert "Title 4" not in context
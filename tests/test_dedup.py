@@ -0,0 +1,69 @@
+"""Tests for URL canonicalization and near-duplicate suppression."""
+
+from unittest.mock import Mock
+from src.refinire_tool_tavily.dedup import (
+    canonicalize_url, deduplicate_results, hamming_distance, simhash
+)
+from src.refinire_tool_tavily.models import SearchRequest, SearchResult
+from src.refinire_tool_tavily.service import TavilyService
+
+
+ARTICLE = (
+    "The city council approved the new transit plan on Tuesday after months of debate, "
+    "adding three bus lines and extending service hours across the northern districts."
+)
+
+
+class TestCanonicalizeUrl:
+    """Test cases for canonicalize_url."""
+
+    def test_equivalent_urls(self):
+        """Test that scheme, www, slash, fragment and tracking variants collapse."""
+        variants = [
+            "https://example.com/news/article",
+            "http://www.example.com/news/article/",
+            "https://EXAMPLE.com:443/news/article#comments",
+            "https://example.com/news/article?utm_source=feed&fbclid=abc",
+        ]
+        assert len({canonicalize_url(url) for url in variants}) == 1
+
+    def test_meaningful_query_is_kept(self):
+        """Test that non-tracking query parameters are preserved and sorted."""
+        assert canonicalize_url("https://example.com/a?b=2&a=1") == "https://example.com/a?a=1&b=2"
+        assert canonicalize_url("https://example.com/a?id=1") != canonicalize_url("https://example.com/a?id=2")
+
+
+class TestDeduplicateResults:
+    """Test cases for deduplicate_results."""
+
+    def test_simhash_near_duplicates_are_close(self):
+        """Test that a lightly edited copy has a nearby signature."""
+        edited = ARTICLE.replace("Tuesday", "Tuesday evening")
+        unrelated = "A recipe for sourdough bread with a long cold fermentation and a crisp crust."
+        assert hamming_distance(simhash(ARTICLE), simhash(edited)) < hamming_distance(simhash(ARTICLE), simhash(unrelated))
+
+    def test_best_scored_copy_is_kept(self):
+        """Test that duplicates collapse to the best-scored copy in first position."""
+        results = [
+            SearchResult(title="A", url="http://example.com/story/", content=ARTICLE, score=0.5),
+            SearchResult(title="B", url="https://other.com/x", content="Something else entirely about gardening.", score=0.4),
+            SearchResult(title="A2", url="https://example.com/story?utm_medium=rss", content="Different text", score=0.9),
+            SearchResult(title="Syndicated", url="https://mirror.com/copy", content=ARTICLE, score=0.3),
+        ]
+        deduplicated = deduplicate_results(results)
+
+        assert [result.title for result in deduplicated] == ["A2", "B"]
+
+    def test_service_overfetches_to_fill_max_results(self):
+        """Test that deduplicating requests fetch extra results and trim."""
+        service = TavilyService(api_key="test-key")
+        service.client = Mock()
+        service.client.search.return_value = {"results": [
+            {"title": f"T{i}", "url": f"https://example.com/{i % 3}", "content": f"unique body number {i}"}
+            for i in range(6)
+        ]}
+
+        response = service.search(SearchRequest(query="topic", max_results=4, deduplicate=True))
+
+        assert service.client.search.call_args.kwargs["max_results"] == 6
+        assert response.total_results == 3
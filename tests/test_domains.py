@@ -0,0 +1,82 @@
+"""Tests for compiled domain policies."""
+
+import json
+import os
+import pytest
+from unittest.mock import Mock
+from pydantic import ValidationError
+from src.refinire_tool_tavily import domains
+from src.refinire_tool_tavily.domains import DomainPolicy, get_domain_policy, normalize_domain
+from src.refinire_tool_tavily.models import SearchRequest
+from src.refinire_tool_tavily.service import TavilyService
+
+
+class TestNormalizeDomain:
+    """Test cases for domain normalization."""
+
+    def test_normalizes_urls_and_prefixes(self):
+        """Test that schemes, paths, ports and www are removed."""
+        assert normalize_domain("https://WWW.Example.com:443/docs") == "example.com"
+        assert normalize_domain("*.github.com.") == "github.com"
+        assert normalize_domain("bücher.de") == "xn--bcher-kva.de"
+
+    def test_rejects_invalid_domains(self):
+        """Test that malformed domains raise ValueError."""
+        for value in ["", "exa mple.com", "-bad.com", "a..b"]:
+            with pytest.raises(ValueError):
+                normalize_domain(value)
+
+    def test_search_request_normalizes_domains(self):
+        """Test that SearchRequest validates and normalizes domain lists."""
+        request = SearchRequest(query="test", include_domains=["Python.org", "www.python.org"])
+        assert request.include_domains == ["python.org"]
+        with pytest.raises(ValidationError):
+            SearchRequest(query="test", exclude_domains=["not a domain"])
+
+
+class TestDomainPolicy:
+    """Test cases for domain policy matching."""
+
+    def test_subdomains_are_covered(self):
+        """Test suffix matching on label boundaries."""
+        policy = DomainPolicy(include=["github.com"], exclude=["gist.github.com"])
+        assert policy.allows_url("https://docs.github.com/en")
+        assert not policy.allows_url("https://gist.github.com/x")
+        assert not policy.allows_url("https://notgithub.com/")
+        assert not policy.allows_url("not a url")
+
+    def test_service_filters_results_locally(self):
+        """Test that results outside the requested domains are dropped."""
+        service = TavilyService(api_key="test-key")
+        service.client = Mock()
+        service.client.search.return_value = {"results": [
+            {"title": "A", "url": "https://docs.python.org/3/", "content": "a"},
+            {"title": "B", "url": "https://spam.blog.medium.com/post", "content": "b"},
+            {"title": "C", "url": "https://other.com/", "content": "c"},
+        ]}
+        request = SearchRequest(query="python", include_domains=["python.org", "medium.com"], exclude_domains=["blog.medium.com"])
+
+        response = service.search(request)
+        assert [result.title for result in response.results] == ["A"]
+        assert response.metadata["domains_filtered"] == 2
+        assert [result.title for result in service.iter_search(request)] == ["A"]
+
+
+class TestPolicyFile:
+    """Test cases for file-based policy overrides."""
+
+    def test_file_overrides_builtin_policy(self, tmp_path, monkeypatch, caplog):
+        """Test that the policy file is used, reloaded on change and survives bad edits."""
+        path = tmp_path / "domains.json"
+        path.write_text(json.dumps({"news": {"include": ["example.com"], "exclude": ["ads.example.com"]}}))
+        monkeypatch.setenv("REFINIRE_TOOL_TAVILY_DOMAIN_POLICY_FILE", str(path))
+        monkeypatch.setattr(domains, "_file_policies", {})
+        monkeypatch.setattr(domains, "_file_signature", None)
+
+        assert get_domain_policy("news").include_domains == ("example.com",)
+        assert get_domain_policy("research") is domains.BUILTIN_POLICIES["research"]
+
+        path.write_text("{not json")
+        os.utime(path, ns=(1, 1))
+        assert get_domain_policy("news").include_domains == ("example.com",)
+        assert "Failed to load domain policy file" in caplog.text
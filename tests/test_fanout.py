@@ -0,0 +1,89 @@
+"""Tests for multi-query fan-out with reciprocal rank fusion."""
+
+import threading
+import pytest
+from unittest.mock import Mock
+from src.refinire_tool_tavily.fanout import RankFusion, fan_out
+from src.refinire_tool_tavily.models import SearchRequest, SearchResponse, SearchResult
+from src.refinire_tool_tavily.service import TavilyService
+
+
+def _results(*urls):
+    return [SearchResult(title=url, url=url, content=url, score=0.5) for url in urls]
+
+
+class TestRankFusion:
+    """Test cases for reciprocal rank fusion."""
+
+    def test_shared_results_rank_first(self):
+        """Test that results returned by several lists outrank single-list ones."""
+        fusion = RankFusion()
+        fusion.add(_results("https://a.com", "https://b.com", "https://c.com"))
+        fusion.add(_results("https://d.com", "https://www.c.com/", "https://b.com"))
+
+        urls = [result.url for result in fusion.results()]
+        assert urls[:2] == ["https://b.com", "https://c.com"]
+        assert fusion.confident_count() == 2
+
+
+class TestFanOut:
+    """Test cases for fan-out searches."""
+
+    def test_service_fuses_variants(self):
+        """Test that the service searches every variant and reports each one."""
+        service = TavilyService(api_key="test-key")
+        service.client = Mock()
+        service.client.search.side_effect = lambda query, **kwargs: {"results": [
+            {"title": query, "url": "https://shared.com", "content": "shared"},
+            {"title": query, "url": f"https://{len(query)}.com", "content": query},
+        ]}
+
+        response = service.search(SearchRequest(query="python", query_variants=["python", "python docs"]))
+
+        assert service.client.search.call_count == 2
+        assert response.query == "python"
+        assert response.results[0].url == "https://shared.com"
+        variants = response.metadata["fanout"]["variants"]
+        assert [variant["query"] for variant in variants] == ["python", "python docs"]
+        assert all(variant["status"] == "ok" and variant["latency"] >= 0 for variant in variants)
+
+    def test_early_return_skips_slow_variant(self):
+        """Test that fusion returns once enough results are confirmed."""
+        release = threading.Event()
+
+        def search(request):
+            if request.query == "slow":
+                release.wait(5)
+            return SearchResponse(query=request.query, results=_results("https://a.com"), total_results=1)
+
+        try:
+            response = fan_out(SearchRequest(query="q", max_results=1), ["fast1", "fast2", "slow"], search)
+        finally:
+            release.set()
+
+        assert response.metadata["fanout"]["early_return"] is True
+        assert response.metadata["fanout"]["variants"][2]["status"] == "pending"
+        assert [result.url for result in response.results] == ["https://a.com"]
+
+    def test_partial_failure_is_reported(self):
+        """Test that a failing variant does not fail the search."""
+        def search(request):
+            if request.query == "bad":
+                raise RuntimeError("boom")
+            return SearchResponse(query=request.query, results=_results("https://a.com"), total_results=1)
+
+        response = fan_out(SearchRequest(query="q"), ["good", "bad"], search)
+
+        assert len(response.results) == 1
+        assert response.metadata["fanout"]["variants"][1] == {
+            "query": "bad", "status": "error", "error": "boom",
+            "latency": response.metadata["fanout"]["variants"][1]["latency"]
+        }
+
+    def test_all_variants_failing_raises(self):
+        """Test that the error is raised when no variant succeeds."""
+        def search(request):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            fan_out(SearchRequest(query="q"), ["a", "b"], search)
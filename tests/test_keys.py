@@ -0,0 +1,105 @@
+"""Tests for the API key pool."""
+
+import pytest
+from unittest.mock import Mock
+from tavily.errors import ForbiddenError, UsageLimitExceededError
+from src.refinire_tool_tavily.config import ConfigManager, mask_api_key
+from src.refinire_tool_tavily.keys import ApiKeyPool, parse_api_keys
+from src.refinire_tool_tavily.metrics import ServiceMetrics
+
+
+KEYS = ["tvly-key-aaaa", "tvly-key-bbbb"]
+
+
+def make_pool(**kwargs):
+    clients = {}
+
+    def factory(key):
+        clients[key] = Mock()
+        clients[key].search.return_value = {"results": [], "key": key}
+        return clients[key]
+
+    pool = ApiKeyPool(KEYS, client_factory=factory, metrics=ServiceMetrics(), **kwargs)
+    return pool, clients
+
+
+class TestApiKeyPool:
+    """Test cases for key selection and rotation."""
+
+    def test_spreads_calls_across_keys(self):
+        """Test that idle keys are used in turn, each with its own client."""
+        pool, clients = make_pool()
+        used = [pool.search(query="q")["key"] for _ in range(4)]
+        assert used.count(KEYS[0]) == used.count(KEYS[1]) == 2
+        assert clients[KEYS[0]] is not clients[KEYS[1]]
+
+    def test_rate_limited_key_leaves_rotation(self):
+        """Test that a 429 retries on another key and cools the first down."""
+        pool, clients = make_pool()
+        clients[KEYS[0]].search.side_effect = UsageLimitExceededError("rate limited")
+
+        assert pool.search(query="q")["key"] == KEYS[1]
+        assert pool.search(query="q")["key"] == KEYS[1]
+        assert clients[KEYS[0]].search.call_count == 1
+        label = f"{mask_api_key(KEYS[0])}#0"
+        assert pool.metrics.snapshot()["counters"][f"keys.{label}.rate_limited"] == 1
+        assert [state["available"] for state in pool.snapshot()] == [False, True]
+
+    def test_keys_sharing_a_prefix_keep_separate_metrics(self):
+        """Test that keys masked alike are still counted under their own labels."""
+        pool, _ = make_pool()
+        assert mask_api_key(KEYS[0]) == mask_api_key(KEYS[1])
+        for _ in range(3):
+            pool.search(query="q")
+
+        counters = pool.metrics.snapshot()["counters"]
+        labels = [state["key"] for state in pool.snapshot()]
+        assert labels == [f"{mask_api_key(KEYS[0])}#0", f"{mask_api_key(KEYS[1])}#1"]
+        assert [counters[f"keys.{label}.calls"] for label in labels] == [2, 1]
+
+    def test_all_keys_limited(self):
+        """Test that the last limit error is raised when no key is left."""
+        pool, clients = make_pool()
+        clients[KEYS[0]].search.side_effect = UsageLimitExceededError("rate limited")
+        clients[KEYS[1]].search.side_effect = ForbiddenError("plan limit")
+
+        with pytest.raises(ForbiddenError):
+            pool.search(query="q")
+        with pytest.raises(UsageLimitExceededError):
+            pool.search(query="q")
+
+    def test_quota_weighting_and_exhaustion(self):
+        """Test that keys with less quota left get fewer calls and run out."""
+        pool, _ = make_pool(credits=4)
+        pool.search(query="q", search_depth="advanced")
+        assert pool.search(query="q")["key"] == KEYS[1]
+
+        for _ in range(5):
+            pool.search(query="q")
+        snapshot = pool.snapshot()
+        assert [state["remaining"] for state in snapshot] == [0, 0]
+        assert not any(state["available"] for state in snapshot)
+        with pytest.raises(UsageLimitExceededError):
+            pool.search(query="q")
+
+
+class TestKeyConfig:
+    """Test cases for key configuration."""
+
+    def test_parse_api_keys(self):
+        """Test that blanks and duplicates are ignored."""
+        assert parse_api_keys(" a, b,,a ") == ["a", "b"]
+        assert parse_api_keys(None) == []
+
+    def test_masked_in_config_status(self, monkeypatch, capsys):
+        """Test that pooled keys are masked like the single key."""
+        monkeypatch.delenv("TAVILY_API_KEY", raising=False)
+        monkeypatch.setenv("TAVILY_API_KEYS", ",".join(KEYS))
+
+        manager = ConfigManager()
+        assert manager.validate_config()["valid"]
+        manager.print_config_status()
+
+        output = capsys.readouterr().out
+        assert "tvly-key*****, tvly-key*****" in output
+        assert KEYS[0] not in output
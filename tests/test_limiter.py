@@ -0,0 +1,141 @@
+"""Tests for the adaptive concurrency limiter."""
+
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from tavily.errors import UsageLimitExceededError
+from src.refinire_tool_tavily.breaker import CLOSED, CircuitBreaker
+from src.refinire_tool_tavily.limiter import ConcurrencyLimiter
+from src.refinire_tool_tavily.metrics import ServiceMetrics
+from src.refinire_tool_tavily.models import SearchRequest
+from src.refinire_tool_tavily.service import ConcurrencyLimitError, TavilyService
+
+
+def make_limiter(**kwargs):
+    options = {"initial_limit": 2, "max_limit": 8, "metrics": ServiceMetrics()}
+    options.update(kwargs)
+    return ConcurrencyLimiter(**options)
+
+
+class TestConcurrencyLimiter:
+    """Test cases for limit adaptation and queueing."""
+
+    def test_grows_while_latency_is_flat(self):
+        """Test additive increase on calls near the baseline latency."""
+        limiter = make_limiter()
+        for _ in range(10):
+            assert limiter.acquire()
+            limiter.release(0.1)
+        assert 4 < limiter.limit <= 8
+        assert limiter.snapshot()["in_flight"] == 0
+
+    def test_backs_off_on_overload_and_spikes(self):
+        """Test multiplicative decrease on 429s and latency spikes."""
+        limiter = make_limiter(initial_limit=8)
+        limiter.acquire()
+        limiter.release(0.01, overloaded=True)
+        assert limiter.limit == 4
+
+        limiter.acquire()
+        limiter.release(0.01)
+        limiter._last_decrease = 0.0
+        limiter.acquire()
+        limiter.release(1.0)
+        assert limiter.limit < 4
+        assert limiter.metrics.snapshot()["counters"]["concurrency.decreases"] == 2
+
+    def test_fast_outlier_does_not_pin_baseline(self):
+        """Test that one fast call is forgotten instead of collapsing the limit."""
+        limiter = make_limiter(initial_limit=4, baseline_window=10)
+        limiter.acquire()
+        limiter.release(0.01)
+        for _ in range(60):
+            # Every slow call may count as a new burst
+            limiter._last_decrease = 0.0
+            limiter.acquire()
+            limiter.release(0.5)
+
+        assert limiter.snapshot()["baseline"] > 0.25
+        assert limiter.limit >= 4
+
+    def test_failed_calls_leave_limit_and_baseline(self):
+        """Test that failures other than 429s only free their slot."""
+        limiter = make_limiter()
+        limiter.acquire()
+        limiter.release(0.5)
+        limiter.acquire()
+        limiter.release(0.01, failed=True)
+
+        assert limiter.snapshot() == {"limit": 2 + 1 / 2, "in_flight": 0, "baseline": 0.5}
+
+    def test_one_decrease_per_burst(self):
+        """Test that overloads within one call latency cut the limit once."""
+        limiter = make_limiter(initial_limit=8)
+        for _ in range(3):
+            limiter.acquire()
+        for _ in range(3):
+            limiter.release(1.0, overloaded=True)
+        assert limiter.limit == 4
+
+    def test_queued_caller_waits_then_times_out(self):
+        """Test that callers over the limit wait for a slot, boundedly."""
+        limiter = make_limiter(initial_limit=1, max_wait=0.05)
+        assert limiter.acquire()
+        assert not limiter.acquire()
+
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(limiter.acquire()))
+        limiter.max_wait = 2.0
+        waiter.start()
+        time.sleep(0.05)
+        limiter.release(0.1)
+        waiter.join()
+        assert acquired == [True]
+        assert limiter.metrics.snapshot()["counters"]["concurrency.rejected"] == 1
+
+
+class TestServiceLimiter:
+    """Test cases for the limiter around Tavily calls."""
+
+    def test_releases_and_detects_usage_limit(self):
+        """Test that 429 errors release the slot and back off."""
+        limiter = make_limiter(initial_limit=4)
+        service = TavilyService(api_key="test-key", limiter=limiter, metrics=limiter.metrics)
+        service.client = Mock()
+        service.client.search.side_effect = UsageLimitExceededError("rate limited")
+
+        with pytest.raises(Exception):
+            service.search(SearchRequest(query="python"))
+
+        assert limiter.limit == 2
+        assert limiter.snapshot()["in_flight"] == 0
+
+    def test_rejects_when_no_slot(self):
+        """Test that a search fails once the bounded wait runs out."""
+        limiter = make_limiter(initial_limit=1, max_wait=0.01)
+        limiter.acquire()
+        service = TavilyService(api_key="test-key", limiter=limiter, metrics=limiter.metrics)
+        service.client = Mock()
+
+        with pytest.raises(ConcurrencyLimitError):
+            service.search(SearchRequest(query="python"))
+        service.client.search.assert_not_called()
+
+    def test_limit_timeout_returns_breaker_probe(self):
+        """Test that a half-open probe rejected by the limiter does not wedge the breaker."""
+        limiter = make_limiter(initial_limit=1, max_wait=0.01)
+        breaker = CircuitBreaker(min_calls=1, open_seconds=0.01, probe_calls=1, probe_timeout=60, metrics=limiter.metrics)
+        breaker.record(0.1, failed=True)
+        time.sleep(0.02)
+        service = TavilyService(api_key="test-key", limiter=limiter, breaker=breaker, metrics=limiter.metrics)
+        service.client = Mock()
+        service.client.search.return_value = {"results": []}
+
+        limiter.acquire()
+        with pytest.raises(ConcurrencyLimitError):
+            service.search(SearchRequest(query="python"))
+        limiter.release(0.1)
+
+        service.search(SearchRequest(query="python"))
+        assert breaker.state == CLOSED
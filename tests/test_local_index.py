@@ -0,0 +1,123 @@
+"""Tests for the local inverted index."""
+
+from unittest.mock import Mock
+from src.refinire_tool_tavily.local_index import LocalIndex
+from src.refinire_tool_tavily.metrics import ServiceMetrics
+from src.refinire_tool_tavily.models import SearchRequest
+from src.refinire_tool_tavily.service import TavilyService
+
+
+RESULTS = [
+    {"title": "Asyncio queues", "url": "https://a.com/queues", "content": "Python asyncio queues explained", "score": 0.9},
+    {"title": "Gardening", "url": "https://b.com/garden", "content": "Spring flowers and vegetables", "score": 0.5},
+    {"title": "Asyncio tasks", "url": "https://c.com/tasks", "content": "Python asyncio tasks and event loops", "score": 0.7},
+]
+
+
+class TestLocalIndex:
+    """Test cases for indexing and local search."""
+
+    def test_search_ranks_indexed_results(self, tmp_path):
+        """Test that flushed results are searchable with BM25."""
+        index = LocalIndex(tmp_path)
+        try:
+            index.add(RESULTS, "python asyncio")
+            index.flush()
+            response = index.search("asyncio queues", max_results=2)
+        finally:
+            index.close()
+
+        assert [result.url for result in response.results] == ["https://a.com/queues", "https://c.com/tasks"]
+        assert response.metadata["local"]["coverage"] == 1.0
+        assert response.metadata["local"]["documents"] == 3
+
+    def test_reopen_and_latest_copy(self, tmp_path):
+        """Test that segments persist, unsegmented log entries are recovered and URLs are deduplicated."""
+        index = LocalIndex(tmp_path)
+        index.add(RESULTS, "python asyncio")
+        index.close()
+
+        # Simulate a crash after logging, before a segment was written
+        with open(tmp_path / "docs.log", "ab") as f:
+            f.write(b'{"url":"https://a.com/queues/","title":"Asyncio queues v2","content":"asyncio queues",'
+                    b'"score":null,"query":"q","time":1.0}\n{"url":"partial')
+
+        index = LocalIndex(tmp_path)
+        try:
+            assert len(index) == 4
+            titles = [result.title for result in index.search("asyncio queues").results]
+            assert "Asyncio queues v2" in titles and "Asyncio queues" not in titles
+            assert index.search("asyncio queues", max_age=60).results[0].title == "Asyncio tasks"
+        finally:
+            index.close()
+
+
+    def test_segments_written_at_threshold_and_merged(self, tmp_path):
+        """Test that segments are written only when full and merged by size tier."""
+        index = LocalIndex(tmp_path, segment_docs=2, merge_factor=2)
+        try:
+            index.add(RESULTS[:1], "q")
+            index.flush()
+            assert list(tmp_path.glob("seg-*.json")) == []
+            assert index.search("asyncio queues").results[0].url == "https://a.com/queues"
+
+            for i in range(15):
+                index.add([{"title": f"Page {i}", "url": f"https://d.com/{i}", "content": f"topic{i} python"}], "q")
+            index.flush()
+            # 16 documents: 8 full segments merged down to one of 16
+            assert [path.name for path in tmp_path.glob("seg-*.json")] == ["seg-0000000000-0000000016.json"]
+            assert len(index.search("python", max_results=20).results) == 16
+            assert index.search("topic7").results[0].url == "https://d.com/7"
+        finally:
+            index.close()
+
+        index = LocalIndex(tmp_path, segment_docs=2, merge_factor=2)
+        try:
+            assert len(index) == 16
+            assert index.search("topic12").results[0].url == "https://d.com/12"
+        finally:
+            index.close()
+
+    def test_interrupted_merge_is_cleaned_up(self, tmp_path):
+        """Test that segments left behind by an interrupted merge are dropped on open."""
+        index = LocalIndex(tmp_path, segment_docs=3)
+        index.add(RESULTS, "python asyncio")
+        index.close()
+        merged = tmp_path / "seg-0000000000-0000000003.json"
+        stale = tmp_path / "seg-0000000000-0000000002"
+        stale.with_suffix(".json").write_text(
+            '{"base": 0, "docs": [[0, 1, 1, 0, "x"], [1, 1, 1, 0, "y"]], "terms": {}}', encoding="utf-8"
+        )
+        stale.with_suffix(".post").write_bytes(b"")
+
+        index = LocalIndex(tmp_path, segment_docs=3)
+        try:
+            assert len(index) == 3
+            assert sorted(tmp_path.glob("seg-*.json")) == [merged]
+        finally:
+            index.close()
+
+
+class TestLocalFirst:
+    """Test cases for local-first service searches."""
+
+    def test_local_hit_and_fallback(self, tmp_path):
+        """Test that covered queries are answered locally and others go to Tavily."""
+        index = LocalIndex(tmp_path)
+        service = TavilyService(api_key="test-key", local_index=index, metrics=ServiceMetrics())
+        service.client = Mock()
+        service.client.search.return_value = {"results": RESULTS}
+        try:
+            response = service.search(SearchRequest(query="python asyncio", max_results=2, local_first=True))
+            assert response.metadata["local"] == {"hit": False, "reasons": ["too_few_results", "low_coverage"]}
+            index.flush()
+
+            response = service.search(SearchRequest(query="python asyncio", max_results=2, local_first=True))
+            assert response.metadata["local"]["hit"] is True
+            assert service.client.search.call_count == 1
+
+            response = service.search(SearchRequest(query="python asyncio", local_first=True, include_answer=True))
+            assert response.metadata["local"]["reasons"] == ["needs_remote_fields"]
+        finally:
+            index.close()
+        assert service.metrics.snapshot()["counters"] == {"local.hits": 1, "local.misses": 2}
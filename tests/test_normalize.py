@@ -0,0 +1,124 @@
+"""Tests for raw-content normalization."""
+
+from unittest.mock import Mock
+from src.refinire_tool_tavily.cache import SearchCache
+from src.refinire_tool_tavily.metrics import ServiceMetrics
+from src.refinire_tool_tavily.models import SearchRequest
+from src.refinire_tool_tavily.normalize import RawContentNormalizer, normalize_raw_content
+from src.refinire_tool_tavily.service import TavilyService
+
+
+PAGE = """<html><head><style>body { color: red; }</style></head><body>
+<nav><a href="/">Home</a> <a href="/docs">Docs</a></nav>
+<h1>Install   guide</h1>
+<p>Run the   installer &amp; restart.</p>
+<p>Skip to content</p>
+<p>Run the installer &amp; restart.</p>
+<footer>&copy; 2024 Example Inc.</footer>
+</body></html>"""
+
+
+class TestNormalizeRawContent:
+    """Test cases for normalizing a single page."""
+
+    def test_html_page(self):
+        """Test that markup, boilerplate and repeated paragraphs are removed."""
+        assert normalize_raw_content(PAGE) == "Install guide\n\nRun the installer & restart."
+
+    def test_markdown_page(self):
+        """Test that links and headings are stripped while code fences are kept."""
+        text = (
+            "Skip to content\n\n"
+            "## Usage\n\n"
+            "See [the docs](https://example.com/docs) ![logo](logo.png)   for more.\n"
+            "Cookie policy\n\n"
+            "---\n\n"
+            "```python\n# configure\ndef f(**kwargs):\n    x  =  1\n\n    return x\n```\n\n"
+            "Map<String, Integer> counts"
+        )
+        assert normalize_raw_content(text) == (
+            "Usage\n\n"
+            "See the docs for more.\n\n"
+            "```python\n# configure\ndef f(**kwargs):\n    x  =  1\n\n    return x\n```\n\n"
+            "Map<String, Integer> counts"
+        )
+
+    def test_html_inside_code_fence_is_kept(self):
+        """Test that markup inside a code fence is not stripped."""
+        text = "<p>Example:</p>\n\n```html\n<div class=\"x\">Hello</div><nav>menu</nav>\n```\n\n<p>Done.</p>"
+        assert normalize_raw_content(text) == (
+            "Example:\n\n```html\n<div class=\"x\">Hello</div><nav>menu</nav>\n```\n\nDone."
+        )
+
+    def test_generics_on_html_page(self):
+        """Test that generics outside tags survive on an HTML page."""
+        text = "<p>Declare <code>List<String> xs;</code> first.</p>"
+        assert normalize_raw_content(text) == "Declare List<String> xs; first."
+
+    def test_copyright_needs_year_or_word(self):
+        """Test that only copyright notices are taken for boilerplate, not list items."""
+        text = "(a) first option here\n(b) second\n(c) third option here\n© 2024 Example Inc.\n(c) Copyright Example"
+        assert normalize_raw_content(text) == "(a) first option here\n(b) second\n(c) third option here"
+
+    def test_single_words_need_context(self):
+        """Test that single boilerplate words are dropped only when repeated or next to boilerplate."""
+        text = (
+            "Search\n\nType a query.\n\n"
+            "Home\nSkip to content\n\n"
+            "Contents\n\nIntro text.\n\nContents"
+        )
+        assert normalize_raw_content(text) == "Search\n\nType a query.\n\nIntro text."
+
+
+class TestRawContentNormalizer:
+    """Test cases for normalizing responses."""
+
+    def test_bytes_saved_metrics(self):
+        """Test that results are normalized in a copy and bytes saved are observed."""
+        metrics = ServiceMetrics()
+        response = {"results": [{"url": "https://a.com/", "raw_content": PAGE}, {"url": "https://b.com/"}]}
+
+        normalized = RawContentNormalizer(workers=0, metrics=metrics).normalize_response(response)
+
+        assert normalized["results"][0]["raw_content"] == "Install guide\n\nRun the installer & restart."
+        assert normalized["results"][1] == {"url": "https://b.com/"}
+        assert response["results"][0]["raw_content"] == PAGE
+        saved = metrics.distribution("normalize.bytes_saved")
+        assert saved["count"] == 1
+        assert saved["max"] == len(PAGE) - len("Install guide\n\nRun the installer & restart.")
+
+    def test_worker_pool_matches_in_process(self):
+        """Test that large responses normalized in the pool give the same result."""
+        response = {"results": [{"raw_content": PAGE}, {"raw_content": PAGE.upper()}]}
+        normalizer = RawContentNormalizer(workers=2, parallel_min_chars=1, start_method="fork", metrics=ServiceMetrics())
+        try:
+            # Normalized in-process while the pool starts
+            expected = normalizer.normalize_response(response)
+            assert normalizer.start_pool(wait=True)
+            pooled = normalizer.normalize_response(response)
+        finally:
+            normalizer.shutdown()
+
+        assert pooled == expected
+        assert not normalizer.start_pool(wait=True)
+
+    def test_service_caches_normalized_response(self):
+        """Test that the service normalizes raw content before caching it."""
+        metrics = ServiceMetrics()
+        cache = SearchCache(ttl=60)
+        service = TavilyService(
+            api_key="test-key",
+            cache=cache,
+            metrics=metrics,
+            normalizer=RawContentNormalizer(workers=0, metrics=metrics)
+        )
+        service.client = Mock()
+        service.client.search.return_value = {
+            "results": [{"title": "Guide", "url": "https://a.com/", "content": "c", "raw_content": PAGE}]
+        }
+
+        response = service.search(SearchRequest(query="install guide", include_raw_content=True))
+
+        assert response.results[0].raw_content == "Install guide\n\nRun the installer & restart."
+        assert "Skip to content" not in str(cache._entries)
+        assert metrics.snapshot()["counters"]["normalize.pages"] == 1
@@ -0,0 +1,75 @@
+"""Tests for top-passage extraction."""
+
+from unittest.mock import Mock
+from src.refinire_tool_tavily import passages as passages_module
+from src.refinire_tool_tavily.models import SearchRequest
+from src.refinire_tool_tavily.passages import extract_passages, window_offsets
+from src.refinire_tool_tavily.service import TavilyService
+
+
+FILLER = "Navigation home about contact subscribe newsletter footer links. " * 40
+RELEVANT = "The asyncio event loop schedules tasks; asyncio queues pass work between tasks safely. "
+RAW_CONTENT = FILLER + RELEVANT * 3 + FILLER
+
+
+class TestWindows:
+    """Test cases for window_offsets."""
+
+    def test_windows_cover_text_and_overlap(self):
+        """Test that windows start at zero, end at the text end and overlap."""
+        starts, ends = window_offsets(RAW_CONTENT, window_chars=300, stride_chars=150)
+
+        assert starts[0] == 0
+        assert ends[-1] == len(RAW_CONTENT)
+        assert all(next_start < end for next_start, end in zip(starts[1:], ends))
+
+    def test_windows_end_on_whitespace(self):
+        """Test that window edges do not cut words."""
+        starts, ends = window_offsets(RAW_CONTENT, window_chars=300, stride_chars=150)
+        assert all(RAW_CONTENT[end] == " " for end in ends[:-1])
+
+
+class TestExtractPassages:
+    """Test cases for extract_passages."""
+
+    def test_relevant_passage_with_offsets(self):
+        """Test that the relevant region is returned with matching offsets."""
+        passages = extract_passages("asyncio queues", RAW_CONTENT, top_k=1, window_chars=400, stride_chars=200)
+
+        assert len(passages) == 1
+        passage = passages[0]
+        assert "asyncio queues" in passage.text
+        assert RAW_CONTENT[passage.start:passage.end] == passage.text
+        assert passage.score > 0
+
+    def test_passages_do_not_overlap(self):
+        """Test that several passages never overlap."""
+        passages = extract_passages("asyncio", RAW_CONTENT, top_k=3, window_chars=200, stride_chars=100)
+        assert all(first.end <= second.start for first, second in zip(passages, passages[1:]))
+
+    def test_no_matches(self):
+        """Test that text without query terms yields no passages."""
+        assert extract_passages("kubernetes", RAW_CONTENT) == []
+
+    def test_python_fallback_matches_numpy(self, monkeypatch):
+        """Test that the pure Python path picks the same passages."""
+        vectorized = extract_passages("asyncio queues", RAW_CONTENT, top_k=2, window_chars=400, stride_chars=200)
+        monkeypatch.setattr(passages_module, "np", None)
+        fallback = extract_passages("asyncio queues", RAW_CONTENT, top_k=2, window_chars=400, stride_chars=200)
+        assert [(p.start, p.end) for p in fallback] == [(p.start, p.end) for p in vectorized]
+
+    def test_service_replaces_raw_content(self):
+        """Test that the service requests raw content and returns passages only."""
+        service = TavilyService(api_key="test-key")
+        service.client = Mock()
+        service.client.search.return_value = {"results": [
+            {"title": "Guide", "url": "https://example.com", "content": "Snippet", "raw_content": RAW_CONTENT}
+        ]}
+
+        response = service.search(SearchRequest(query="asyncio queues", passages=2))
+
+        assert service.client.search.call_args.kwargs["include_raw_content"] is True
+        result = response.results[0]
+        assert result.raw_content is None
+        assert 0 < sum(len(p.text) for p in result.passages) < len(RAW_CONTENT) / 2
+        assert "passage_time" in response.metadata
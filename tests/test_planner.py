@@ -0,0 +1,72 @@
+"""Tests for latency-budget planning."""
+
+from unittest.mock import Mock
+from src.refinire_tool_tavily.models import SearchRequest
+from src.refinire_tool_tavily.planner import LatencyPlanner
+from src.refinire_tool_tavily.service import TavilyService
+
+
+class TestLatencyPlanner:
+    """Test cases for the latency planner."""
+
+    def test_priors_choose_by_budget(self):
+        """Test that unobserved configurations use the depth priors."""
+        planner = LatencyPlanner()
+        assert planner.plan(SearchRequest(query="q", latency_budget=10))["search_depth"] == "advanced"
+
+        decision = planner.plan(SearchRequest(query="q", latency_budget=2))
+        assert (decision["search_depth"], decision["reason"]) == ("basic", "fits_budget")
+
+    def test_observed_latency_drives_plan(self):
+        """Test that live statistics replace priors and shrink the plan."""
+        planner = LatencyPlanner()
+        for _ in range(5):
+            planner.observe("basic", 5, 3.0)
+            planner.observe("basic", 3, 0.8)
+
+        decision = planner.plan(SearchRequest(query="q", max_results=5, latency_budget=2))
+        assert (decision["search_depth"], decision["max_results"]) == ("basic", 3)
+        assert [candidate["max_results"] for candidate in decision["candidates"]] == [5, 5, 3]
+
+        decision = planner.plan(SearchRequest(query="q", max_results=5, latency_budget=0.1))
+        assert decision["reason"] == "fastest_available"
+
+    def test_state_round_trip(self, tmp_path):
+        """Test that statistics survive a save and load."""
+        planner = LatencyPlanner()
+        planner.observe("advanced", 10, 4.2)
+        path = str(tmp_path / "planner.json")
+        planner.save(path)
+
+        restored = LatencyPlanner(state_path=path)
+        assert restored.estimate("advanced", 10) == planner.estimate("advanced", 10)
+
+
+class TestServicePlanning:
+    """Test cases for planned service searches."""
+
+    def test_decision_is_applied_and_reported(self):
+        """Test that the plan sets Tavily parameters and appears in metadata."""
+        planner = LatencyPlanner()
+        service = TavilyService(api_key="test-key", planner=planner)
+        service.client = Mock()
+        service.client.search.return_value = {"results": []}
+
+        response = service.search(SearchRequest(query="python", latency_budget=2))
+
+        assert service.client.search.call_args.kwargs["search_depth"] == "basic"
+        assert response.metadata["planner"]["budget"] == 2
+        assert planner.to_dict()["basic:5"]["count"] == 1
+
+    def test_overfetch_observed_under_requested_count(self):
+        """Test that deduplicated searches are learned under the count plan() looks up."""
+        planner = LatencyPlanner()
+        service = TavilyService(api_key="test-key", planner=planner)
+        service.client = Mock()
+        service.client.search.return_value = {"results": []}
+
+        service.search(SearchRequest(query="python", max_results=6, deduplicate=True, search_depth="basic"))
+
+        assert service.client.search.call_args.kwargs["max_results"] == 9
+        assert planner.to_dict()["basic:6"]["count"] == 1
+        assert "basic:9" not in planner.to_dict()
@@ -0,0 +1,68 @@
+"""Tests for follow-up prefetching."""
+
+from unittest.mock import Mock
+from src.refinire_tool_tavily.cache import SearchCache
+from src.refinire_tool_tavily.metrics import ServiceMetrics
+from src.refinire_tool_tavily.models import SearchRequest
+from src.refinire_tool_tavily.prefetch import FollowUpPrefetcher
+from src.refinire_tool_tavily.service import TavilyService
+
+
+FOLLOW_UPS = ["What is asyncio?", "What is the GIL?", "What is PyPy?"]
+
+
+def make_service(**kwargs):
+    metrics = ServiceMetrics()
+    prefetcher = FollowUpPrefetcher(metrics=metrics, **kwargs)
+    service = TavilyService(api_key="test-key", cache=SearchCache(ttl=60), prefetcher=prefetcher, metrics=metrics)
+    service.client = Mock()
+    service.client.search.side_effect = lambda **params: {
+        "results": [{"title": params["query"], "url": "https://a.com", "content": "c"}],
+        "follow_up_questions": FOLLOW_UPS
+    }
+    return service, prefetcher
+
+
+class TestFollowUpPrefetcher:
+    """Test cases for follow-up prefetching and hit tracking."""
+
+    def test_prefetches_top_follow_ups(self):
+        """Test that the top follow-ups are cached and later count as hits."""
+        service, prefetcher = make_service(top_n=2)
+        request = SearchRequest(query="python concurrency")
+        prefetcher.prefetch(service, request, service.search(request))
+        prefetcher.shutdown()
+
+        assert service.client.search.call_count == 3
+        assert prefetcher.stats()["completed"] == 2
+
+        service.search(SearchRequest(query=FOLLOW_UPS[0]))
+        service.search(SearchRequest(query=FOLLOW_UPS[0]))
+
+        assert service.client.search.call_count == 3
+        stats = prefetcher.stats()
+        assert (stats["hits"], stats["hit_rate"]) == (1, 0.5)
+        assert prefetcher.metrics.snapshot()["gauges"]["prefetch.hit_rate"] == 0.5
+
+    def test_credit_budget(self):
+        """Test that prefetches stop at the credit budget."""
+        service, prefetcher = make_service(top_n=3, credits_per_hour=1)
+        request = SearchRequest(query="python concurrency")
+        prefetcher.prefetch(service, request, service.search(request))
+        prefetcher.shutdown()
+
+        assert prefetcher.stats()["credits"] == 1
+        assert prefetcher.metrics.snapshot()["counters"]["prefetch.skipped_budget"] == 2
+
+    def test_skips_cached_and_without_cache(self):
+        """Test that cached follow-ups and cacheless services are not prefetched."""
+        service, prefetcher = make_service(top_n=1)
+        service.search(SearchRequest(query=FOLLOW_UPS[0]))
+        request = SearchRequest(query="python concurrency")
+        prefetcher.prefetch(service, request, service.search(request))
+
+        service.cache = None
+        prefetcher.prefetch(service, request, service.search(request))
+        prefetcher.shutdown()
+
+        assert "prefetch.scheduled" not in prefetcher.metrics.snapshot()["counters"]
@@ -0,0 +1,66 @@
+"""Tests for the sampling profiler."""
+
+import pytest
+from unittest.mock import patch
+from src.refinire_tool_tavily.api import search_web
+from src.refinire_tool_tavily.models import SearchResponse
+from src.refinire_tool_tavily.profiling import SearchProfiler, sampled, set_profiler
+
+
+@pytest.fixture
+def profiler():
+    """Install an in-memory profiler sampling every second call."""
+    profiler = SearchProfiler(sample_every=2, top=5)
+    set_profiler(profiler)
+    yield profiler
+    set_profiler(None)
+
+
+def _build_results(query):
+    return [{"title": f"{query} {i}", "content": "x" * 100} for i in range(50)]
+
+
+class TestSearchProfiler:
+    """Test cases for SearchProfiler."""
+
+    def test_samples_one_in_n_calls(self, profiler):
+        """Test that only every Nth call is profiled."""
+        wrapped = sampled(_build_results)
+        for _ in range(4):
+            assert len(wrapped("query")) == 50
+
+        assert profiler.samples == 2
+        assert len(profiler.reports) == 2
+
+    def test_report_contents(self, profiler):
+        """Test that reports list hot functions and allocation sites."""
+        profiler.profile(_build_results, query="python")
+
+        report = profiler.reports[-1]
+        assert "query='python'" in report
+        assert "_build_results" in report
+        assert "Top allocation sites:" in report
+        assert "Aggregated over 1 samples" in profiler.aggregate_report()
+
+    def test_rotating_file_output(self, tmp_path):
+        """Test that reports are written to the output file."""
+        path = tmp_path / "profile.log"
+        profiler = SearchProfiler(sample_every=1, output_path=str(path))
+        profiler.profile(_build_results, "python")
+        assert "Profile sample #1" in path.read_text()
+
+    def test_disabled_profiler_calls_through(self):
+        """Test that wrapped functions run normally when profiling is off."""
+        set_profiler(None)
+        assert len(sampled(_build_results)("query")) == 50
+
+    @patch('src.refinire_tool_tavily.api.TavilyService')
+    def test_search_web_is_sampled(self, mock_service_class, profiler):
+        """Test that whole search_web calls, service work included, are sampled."""
+        mock_service_class.return_value.prefetcher = None
+        mock_service_class.return_value.search.return_value = SearchResponse(query="python", results=[], total_results=0)
+        for _ in range(2):
+            assert search_web("python")["success"]
+
+        assert profiler.samples == 1
+        assert "search_web" in profiler.reports[-1]
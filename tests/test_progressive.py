@@ -0,0 +1,59 @@
+"""Tests for progressive searches."""
+
+from unittest.mock import Mock
+from src.refinire_tool_tavily.metrics import ServiceMetrics
+from src.refinire_tool_tavily.models import SearchRequest
+from src.refinire_tool_tavily.service import TavilyService
+
+
+def _search(score):
+    """Fake Tavily search returning max_results results from distinct domains."""
+    def search(**kwargs):
+        offset = 0 if kwargs.get("search_depth") == "basic" else 1
+        return {"answer": "An answer", "results": [
+            {"title": f"R{i}", "url": f"https://site{i}.com/", "content": "c", "score": score - i / 100}
+            for i in range(offset, offset + kwargs["max_results"])
+        ]}
+    return search
+
+
+class TestProgressiveSearch:
+    """Test cases for progressive searches."""
+
+    def _service(self, score):
+        service = TavilyService(api_key="test-key", metrics=ServiceMetrics())
+        service.client = Mock()
+        service.client.search.side_effect = _search(score)
+        return service
+
+    def test_sufficient_first_pass_is_returned(self):
+        """Test that a good basic pass avoids the wider request."""
+        service = self._service(0.9)
+        response = service.search(SearchRequest(query="python", max_results=5, include_answer=True, progressive=True))
+
+        service.client.search.assert_called_once()
+        assert service.client.search.call_args.kwargs["search_depth"] == "basic"
+        assert service.client.search.call_args.kwargs["max_results"] == 3
+        assert len(response.results) == 3
+        assert response.metadata["progressive"]["expanded"] is False
+        assert service.metrics.snapshot()["counters"] == {"progressive.requests": 1}
+
+    def test_insufficient_first_pass_expands(self):
+        """Test that a weak basic pass is widened, deepened and merged."""
+        service = self._service(0.3)
+        response = service.search(SearchRequest(query="python", max_results=5, progressive=True))
+
+        calls = [call.kwargs for call in service.client.search.call_args_list]
+        assert [(call["max_results"], call["search_depth"]) for call in calls] == [(3, "basic"), (5, "advanced")]
+        assert [result.title for result in response.results] == ["R0", "R1", "R2", "R3", "R4"]
+        progressive = response.metadata["progressive"]
+        assert progressive["expanded"] is True
+        assert progressive["reasons"] == ["low_score"]
+        assert [stage["credits"] for stage in progressive["passes"]] == [1, 2]
+        assert service.metrics.snapshot()["counters"]["progressive.expanded"] == 1
+
+    def test_no_repeat_of_identical_pass(self):
+        """Test that a basic-depth request within the first pass size is not repeated."""
+        service = self._service(0.3)
+        service.search(SearchRequest(query="python", max_results=2, search_depth="basic", progressive=True))
+        service.client.search.assert_called_once()
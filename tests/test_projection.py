@@ -0,0 +1,120 @@
+"""Tests for field projection of tool responses."""
+
+import pytest
+from unittest.mock import Mock, patch
+from src.refinire_tool_tavily.api import search_web
+from src.refinire_tool_tavily.models import Passage, SearchResponse, SearchResult
+from src.refinire_tool_tavily.projection import COMPACT_MAX_TOKENS, FieldProjection
+
+
+def make_response():
+    return SearchResponse(
+        query="q",
+        results=[
+            SearchResult(
+                title="Title",
+                url="https://example.com/",
+                content="First sentence. " * 100,
+                score=0.9,
+                raw_content="Raw page text",
+                passages=[Passage(text="Raw page", start=0, end=8, score=1.0)]
+            )
+        ],
+        total_results=1,
+        answer="Answer.",
+        follow_up_questions=["Next?"],
+        search_time=0.3,
+        metadata={"rerank_time": 0.01}
+    )
+
+
+class TestFieldProjection:
+    """Test cases for building projected responses."""
+
+    def test_selected_fields_only(self):
+        """Test that only the selected fields are returned."""
+        projection = FieldProjection(["url", "passages", "answer"])
+        response = projection.response_to_dict(make_response())
+
+        assert response == {
+            "success": True,
+            "query": "q",
+            "results": [{
+                "url": "https://example.com/",
+                "passages": [{"text": "Raw page", "start": 0, "end": 8, "score": 1.0}]
+            }],
+            "total_results": 1,
+            "answer": "Answer."
+        }
+
+    def test_unselected_fields_are_not_read(self):
+        """Test that unselected fields are never materialised."""
+        result = Mock(spec=["url"], url="https://example.com/")
+        assert FieldProjection(["url"]).result_to_dict(result) == {"url": "https://example.com/"}
+
+    def test_caps_truncate_at_sentence_boundary(self):
+        """Test that capped text fields are truncated to their token budget."""
+        projection = FieldProjection(["content"], max_tokens={"content": 10})
+        content = projection.response_to_dict(make_response())["results"][0]["content"]
+
+        assert len(content) <= 40
+        assert content.endswith("sentence.")
+
+    def test_compact_defaults(self):
+        """Test compact mode fields and caps, and that explicit options win."""
+        projection = FieldProjection.from_options(compact=True)
+        assert projection.result_fields == ("title", "url", "content")
+        assert projection.response_fields == ("answer",)
+        assert projection.max_tokens == COMPACT_MAX_TOKENS
+
+        projection = FieldProjection.from_options(["url"], compact=True, max_tokens={"content": 5})
+        assert projection.result_fields == ("url",)
+        assert projection.max_tokens["content"] == 5
+        assert FieldProjection.from_options() is None
+
+    def test_invalid_options(self):
+        """Test that unknown fields and caps of non-text fields are rejected."""
+        with pytest.raises(ValueError, match="Unknown fields: body"):
+            FieldProjection(["url", "body"])
+        with pytest.raises(ValueError):
+            FieldProjection(max_tokens={"score": 3})
+        with pytest.raises(ValueError):
+            FieldProjection(max_tokens={"content": 0})
+
+
+class TestSearchWebProjection:
+    """Test cases for projection in search_web."""
+
+    @patch('src.refinire_tool_tavily.api.TavilyService')
+    def test_dropped_fields_are_not_requested(self, mock_service_class):
+        """Test that an answer and raw content left out are not requested."""
+        mock_service = Mock(prefetcher=None)
+        mock_service_class.return_value = mock_service
+        mock_service.search.return_value = make_response()
+
+        result = search_web("q", include_answer=True, include_raw_content=True, passages=2, fields=["title", "url"])
+
+        request = mock_service.search.call_args[0][0]
+        assert not request.include_answer
+        assert not request.include_raw_content
+        assert request.passages is None
+        assert result["results"] == [{"title": "Title", "url": "https://example.com/"}]
+
+    @patch('src.refinire_tool_tavily.api.TavilyService')
+    def test_rerank_keeps_raw_content(self, mock_service_class):
+        """Test that raw content is still fetched for re-ranking."""
+        mock_service = Mock(prefetcher=None)
+        mock_service_class.return_value = mock_service
+        mock_service.search.return_value = make_response()
+
+        result = search_web("q", include_raw_content=True, rerank=True, compact=True)
+
+        assert mock_service.search.call_args[0][0].include_raw_content
+        assert set(result["results"][0]) == {"title", "url", "content"}
+        assert len(result["results"][0]["content"]) <= COMPACT_MAX_TOKENS["content"] * 4
+
+    def test_unknown_field_is_invalid_parameter(self):
+        """Test that an unknown field is reported as an invalid parameter."""
+        result = search_web("q", fields=["body"])
+        assert result["success"] is False
+        assert "Invalid parameters" in result["error"]
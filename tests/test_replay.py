@@ -0,0 +1,86 @@
+"""Tests for record-and-replay transport."""
+
+import pytest
+from unittest.mock import Mock
+from src.refinire_tool_tavily.replay import (
+    RecordingClient, ReplayClient, ReplayJournalReader, ReplayJournalWriter, ReplayMissError
+)
+from src.refinire_tool_tavily.service import TavilyService, TavilyServiceError
+from src.refinire_tool_tavily.models import SearchRequest
+from src.refinire_tool_tavily.utils import canonical_request_key
+
+
+def _record(path, queries):
+    """Record one fake response per query to a journal."""
+    upstream = Mock()
+    upstream.search.side_effect = lambda **params: {
+        "results": [{"title": params["query"], "url": "https://example.com", "content": "c", "score": 0.5}]
+    }
+    writer = ReplayJournalWriter(path)
+    client = RecordingClient(upstream, writer)
+    for query in queries:
+        client.search(query=query, max_results=5)
+    writer.close()
+
+
+class TestReplayJournal:
+    """Test cases for journal recording and lookup."""
+
+    def test_canonical_key_ignores_argument_order(self):
+        """Test that parameter order does not change the request key."""
+        assert canonical_request_key({"a": 1, "b": 2}) == canonical_request_key({"b": 2, "a": 1})
+
+    def test_record_and_replay(self, tmp_path):
+        """Test that recorded responses are served back by key."""
+        path = tmp_path / "journal.log"
+        _record(path, [f"query {i}" for i in range(50)])
+
+        replay = ReplayClient(ReplayJournalReader(path))
+        response = replay.search(query="query 42", max_results=5)
+
+        assert response["results"][0]["title"] == "query 42"
+        assert (tmp_path / "journal.log.idx").exists()
+
+    def test_replay_miss(self, tmp_path):
+        """Test that unrecorded requests raise ReplayMissError."""
+        path = tmp_path / "journal.log"
+        _record(path, ["recorded"])
+
+        replay = ReplayClient(ReplayJournalReader(path))
+        with pytest.raises(ReplayMissError):
+            replay.search(query="recorded", max_results=10)
+
+    def test_stale_index_is_rebuilt(self, tmp_path):
+        """Test that appending to a journal invalidates its index."""
+        path = tmp_path / "journal.log"
+        _record(path, ["first"])
+        _record(path, ["second"])
+
+        reader = ReplayJournalReader(path)
+        assert reader.lookup(canonical_request_key({"query": "first", "max_results": 5})) is not None
+        assert reader.lookup(canonical_request_key({"query": "second", "max_results": 5})) is not None
+
+
+class TestServiceReplayMode:
+    """Test cases for TavilyService in replay mode."""
+
+    def test_replay_without_api_key(self, tmp_path, monkeypatch):
+        """Test that replay mode needs no API key and parses recorded results."""
+        monkeypatch.delenv("TAVILY_API_KEY", raising=False)
+        path = tmp_path / "journal.log"
+        upstream = Mock()
+        upstream.search.return_value = {
+            "results": [{"title": "Recorded", "url": "https://example.com", "content": "Body"}]
+        }
+        writer = ReplayJournalWriter(path)
+        RecordingClient(upstream, writer).search(
+            query="python", max_results=5, include_answer=False, include_raw_content=False
+        )
+        writer.close()
+
+        service = TavilyService(replay_path=str(path))
+        response = service.search(SearchRequest(query="python"))
+
+        assert response.results[0].title == "Recorded"
+        with pytest.raises(TavilyServiceError):
+            service.search(SearchRequest(query="unknown"))
@@ -0,0 +1,65 @@
+"""Tests for local BM25 re-ranking."""
+
+from unittest.mock import Mock
+from src.refinire_tool_tavily import rerank
+from src.refinire_tool_tavily.models import SearchRequest, SearchResult
+from src.refinire_tool_tavily.rerank import bm25_scores, rerank_results
+from src.refinire_tool_tavily.service import TavilyService
+
+
+DOCUMENTS = [
+    "Gardening tips for spring flowers and vegetables.",
+    "Python asyncio tutorial: event loops, tasks and asyncio queues explained.",
+    "A short note that mentions Python once.",
+]
+
+
+class TestBM25:
+    """Test cases for BM25 scoring."""
+
+    def test_relevant_document_scores_highest(self):
+        """Test that term frequency and rarity drive the score."""
+        scores = bm25_scores("python asyncio queues", DOCUMENTS)
+        assert scores[1] > scores[2] > scores[0] == 0.0
+
+    def test_stopword_only_query(self):
+        """Test that queries without content terms score zero."""
+        assert bm25_scores("what is the", DOCUMENTS) == [0.0, 0.0, 0.0]
+
+    def test_python_fallback_matches_numpy(self, monkeypatch):
+        """Test that the pure Python path gives the same scores."""
+        vectorized = bm25_scores("python asyncio queues", DOCUMENTS)
+        monkeypatch.setattr(rerank, "np", None)
+        fallback = bm25_scores("python asyncio queues", DOCUMENTS)
+        assert [round(score, 9) for score in fallback] == [round(score, 9) for score in vectorized]
+
+
+class TestRerankResults:
+    """Test cases for result re-ranking."""
+
+    def test_rerank_uses_raw_content(self):
+        """Test that raw content can promote a result."""
+        results = [
+            SearchResult(title="Intro", url="https://a.com", content="Overview", score=0.9),
+            SearchResult(title="Guide", url="https://b.com", content="Overview", score=0.5,
+                         raw_content="asyncio queues in depth: asyncio queues and python tasks"),
+        ]
+        reranked = rerank_results("python asyncio queues", results)
+
+        assert [result.url for result in reranked] == ["https://b.com", "https://a.com"]
+        assert reranked[0].score == 0.5
+        assert reranked[0].rerank_score > 0
+
+    def test_service_reports_rerank_time(self):
+        """Test that the service re-ranks and records the stage timing."""
+        service = TavilyService(api_key="test-key")
+        service.client = Mock()
+        service.client.search.return_value = {"results": [
+            {"title": title, "url": f"https://example.com/{i}", "content": document}
+            for i, (title, document) in enumerate(zip("ABC", DOCUMENTS))
+        ]}
+
+        response = service.search(SearchRequest(query="python asyncio", rerank=True))
+
+        assert response.results[0].title == "B"
+        assert response.metadata["rerank_time"] >= 0
@@ -0,0 +1,84 @@
+"""Tests for the binary response journal."""
+
+from src.refinire_tool_tavily.models import SearchResponse, SearchResult
+from src.refinire_tool_tavily.response_journal import ResponseJournalReader, ResponseJournalWriter
+
+
+def _response(index):
+    return SearchResponse(
+        query=f"query {index % 3}",
+        results=[SearchResult(title=f"R{index}", url=f"https://example.com/{index}", content="x" * 200)],
+        total_results=1,
+        metadata={"index": index}
+    )
+
+
+class TestResponseJournal:
+    """Test cases for writing and reading the response journal."""
+
+    def test_random_access_rotation_and_streaming(self, tmp_path):
+        """Test lookups by sequence number and query across rotated, compressed segments."""
+        writer = ResponseJournalWriter(tmp_path, segment_bytes=600, compress=True)
+        for index in range(10):
+            writer.append(_response(index))
+        writer.close()
+
+        assert len(list(tmp_path.glob("segment-*.log"))) > 1
+        reader = ResponseJournalReader(tmp_path)
+        try:
+            assert len(reader) == 10
+            assert reader.get(7).metadata == {"index": 7}
+            assert reader.find("query 1") == [1, 4, 7]
+            assert [seq for seq, _ in reader.iter_responses(start=3)] == list(range(3, 10))
+            assert [response.results[0].title for _, response in reader.iter_responses()] == [f"R{i}" for i in range(10)]
+        finally:
+            reader.close()
+
+    def test_recovery_after_torn_write(self, tmp_path):
+        """Test that unindexed records are re-indexed and a torn record is dropped."""
+        writer = ResponseJournalWriter(tmp_path)
+        writer.append(_response(0))
+        writer.append(_response(1))
+        writer.close()
+
+        # Lose the last index entry and tear a record onto the segment
+        index_path = tmp_path / "journal.idx"
+        index_path.write_bytes(index_path.read_bytes()[:-28])
+        segment = next(tmp_path.glob("segment-*.log"))
+        with open(segment, "ab") as f:
+            f.write(b"\x10\x00\x00\x00\x00torn")
+
+        writer = ResponseJournalWriter(tmp_path)
+        writer.append(_response(2))
+        writer.close()
+
+        reader = ResponseJournalReader(tmp_path)
+        try:
+            assert [response.metadata["index"] for _, response in reader.iter_responses()] == [0, 1, 2]
+        finally:
+            reader.close()
+
+    def test_query_index_covers_sealed_entries(self, tmp_path):
+        """Test that queries are found in the query index and in newer entries."""
+        writer = ResponseJournalWriter(tmp_path, segment_bytes=600)
+        for index in range(10):
+            writer.append(_response(index))
+        writer.close()
+
+        assert (tmp_path / "journal.qidx").exists()
+        reader = ResponseJournalReader(tmp_path)
+        try:
+            assert reader.find("query 1") == [1, 4, 7]
+            assert reader._recent_by_query == {}
+
+            writer = ResponseJournalWriter(tmp_path, segment_bytes=10**6)
+            writer.append(_response(10))
+            writer.flush()
+            assert reader.find("query 1") == [1, 4, 7, 10]
+            writer.close()
+            # The rewritten index now covers the appended entry too
+            assert reader.find("query 1") == [1, 4, 7, 10]
+            assert reader._recent_by_query == {}
+            assert reader.find("query 9") == []
+        finally:
+            reader.close()
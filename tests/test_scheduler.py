@@ -0,0 +1,102 @@
+"""Tests for the priority search scheduler."""
+
+import threading
+import time
+import pytest
+from src.refinire_tool_tavily.metrics import ServiceMetrics
+from src.refinire_tool_tavily.scheduler import SchedulerOverloadError, SearchScheduler
+
+
+def wait_for_depth(scheduler, priority, depth):
+    deadline = time.time() + 2
+    while scheduler.queue_depth(priority) != depth and time.time() < deadline:
+        time.sleep(0.005)
+
+
+class TestSearchScheduler:
+    """Test cases for priority classes, fair share and shedding."""
+
+    def run_queued(self, scheduler, jobs):
+        """Hold the only slot, queue jobs in order, then free the slot.
+
+        Returns:
+            The labels of the jobs in the order they ran
+        """
+        order = []
+        release = threading.Event()
+        holder = threading.Thread(target=scheduler.run, args=(release.wait,))
+        holder.start()
+        time.sleep(0.02)
+
+        threads = []
+        for label, priority, tenant in jobs:
+            thread = threading.Thread(
+                target=scheduler.run, args=(lambda label=label: order.append(label), priority, tenant)
+            )
+            thread.start()
+            threads.append(thread)
+            wait_for_depth(scheduler, priority, sum(1 for job in jobs[:len(threads)] if job[1] == priority))
+        release.set()
+        for thread in [holder] + threads:
+            thread.join()
+        return order
+
+    def test_interactive_jumps_ahead(self):
+        """Test that interactive searches overtake queued batch work."""
+        scheduler = SearchScheduler(slots=1, metrics=ServiceMetrics())
+        order = self.run_queued(scheduler, [
+            ("batch-1", "batch", None),
+            ("background-1", "background", None),
+            ("interactive-1", "interactive", None)
+        ])
+        assert order == ["interactive-1", "batch-1", "background-1"]
+
+    def test_tenants_take_turns(self):
+        """Test round-robin between tenants within a class."""
+        scheduler = SearchScheduler(slots=1, metrics=ServiceMetrics())
+        order = self.run_queued(scheduler, [
+            ("a-1", "batch", "a"),
+            ("a-2", "batch", "a"),
+            ("a-3", "batch", "a"),
+            ("b-1", "batch", "b")
+        ])
+        assert order == ["a-1", "b-1", "a-2", "a-3"]
+
+    def test_sheds_low_priority_under_load(self):
+        """Test that a full or stale background queue sheds searches."""
+        metrics = ServiceMetrics()
+        scheduler = SearchScheduler(
+            slots=1, max_queue={"background": 1}, max_wait={"background": 0.05}, metrics=metrics
+        )
+        release = threading.Event()
+        holder = threading.Thread(target=scheduler.run, args=(release.wait,))
+        holder.start()
+        time.sleep(0.02)
+
+        errors = []
+
+        def queue_background():
+            try:
+                scheduler.run(lambda: None, "background")
+            except SchedulerOverloadError as e:
+                errors.append(e)
+
+        waiter = threading.Thread(target=queue_background)
+        waiter.start()
+        wait_for_depth(scheduler, "background", 1)
+        with pytest.raises(SchedulerOverloadError):
+            scheduler.run(lambda: None, "background")
+        waiter.join()
+        release.set()
+        holder.join()
+
+        assert len(errors) == 1
+        snapshot = metrics.snapshot()
+        assert snapshot["counters"]["scheduler.background.shed"] == 2
+        assert snapshot["gauges"]["scheduler.background.queue_depth"] == 0
+        assert snapshot["distributions"]["scheduler.interactive.wait"]["count"] == 1
+
+    def test_unknown_priority(self):
+        """Test that unknown priority classes are rejected."""
+        with pytest.raises(ValueError):
+            SearchScheduler(metrics=ServiceMetrics()).run(lambda: None, "urgent")
@@ -0,0 +1,90 @@
+"""Tests for sharded domain searches and service metrics."""
+
+import pytest
+from unittest.mock import Mock
+from src.refinire_tool_tavily.metrics import ServiceMetrics
+from src.refinire_tool_tavily.models import SearchRequest
+from src.refinire_tool_tavily.service import TavilyService, TavilyServiceError
+from src.refinire_tool_tavily.sharding import shard_domains
+
+
+DOMAINS = [f"site{i}.com" for i in range(7)]
+
+
+def _search_by_domain(**kwargs):
+    """Fake Tavily search returning one result per included domain."""
+    return {"results": [
+        {"title": domain, "url": f"https://{domain}/page", "content": domain, "score": DOMAINS.index(domain) / 10}
+        for domain in kwargs["include_domains"]
+    ]}
+
+
+class TestShardDomains:
+    """Test cases for domain sharding."""
+
+    def test_balanced_contiguous_shards(self):
+        """Test that shards keep list order and differ in size by at most one."""
+        assert shard_domains(DOMAINS, 3) == [DOMAINS[0:3], DOMAINS[3:5], DOMAINS[5:7]]
+
+    def test_no_split_when_small_or_disabled(self):
+        """Test that short lists and a zero shard size give a single shard."""
+        assert shard_domains(DOMAINS, 10) == [DOMAINS]
+        assert shard_domains(DOMAINS, 0) == [DOMAINS]
+
+
+class TestShardedSearch:
+    """Test cases for sharded service searches."""
+
+    def _service(self, shard_size):
+        service = TavilyService(api_key="test-key", domain_shard_size=shard_size, metrics=ServiceMetrics())
+        service.client = Mock()
+        service.client.search.side_effect = _search_by_domain
+        return service
+
+    def test_shards_are_merged_by_score(self):
+        """Test that every shard is searched and results are merged by score."""
+        service = self._service(3)
+        response = service.search(SearchRequest(query="python", max_results=4, include_domains=DOMAINS))
+
+        assert service.client.search.call_count == 3
+        assert [result.title for result in response.results] == ["site6.com", "site5.com", "site4.com", "site3.com"]
+        shards = response.metadata["sharding"]["shards"]
+        assert [shard["domains"] for shard in shards] == [3, 2, 2]
+        assert all(shard["status"] == "ok" for shard in shards)
+
+    def test_request_overrides_service_shard_size(self):
+        """Test that a request can disable sharding."""
+        service = self._service(3)
+        service.search(SearchRequest(query="python", include_domains=DOMAINS, domain_shard_size=0))
+        assert service.client.search.call_count == 1
+
+    def test_failed_shard_is_reported(self):
+        """Test that one failing shard does not fail the search."""
+        service = self._service(4)
+
+        def search(**kwargs):
+            if "site0.com" not in kwargs["include_domains"]:
+                raise RuntimeError("boom")
+            return _search_by_domain(**kwargs)
+
+        service.client.search.side_effect = search
+        response = service.search(SearchRequest(query="python", include_domains=DOMAINS))
+
+        assert [shard["status"] for shard in response.metadata["sharding"]["shards"]] == ["ok", "error"]
+        assert len(response.results) == 4
+
+        service.client.search.side_effect = RuntimeError("boom")
+        with pytest.raises(TavilyServiceError):
+            service.search(SearchRequest(query="python", include_domains=DOMAINS))
+
+    def test_metrics_compare_sharded_and_unsharded(self):
+        """Test that sharded and unsharded searches are recorded separately."""
+        service = self._service(3)
+        service.search(SearchRequest(query="python", max_results=5, include_domains=DOMAINS))
+        service.search(SearchRequest(query="python", max_results=5, include_domains=DOMAINS, domain_shard_size=0))
+
+        snapshot = service.metrics.snapshot()
+        assert snapshot["counters"] == {"domain_search.sharded.requests": 1, "domain_search.unsharded.requests": 1}
+        assert snapshot["distributions"]["domain_search.sharded.fill_rate"]["mean"] == 1.0
+        assert snapshot["distributions"]["domain_search.sharded.distinct_domains"]["max"] == 5
+        assert snapshot["distributions"]["domain_search.unsharded.latency"]["count"] == 1
@@ -0,0 +1,80 @@
+"""Tests for streaming result and context APIs."""
+
+import asyncio
+import pytest
+from unittest.mock import Mock
+from src.refinire_tool_tavily.api import iter_search_results
+from src.refinire_tool_tavily.models import SearchRequest, SearchResult
+from src.refinire_tool_tavily.service import TavilyService, TavilyServiceError
+
+
+RAW_RESPONSE = {
+    "answer": "Short answer.",
+    "results": [
+        {"title": f"Title {i}", "url": f"https://example.com/{i}", "content": f"Content {i}.", "score": 1.0 / i}
+        for i in range(1, 4)
+    ]
+}
+
+
+@pytest.fixture
+def service():
+    """Service backed by a mock Tavily client."""
+    service = TavilyService(api_key="test-key")
+    service.client = Mock()
+    service.client.search.return_value = RAW_RESPONSE
+    return service
+
+
+class TestIterators:
+    """Test cases for generator APIs."""
+
+    def test_iter_search_yields_parsed_results(self, service):
+        """Test that results are yielded lazily in order."""
+        results = service.iter_search(SearchRequest(query="topic"))
+        first = next(results)
+
+        assert isinstance(first, SearchResult)
+        assert first.title == "Title 1"
+        assert [result.title for result in results] == ["Title 2", "Title 3"]
+
+    def test_context_chunks_match_full_context(self, service):
+        """Test that joined chunks equal the non-streaming context."""
+        chunks = list(service.iter_search_context("topic"))
+
+        assert len(chunks) == 5
+        assert "".join(chunks) == service.get_search_context("topic")
+
+    def test_budgeted_context_chunks_match_full_context(self, service):
+        """Test that budgets apply identically when streaming."""
+        assert "".join(service.iter_search_context("topic", max_tokens=60)) == \
+            service.get_search_context("topic", max_tokens=60)
+
+    def test_iter_search_wraps_errors(self, service):
+        """Test that client failures surface as TavilyServiceError."""
+        service.client.search.side_effect = RuntimeError("boom")
+        with pytest.raises(TavilyServiceError):
+            list(service.iter_search(SearchRequest(query="topic")))
+
+    def test_api_iter_rejects_invalid_query(self):
+        """Test that invalid queries raise before any search."""
+        with pytest.raises(ValueError):
+            next(iter_search_results(""))
+
+
+class TestAsyncIterators:
+    """Test cases for async-iterator APIs."""
+
+    def test_aiter_search(self, service):
+        """Test that async iteration yields every result."""
+        async def collect():
+            return [result.title async for result in service.aiter_search(SearchRequest(query="topic"))]
+
+        assert asyncio.run(collect()) == ["Title 1", "Title 2", "Title 3"]
+
+    def test_aiter_search_context(self, service):
+        """Test that async context chunks match the synchronous ones."""
+        async def collect():
+            return [chunk async for chunk in service.aiter_search_context("topic")]
+
+        assert asyncio.run(collect()) == list(service.iter_search_context("topic"))
@@ -0,0 +1,95 @@
+"""Tests for saved-query watches."""
+
+import pytest
+from src.refinire_tool_tavily.metrics import ServiceMetrics
+from src.refinire_tool_tavily.watch import BloomFilter, Watcher
+
+
+class TestBloomFilter:
+    """Test cases for the seen-URL Bloom filter."""
+
+    def test_sizing_and_membership(self):
+        """Test that the filter is sized from capacity and error rate."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        assert 9000 < bloom.bits < 10000
+        assert bloom.hashes == 7
+
+        assert bloom.add("https://a.com/")
+        assert not bloom.add("https://a.com/")
+        assert "https://a.com/" in bloom
+        assert bloom.items == 1
+
+    def test_false_positive_rate(self):
+        """Test that false positives stay near the configured rate."""
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for i in range(2000):
+            bloom.add(f"https://seen.com/{i}")
+        false_positives = sum(f"https://new.com/{i}" in bloom for i in range(5000))
+        assert false_positives / 5000 < 0.03
+
+    def test_save_and_load(self, tmp_path):
+        """Test that a saved filter keeps its members and parameters."""
+        bloom = BloomFilter(capacity=100, error_rate=0.001)
+        bloom.add("https://a.com/")
+        bloom.save(tmp_path / "f.bloom")
+
+        loaded = BloomFilter.load(tmp_path / "f.bloom")
+        assert "https://a.com/" in loaded
+        assert (loaded.bits, loaded.hashes, loaded.items) == (bloom.bits, bloom.hashes, 1)
+
+        (tmp_path / "bad.bloom").write_bytes(b"nope")
+        with pytest.raises(ValueError):
+            BloomFilter.load(tmp_path / "bad.bloom")
+
+
+class TestWatcher:
+    """Test cases for reporting only unseen results."""
+
+    def make_watcher(self, path, pages):
+        calls = []
+
+        def search(tool):
+            def run(query, **kwargs):
+                calls.append((tool, query, kwargs))
+                urls = pages[min(len(calls), len(pages)) - 1]
+                return {
+                    "success": True,
+                    "query": query,
+                    "results": [{"title": url, "url": url, "content": ""} for url in urls],
+                    "total_results": len(urls)
+                }
+            return run
+
+        return Watcher(path, capacity=100, search=search, metrics=ServiceMetrics()), calls
+
+    def test_reports_new_results_only(self, tmp_path):
+        """Test that results are reported once, across restarts."""
+        pages = [
+            ["https://a.com/1", "https://b.com/1"],
+            ["https://a.com/1?utm_source=x", "https://b.com/1", "https://c.com/1"]
+        ]
+        watcher, calls = self.make_watcher(tmp_path, pages)
+        watcher.add("cve", "openssl vulnerability", tool="web_search_news", max_results=5)
+
+        first = watcher.check("cve")
+        assert [result["url"] for result in first["results"]] == pages[0]
+
+        restarted, calls = self.make_watcher(tmp_path, pages[1:])
+        second = restarted.check("cve")
+        assert [result["url"] for result in second["results"]] == ["https://c.com/1"]
+        assert second["watch"] == {"name": "cve", "new": 1, "seen": 2}
+        assert second["total_results"] == 1
+        assert calls == [("web_search_news", "openssl vulnerability", {"max_results": 5})]
+
+    def test_run_due_respects_interval(self, tmp_path):
+        """Test that watches run again only after their interval."""
+        watcher, calls = self.make_watcher(tmp_path, [["https://a.com/"]])
+        watcher.add("often", "q", interval=0)
+        watcher.add("rarely", "q", interval=3600)
+
+        assert set(watcher.run_due()) == {"often", "rarely"}
+        assert set(watcher.run_due()) == {"often"}
+        assert watcher.run_due()["often"]["results"] == []
+
+        watcher.remove("often")
+        assert set(watcher.watches()) == {"rarely"}